@@ -3,37 +3,408 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 sys.stdout.reconfigure(encoding='utf-8')
 
+import argparse
+import gc
+import inspect
+import threading
 import time
 import tracemalloc
 import psutil
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from typing import List, Optional, Any
-import matplotlib.pyplot as plt
 import csv
+import html
+import json
+import itertools
+import math
+import numpy as np
 from SolverAlgorithms.DFS import DFSStrategy
 from SolverAlgorithms.BFS import BFSStrategy
 from SolverAlgorithms.AStarr import AStarStrategy
 from SolverAlgorithms.UCS import UCSStrategy
-from Game.Map import Map
+from SolverAlgorithms.VectorBFS import VectorBFSStrategy
+from SolverAlgorithms.SolveResult import PHASES, DERIVED, SOLVED, REUSED, TIMEOUT, INTERRUPTED
+from Game.Puzzle import Puzzle
+from Game.LevelFile import level_path
+from Game.LevelPack import LevelPack
+from Game.PuzzleGenerator import PuzzleGenerator
+from constants import MAP_N
+from SolverAlgorithms.JobPool import PinnedPool, OK, ERROR, KILLED, OOM, CRASHED, available_cores
+from SolverAlgorithms.ResultsHistory import ResultsHistory, METRICS, TIME, NODES, TRACED_MB, RSS_MB, machine_fingerprint
+from SolverAlgorithms.SweepCache import SweepCache, code_hash, cell_key
+
+
+class PeakRSSMonitor:
+    """RSS cao nhất của process trong khối with, lấy mẫu bằng psutil trên một thread nền"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        while True:
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            if self.stopped.wait(self.interval):
+                break
+
+    def __enter__(self):
+        self.peak = self.process.memory_info().rss
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+class BenchmarkSettings:
+    """Cấu hình đo thời gian: warmup, số lần chạy thích ứng, khoảng tin cậy, ngoại lai, kiểm định"""
+
+    def __init__(self, warmup_runs: int = 1, max_runs: int = 10, ci_target: float = 0.05,
+                 confidence: float = 0.95, alpha: float = 0.05, outlier_k: float = 1.5,
+                 resamples: int = 2000, seed: int = 0):
+        # Số lần chạy bỏ qua trước khi đo (mỗi process một lần cho mỗi cặp map/thuật toán)
+        self.warmup_runs = warmup_runs
+        # Chạy thêm cho tới khi nửa độ rộng KTC của trung vị <= ci_target * trung vị, tối đa max_runs
+        self.max_runs = max_runs
+        self.ci_target = ci_target
+        self.confidence = confidence
+        # Mức ý nghĩa của kiểm định hoán vị trước khi công bố thuật toán thắng
+        self.alpha = alpha
+        # Ngoại lai: ngoài [Q1 - k*IQR, Q3 + k*IQR] (Tukey)
+        self.outlier_k = outlier_k
+        self.resamples = resamples
+        self.seed = seed
+
+    def min_runs(self) -> int:
+        """Số lần chạy nhỏ nhất mỗi bên để kiểm định chính xác có thể đạt p < alpha
+
+        Với n lần mỗi bên, p nhỏ nhất là 2 / C(2n, n): n = 3 chỉ xuống được 0.1.
+        """
+        n = 1
+        while 2 / math.comb(2 * n, n) >= self.alpha:
+            n += 1
+        return n
+
+    def converged(self, times) -> bool:
+        if len(times) >= self.max_runs:
+            return True
+        # Dừng sớm hơn thì không bao giờ chọn được thuật toán thắng
+        if len(times) < max(2, self.min_runs()):
+            return False
+        stats = describe_times(times, self)
+        if stats['median'] <= 0:
+            return True
+        return (stats['ci_high'] - stats['ci_low']) / 2 <= self.ci_target * stats['median']
+
+
+def describe_times(times, settings: BenchmarkSettings):
+    """Trung vị, IQR, KTC bootstrap của trung vị và số ngoại lai của các lần đo"""
+    if not times:
+        return {'runs': 0, 'median': 0, 'q1': 0, 'q3': 0, 'iqr': 0, 'ci_low': 0, 'ci_high': 0, 'outliers': 0}
+    values = np.asarray(times, dtype=float)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    low, high = q1 - settings.outlier_k * iqr, q3 + settings.outlier_k * iqr
+
+    rng = np.random.default_rng(settings.seed)
+    medians = np.median(rng.choice(values, (settings.resamples, len(values))), axis=1)
+    tail = (1 - settings.confidence) / 2 * 100
+    ci_low, ci_high = np.percentile(medians, [tail, 100 - tail])
+    return {
+        'runs': len(values),
+        'median': float(median),
+        'q1': float(q1),
+        'q3': float(q3),
+        'iqr': float(iqr),
+        'ci_low': float(ci_low),
+        'ci_high': float(ci_high),
+        'outliers': int(np.count_nonzero((values < low) | (values > high))),
+    }
+
+
+def rank_values(values):
+    """Hạng 1..n, các giá trị bằng nhau nhận hạng trung bình"""
+    unique, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    starts = np.cumsum(counts) - counts
+    return (starts + (counts + 1) / 2)[inverse]
+
+
+def permutation_test(a, b, settings: BenchmarkSettings, max_exact: int = 5000):
+    """p-value hai phía của kiểm định hoán vị trên tổng hạng (Mann-Whitney chính xác)
+
+    Duyệt hết các cách chia khi số cách chia nhỏ, ngược lại lấy mẫu ngẫu nhiên.
+    Với ít lần chạy p không thể nhỏ hơn 2 / C(n_a + n_b, n_a).
+    """
+    ranks = rank_values(np.concatenate((np.asarray(a, dtype=float), np.asarray(b, dtype=float))))
+    n, k = len(ranks), len(a)
+    expected = k * (n + 1) / 2
+    observed = abs(ranks[:k].sum() - expected) - 1e-9
+
+    if math.comb(n, k) <= max_exact:
+        sums = np.array([ranks[list(split)].sum() for split in itertools.combinations(range(n), k)])
+        return float(np.mean(np.abs(sums - expected) >= observed))
+
+    rng = np.random.default_rng(settings.seed)
+    sums = np.array([rng.permutation(ranks)[:k].sum() for _ in range(settings.resamples)])
+    return float((np.count_nonzero(np.abs(sums - expected) >= observed) + 1) / (settings.resamples + 1))
+
+
+def pick_winner(results, settings: BenchmarkSettings):
+    """(thuật toán thắng hoặc None, p-value): trung vị nhỏ nhất, và phải nhanh hơn hẳn thuật toán thứ hai
+
+    Chỉ xét các thuật toán giải được trong mọi lần chạy.
+    """
+    candidates = sorted((data['median_time'], name) for name, data in results.items()
+                        if data['success_rate'] == 100 and data['times'])
+    if not candidates:
+        return None, None
+    if len(candidates) == 1:
+        return candidates[0][1], 0.0
+    (_, best), (_, second) = candidates[:2]
+    p_value = permutation_test(results[best]['times'], results[second]['times'], settings)
+    return (best if p_value < settings.alpha else None), p_value
+
+
+REGRESSION = 'regression'
+IMPROVEMENT = 'improvement'
+UNCHANGED = 'ok'
+UNTESTED = 'untested'  # thay đổi lớn nhưng không đủ mẫu để kiểm định
+
+
+def compare_samples(baseline, latest, settings: BenchmarkSettings, threshold: float = 0.05):
+    """(thay đổi tương đối của trung vị, p-value hoặc None, trạng thái) của một chỉ số giữa hai lần chạy
+
+    Mọi chỉ số đều là càng nhỏ càng tốt. Chỉ là hồi quy khi trung vị tăng quá
+    threshold và kiểm định hoán vị có p < alpha. Chỉ số không dao động (số trạng
+    thái khám phá) được coi là có ý nghĩa khi trung vị khác nhau.
+    """
+    old, new = float(np.median(baseline)), float(np.median(latest))
+    if old > 0:
+        change = (new - old) / old
+    else:
+        change = 0.0 if new == old else math.inf
+
+    p_value = None
+    if len(baseline) >= 2 and len(latest) >= 2:
+        if np.ptp(baseline) == 0 and np.ptp(latest) == 0:
+            p_value = 0.0 if new != old else 1.0
+        else:
+            p_value = permutation_test(baseline, latest, settings)
+
+    if abs(change) <= threshold:
+        status = UNCHANGED
+    elif p_value is None:
+        status = UNTESTED
+    elif p_value >= settings.alpha:
+        status = UNCHANGED
+    else:
+        status = REGRESSION if change > 0 else IMPROVEMENT
+    return change, p_value, status
+
+
+def find_regressions(history: ResultsHistory, latest, baseline, settings: BenchmarkSettings,
+                     threshold: float = 0.05):
+    """So sánh từng ô (map, thuật toán, chỉ số) có trong cả hai lần chạy của lịch sử"""
+    old_samples = history.samples(baseline.id)
+    new_samples = history.samples(latest.id)
+    metric_order = {metric: i for i, metric in enumerate(METRICS)}
+    rows = []
+    for key in sorted(old_samples.keys() & new_samples.keys(),
+                      key=lambda k: (k[0], k[1], metric_order.get(k[2], len(METRICS)))):
+        old, new = old_samples[key], new_samples[key]
+        if not old or not new:
+            continue
+        change, p_value, status = compare_samples(old, new, settings, threshold)
+        map_id, algorithm, metric = key
+        rows.append({
+            'map_id': map_id, 'algorithm': algorithm, 'metric': metric,
+            'baseline': float(np.median(old)), 'latest': float(np.median(new)),
+            'baseline_runs': len(old), 'latest_runs': len(new),
+            'change': change, 'p_value': p_value, 'status': status,
+        })
+    return rows
+
+
+def describe_run(run):
+    dirty = ' (có thay đổi chưa commit)' if run.dirty else ''
+    label = f" [{run.label}]" if run.label else ''
+    started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run.started))
+    return f"#{run.id}{label} {started} commit {run.git_commit[:10]}{dirty}, máy {run.machine}"
+
+
+def write_history_report(latest, baseline, rows, settings: BenchmarkSettings, threshold: float,
+                         filename: Optional[str] = None):
+    """Báo cáo hồi quy của lần chạy latest so với baseline; in ra màn hình và ghi vào filename"""
+    lines = ["=" * 80, "BAO CAO HOI QUY - SO VOI LAN CHAY GOC", "=" * 80, ""]
+    lines.append(f"Lần chạy mới:  {describe_run(latest)}")
+    lines.append(f"Lần chạy gốc:  {describe_run(baseline)}")
+    if latest.machine != baseline.machine:
+        lines.append("CẢNH BÁO: hai lần chạy trên hai máy khác nhau, thời gian và bộ nhớ không so sánh được")
+    if latest.params != baseline.params:
+        lines.append("CẢNH BÁO: tham số của hai lần chạy khác nhau")
+    lines.append(f"Hồi quy: trung vị tăng quá {threshold:.0%} và p < {settings.alpha}")
+    lines.append("")
+
+    lines.append(f"{'Map':<5} {'Thuật toán':<11} {'Chỉ số':<10} {'Gốc':>12} {'Mới':>12} {'Thay đổi':>9} "
+                 f"{'p-value':>8}  Trạng thái")
+    lines.append("-" * 80)
+    for row in rows:
+        p_text = f"{row['p_value']:.3f}" if row['p_value'] is not None else '-'
+        lines.append(f"{row['map_id']:<5} {row['algorithm']:<11} {row['metric']:<10} {row['baseline']:>12.4f} "
+                     f"{row['latest']:>12.4f} {row['change']:>+9.1%} {p_text:>8}  {row['status']}")
+    lines.append("")
+
+    counts = defaultdict(int)
+    for row in rows:
+        counts[row['status']] += 1
+    lines.append(f"Hồi quy: {counts[REGRESSION]}, cải thiện: {counts[IMPROVEMENT]}, "
+                 f"chưa kiểm định được: {counts[UNTESTED]}, không đổi: {counts[UNCHANGED]}")
+    for row in rows:
+        if row['status'] == REGRESSION:
+            lines.append(f"   HỒI QUY Map {row['map_id']} {row['algorithm']} {row['metric']}: "
+                         f"{row['baseline']:.4f} -> {row['latest']:.4f} ({row['change']:+.1%})")
+
+    text = "\n".join(lines) + "\n"
+    print(text)
+    if filename is not None:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Báo cáo hồi quy đã được lưu: {filename}")
+    return counts[REGRESSION]
+
+
+# Phân loại kết quả mỗi lần chạy
+RUN_SOLVED = 'solved'
+RUN_TIMEOUT = 'timeout'    # hết max_time, hoặc bị kill khi quá hạn cứng
+RUN_OOM = 'oom'            # vượt giới hạn bộ nhớ
+RUN_CRASH = 'crash'        # exception hoặc process con chết
+RUN_UNSOLVED = 'unsolved'  # tìm hết mà không có nghiệm
+RUN_OUTCOMES = (RUN_SOLVED, RUN_TIMEOUT, RUN_OOM, RUN_CRASH, RUN_UNSOLVED)
+
+
+def classify_run(status: str, result=None) -> str:
+    """Phân loại một lần chạy từ trạng thái job (của PinnedPool) và SolveResult nếu có"""
+    if status == OK:
+        if result.termination in (SOLVED, REUSED):
+            return RUN_SOLVED
+        if result.termination in (TIMEOUT, INTERRUPTED):
+            return RUN_TIMEOUT
+        return RUN_UNSOLVED
+    if status == OOM:
+        return RUN_OOM
+    if status in (ERROR, CRASHED):
+        return RUN_CRASH
+    return RUN_TIMEOUT
 
 
 class PerformanceMetrics:
-    """Data class để lưu trữ các metrics hiệu suất"""
+    """Data class để lưu trữ các metrics hiệu suất
+
+    Thời gian lấy từ các lần chạy đo thời gian (không bật tracemalloc); bộ nhớ
+    lấy từ các lần chạy đo bộ nhớ riêng (tracemalloc và RSS). Chỉ lần chạy giải
+    được mới đưa giá trị vào các mẫu và trung bình; các lần khác (hết max_time,
+    tìm hết không có nghiệm, quá hạn cứng, hết bộ nhớ, lỗi) chỉ được đếm theo loại.
+    """
     
     def __init__(self, algorithm_name: str):
         self.algorithm = algorithm_name
         self.execution_times = []
+        # Thời gian của các lần đo không bị lỗi, dùng cho trung vị/KTC/kiểm định
+        self.timing_samples = []
+        # Số trạng thái khám phá của các lần đo đó
+        self.node_samples = []
+        # Đỉnh bộ nhớ cấp phát (tracemalloc) và RSS đỉnh (psutil), MB
         self.memory_usage = []
         self.peak_memory = []
         self.solution_lengths = []
         self.states_explored = []
         self.total_costs = []
+        self.nodes_generated = []
+        self.duplicates_pruned = []
+        self.max_frontiers = []
+        self.phase_times = {phase: [] for phase in PHASES}
+        # Chỉ số dẫn xuất của mỗi lần đo thời gian (DERIVED), bỏ qua giá trị không xác định
+        self.derived = {key: [] for key in DERIVED}
+        self.terminations = defaultdict(int)
+        # Số lần chạy theo loại (RUN_OUTCOMES) của các lần đo thời gian và đo bộ nhớ
+        self.timing_outcomes = defaultdict(int)
+        self.memory_outcomes = defaultdict(int)
+
+    def add_timing_run(self, measured, failure: Optional[str] = None):
+        """Ghi lại một lần đo thời gian (kết quả của measure_timing_run, hoặc None và trạng thái job); trả về 1 nếu giải được"""
+        if measured is None:
+            self.timing_outcomes[classify_run(failure or ERROR)] += 1
+            return 0
+
+        result, execution_time = measured
+        self.timing_outcomes[classify_run(OK, result)] += 1
+        if not result.solved:
+            # Thời gian ~max_time và cost 0 của lần dừng giữa chừng sẽ làm lệch trung vị và trung bình
+            self.terminations[result.termination] += 1
+            return 0
+        self.execution_times.append(execution_time)
+        self.timing_samples.append(execution_time)
+        self.node_samples.append(result.nodes_expanded)
+        self.add_result(result)
+        for key, value in result.derived_metrics(execution_time).items():
+            if value is not None:
+                self.derived[key].append(value)
+        self.solution_lengths.append(len(result.path))
+        return 1
+
+    def add_memory_run(self, measured, failure: Optional[str] = None):
+        """Ghi lại một lần đo bộ nhớ (kết quả của measure_memory_run, hoặc None và trạng thái job)"""
+        if measured is None:
+            self.memory_outcomes[classify_run(failure or ERROR)] += 1
+            return
+        result, traced_peak, rss_peak = measured
+        self.memory_outcomes[classify_run(OK, result)] += 1
+        if not result.solved:
+            return
+        self.memory_usage.append(traced_peak)
+        self.peak_memory.append(rss_peak)
+
+    def add_result(self, result):
+        """Ghi lại các bộ đếm tìm kiếm của một SolveResult"""
+        self.states_explored.append(result.nodes_expanded)
+        self.total_costs.append(result.cost)
+        self.nodes_generated.append(result.nodes_generated)
+        self.duplicates_pruned.append(result.duplicates_pruned)
+        self.max_frontiers.append(result.max_frontier)
+        for phase in PHASES:
+            self.phase_times[phase].append(result.phase_times.get(phase, 0.0))
+        self.terminations[result.termination] += 1
         
-    def calculate_averages(self, successful_runs: int, total_runs: int):
-        """Tính toán các giá trị trung bình"""
+    def calculate_averages(self, successful_runs: int, total_runs: int,
+                           settings: Optional[BenchmarkSettings] = None):
+        """Tính toán các giá trị trung bình, cùng trung vị, IQR, KTC và số ngoại lai của thời gian"""
         result = {}
         result['algorithm'] = self.algorithm
+
+        stats = describe_times(self.timing_samples, settings or BenchmarkSettings())
+        result['times'] = list(self.timing_samples)
+        result['timing_runs'] = total_runs
+        result['median_time'] = stats['median']
+        result['iqr_time'] = stats['iqr']
+        result['ci_low'] = stats['ci_low']
+        result['ci_high'] = stats['ci_high']
+        result['outliers'] = stats['outliers']
+        result['confidence'] = (settings or BenchmarkSettings()).confidence
+        # Mẫu thô cho lịch sử kết quả
+        result['samples'] = {
+            TIME: list(self.timing_samples),
+            NODES: list(self.node_samples),
+            TRACED_MB: list(self.memory_usage),
+            RSS_MB: list(self.peak_memory),
+        }
+        result['outcomes'] = {outcome: self.timing_outcomes[outcome] for outcome in RUN_OUTCOMES}
+        result['memory_outcomes'] = {outcome: self.memory_outcomes[outcome] for outcome in RUN_OUTCOMES}
         
         if self.execution_times:
             result['average_time'] = sum(self.execution_times) / len(self.execution_times)
@@ -42,8 +413,10 @@ class PerformanceMetrics:
             
         if self.memory_usage:
             result['average_memory'] = sum(self.memory_usage) / len(self.memory_usage)
+            result['average_peak_rss'] = sum(self.peak_memory) / len(self.peak_memory)
         else:
             result['average_memory'] = 0
+            result['average_peak_rss'] = 0
             
         if self.states_explored:
             result['average_states_explored'] = sum(self.states_explored) / len(self.states_explored)
@@ -61,6 +434,18 @@ class PerformanceMetrics:
         else:
             result['average_solution_length'] = 0
             
+        for key, values in (('average_nodes_generated', self.nodes_generated),
+                            ('average_duplicates_pruned', self.duplicates_pruned),
+                            ('average_max_frontier', self.max_frontiers)):
+            result[key] = sum(values) / len(values) if values else 0
+        result['average_phase_times'] = {
+            phase: sum(times) / len(times) if times else 0 for phase, times in self.phase_times.items()
+        }
+        result['average_derived'] = {
+            key: sum(values) / len(values) if values else None for key, values in self.derived.items()
+        }
+        result['terminations'] = dict(self.terminations)
+            
         if total_runs > 0:
             result['success_rate'] = (successful_runs / total_runs) * 100
         else:
@@ -77,19 +462,22 @@ class PerformanceMetrics:
 
 
 class AlgorithmFactory:
+    strategies = {'DFS': DFSStrategy, 'BFS': BFSStrategy, 'UCS': UCSStrategy, 'A*': AStarStrategy,
+                  'VectorBFS': VectorBFSStrategy}
     
     @staticmethod
-    def create_algorithm(algorithm_name: str, game_map: Map, max_time: int = 30):
-        if algorithm_name == 'DFS':
-            return DFSStrategy(game_map, max_time)
-        elif algorithm_name == 'BFS':
-            return BFSStrategy(game_map, max_time)
-        elif algorithm_name == 'UCS':
-            return UCSStrategy(game_map, max_time)
-        elif algorithm_name == 'A*':
-            return AStarStrategy(game_map, max_time=max_time)
-        else:
+    def create_algorithm(algorithm_name: str, game_map: Puzzle, max_time: int = 30):
+        if algorithm_name not in AlgorithmFactory.strategies:
             raise ValueError(f"Thuật toán không được hỗ trợ: {algorithm_name}")
+        return AlgorithmFactory.strategies[algorithm_name](game_map, max_time=max_time)
+
+
+def pyplot():
+    """matplotlib.pyplot với backend Agg (không cần màn hình), chỉ import khi vẽ biểu đồ"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
 
 
 class ReportGenerator(ABC):
@@ -100,6 +488,15 @@ class ReportGenerator(ABC):
         pass
 
 
+def format_metric(value, spec):
+    return '-' if value is None else format(value, spec)
+
+
+def derived_column(key):
+    """Tên cột CSV của một chỉ số dẫn xuất, vd. nodes_per_second -> Avg_Nodes_Per_Second"""
+    return 'Avg_' + '_'.join(word.capitalize() for word in key.split('_'))
+
+
 class TextReportGenerator(ReportGenerator):
     
     def generate_report(self, results, map_id: int, output_path: str):
@@ -114,12 +511,35 @@ class TextReportGenerator(ReportGenerator):
             for algorithm_name, data in results.items():
                 f.write(f"{algorithm_name.upper()}\n")
                 f.write("-" * 40 + "\n")
-                f.write(f"Thời gian trung bình: {data['average_time']:.4f} giây\n")
-                f.write(f"Bộ nhớ sử dụng: {data['average_memory']:.2f} MB\n")
+                f.write(f"Thời gian trung bình (lần đo thời gian, không tracemalloc): {data['average_time']:.4f} giây\n")
+                f.write(f"Trung vị thời gian: {data['median_time']:.4f} giây (IQR {data['iqr_time']:.4f}), "
+                        f"KTC {data['confidence'] * 100:.0f}% của trung vị: "
+                        f"[{data['ci_low']:.4f}, {data['ci_high']:.4f}] giây\n")
+                f.write(f"Số lần đo thời gian: {data['timing_runs']} (ngoại lai: {data['outliers']})\n")
+                f.write(f"Bộ nhớ cấp phát đỉnh (lần đo bộ nhớ, tracemalloc): {data['average_memory']:.2f} MB\n")
+                f.write(f"RSS đỉnh của process (lần đo bộ nhớ, psutil): {data['average_peak_rss']:.2f} MB\n")
                 f.write(f"Tỷ lệ thành công: {data['success_rate']:.1f}%\n")
                 f.write(f"Độ dài nghiệm TB: {data['average_solution_length']:.1f} bước\n")
                 f.write(f"Số trạng thái khám phá: {data['average_states_explored']:.0f}\n")
                 f.write(f"Chi phí trung bình: {data['average_total_cost']:.2f}\n")
+                f.write(f"Số nút sinh ra TB: {data['average_nodes_generated']:.0f} "
+                        f"(trùng lặp bị loại: {data['average_duplicates_pruned']:.0f})\n")
+                f.write(f"Kích thước frontier lớn nhất TB: {data['average_max_frontier']:.0f}\n")
+                derived = data['average_derived']
+                f.write(f"Nút mở rộng/giây TB: {format_metric(derived['nodes_per_second'], '.0f')}, "
+                        f"sinh ra/mở rộng: {format_metric(derived['branching_ratio'], '.2f')}, "
+                        f"tỷ lệ trùng lặp: {format_metric(derived['duplicate_rate'], '.1%')}\n")
+                f.write(f"Hệ số phân nhánh hiệu dụng b*: {format_metric(derived['effective_branching_factor'], '.3f')}, "
+                        f"penetrance: {format_metric(derived['penetrance'], '.4f')}, "
+                        f"số lần tính heuristic TB: {format_metric(derived['heuristic_evals'], '.0f')}\n")
+                phases = ", ".join(f"{phase} {t:.4f}s" for phase, t in data['average_phase_times'].items())
+                f.write(f"Thời gian theo giai đoạn: {phases}\n")
+                terminations = ", ".join(f"{reason} x{n}" for reason, n in data['terminations'].items())
+                f.write(f"Kết thúc: {terminations}\n")
+                for title, outcomes in (("Các lần đo thời gian", data['outcomes']),
+                                        ("Các lần đo bộ nhớ", data['memory_outcomes'])):
+                    counts = ", ".join(f"{outcome} {n}" for outcome, n in outcomes.items() if n) or "không có"
+                    f.write(f"{title}: {counts}\n")
                 f.write(f"Thời gian nhanh nhất: {data['min_time']:.4f} giây\n")
                 f.write(f"Thời gian chậm nhất: {data['max_time']:.4f} giây\n")
                 f.write("\n")
@@ -133,8 +553,13 @@ class CSVReportGenerator(ReportGenerator):
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
         with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['Algorithm', 'Avg_Time', 'Avg_Memory', 'Success_Rate', 
-                         'Avg_Solution_Length', 'Avg_States_Explored', 'Avg_Total_Cost', 'Map_ID']
+            fieldnames = ['Algorithm', 'Avg_Time', 'Median_Time', 'IQR_Time', 'CI_Low', 'CI_High',
+                         'Timing_Runs', 'Outliers', 'Avg_Traced_Peak_MB', 'Avg_Peak_RSS_MB', 'Success_Rate', 
+                         'Avg_Solution_Length', 'Avg_States_Explored', 'Avg_Total_Cost',
+                         'Avg_Nodes_Generated', 'Avg_Duplicates_Pruned', 'Avg_Max_Frontier'] + \
+                         [f'Avg_Time_{phase.capitalize()}' for phase in PHASES] + \
+                         [derived_column(key) for key in DERIVED] + \
+                         [f'Runs_{outcome.capitalize()}' for outcome in RUN_OUTCOMES] + ['Map_ID']
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             
             writer.writeheader()
@@ -142,11 +567,24 @@ class CSVReportGenerator(ReportGenerator):
                 writer.writerow({
                     'Algorithm': algorithm_name,
                     'Avg_Time': data['average_time'],
-                    'Avg_Memory': data['average_memory'],
+                    'Median_Time': data['median_time'],
+                    'IQR_Time': data['iqr_time'],
+                    'CI_Low': data['ci_low'],
+                    'CI_High': data['ci_high'],
+                    'Timing_Runs': data['timing_runs'],
+                    'Outliers': data['outliers'],
+                    'Avg_Traced_Peak_MB': data['average_memory'],
+                    'Avg_Peak_RSS_MB': data['average_peak_rss'],
                     'Success_Rate': data['success_rate'],
                     'Avg_Solution_Length': data['average_solution_length'],
                     'Avg_States_Explored': data['average_states_explored'],
                     'Avg_Total_Cost': data['average_total_cost'],
+                    'Avg_Nodes_Generated': data['average_nodes_generated'],
+                    'Avg_Duplicates_Pruned': data['average_duplicates_pruned'],
+                    'Avg_Max_Frontier': data['average_max_frontier'],
+                    **{f'Avg_Time_{phase.capitalize()}': data['average_phase_times'][phase] for phase in PHASES},
+                    **{derived_column(key): data['average_derived'][key] for key in DERIVED},
+                    **{f'Runs_{outcome.capitalize()}': data['outcomes'][outcome] for outcome in RUN_OUTCOMES},
                     'Map_ID': map_id
                 })
         
@@ -154,6 +592,11 @@ class CSVReportGenerator(ReportGenerator):
 
 
 class ChartGenerator(ReportGenerator):
+    # dpi của bản xem trước (--preview)
+    PREVIEW_DPI = 72
+
+    def __init__(self, dpi: int = 300):
+        self.dpi = dpi
     
     def generate_report(self, results, map_id: int, output_path: str):
         """Tạo biểu đồ so sánh"""
@@ -161,7 +604,8 @@ class ChartGenerator(ReportGenerator):
             print("Không có dữ liệu để tạo biểu đồ")
             return
         
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        plt = pyplot()
+        fig, axes = plt.subplots(3, 2, figsize=(15, 15))
         fig.suptitle(f'So sánh hiệu suất thuật toán - Map {map_id}', fontsize=16, fontweight='bold')
         
         algorithms = list(results.keys())
@@ -169,12 +613,12 @@ class ChartGenerator(ReportGenerator):
         
         times = [results[alg]['average_time'] for alg in algorithms]
         axes[0, 0].bar(algorithms, times, color=colors[:len(algorithms)])
-        axes[0, 0].set_title('Thời gian thực thi trung bình')
+        axes[0, 0].set_title('Thời gian thực thi trung bình (không tracemalloc)')
         axes[0, 0].set_ylabel('Thời gian (giây)')
         
         memories = [results[alg]['average_memory'] for alg in algorithms]
         axes[0, 1].bar(algorithms, memories, color=colors[:len(algorithms)])
-        axes[0, 1].set_title('Bộ nhớ sử dụng trung bình')
+        axes[0, 1].set_title('Bộ nhớ cấp phát đỉnh (tracemalloc)')
         axes[0, 1].set_ylabel('Bộ nhớ (MB)')
         
         solution_lengths = [results[alg]['average_solution_length'] for alg in algorithms]
@@ -186,88 +630,126 @@ class ChartGenerator(ReportGenerator):
         axes[1, 1].bar(algorithms, states_explored, color=colors[:len(algorithms)])
         axes[1, 1].set_title('Số trạng thái khám phá')
         axes[1, 1].set_ylabel('Số trạng thái')
+
+        # Tốc độ của engine (nút/giây) và hiệu quả của thuật toán (b*, càng gần 1 càng tốt)
+        speeds = [results[alg]['average_derived']['nodes_per_second'] or 0 for alg in algorithms]
+        axes[2, 0].bar(algorithms, speeds, color=colors[:len(algorithms)])
+        axes[2, 0].set_title('Tốc độ mở rộng nút')
+        axes[2, 0].set_ylabel('Nút/giây')
+
+        branching = [results[alg]['average_derived']['effective_branching_factor'] or 0 for alg in algorithms]
+        axes[2, 1].bar(algorithms, branching, color=colors[:len(algorithms)])
+        axes[2, 1].axhline(1, color='gray', linestyle='--', linewidth=1)
+        axes[2, 1].set_title('Hệ số phân nhánh hiệu dụng b*')
+        axes[2, 1].set_ylabel('b*')
         
         plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
         plt.close()
         
         print(f"Biểu đồ đã được lưu: {output_path}")
 
 
 class AlgorithmComparison:
+    algorithms = ['DFS', 'BFS', 'A*', 'UCS']
     
-    def __init__(self, game_map: Map, map_id: Optional[int] = None):
+    def __init__(self, game_map: Puzzle, map_id: Optional[int] = None,
+                 benchmark: Optional[BenchmarkSettings] = None):
         self.map = game_map
         self.map_id = map_id
-        self.algorithms = ['DFS', 'BFS', 'A*', 'UCS']
+        self.benchmark = benchmark or BenchmarkSettings()
         self.report_generators = {
             'text': TextReportGenerator(),
             'csv': CSVReportGenerator(),
             'chart': ChartGenerator()
         }
     
-    def measure_single_run(self, algorithm_name: str, max_time: int = 30):
-        solver = AlgorithmFactory.create_algorithm(algorithm_name, self.map, max_time)
-        
-        import gc
+    def create_solver(self, algorithm_name: str, max_time: int):
+        """Solver mới cho mỗi lần đo, không bao giờ tiếp tục từ checkpoint
+
+        Lần chạy tiếp tục một tìm kiếm đã dừng chỉ đo phần còn lại, nên sẽ làm
+        sai trung vị và kiểm định; sweep bị ngắt được tiếp tục qua SweepCache.
+        """
+        return AlgorithmFactory.create_algorithm(algorithm_name, self.map, max_time)
+
+    def warm_up(self, algorithm_name: str, max_time: int = 30):
+        """Các lần chạy khởi động, không ghi lại"""
+        for _ in range(self.benchmark.warmup_runs):
+            self.create_solver(algorithm_name, max_time).solve()
+
+    def measure_timing_run(self, algorithm_name: str, max_time: int = 30):
+        """Một lần đo thời gian: chỉ perf_counter, không tracemalloc"""
+        solver = self.create_solver(algorithm_name, max_time)
         gc.collect()
-        
-        tracemalloc.start()
-        
-        start_time = time.time()
-        solution, node_expanded, total_cost = solver.solve()
-        end_time = time.time()
-        
-        _, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-                
-        # Calculate metrics
-        execution_time = end_time - start_time
-        
-        # Sử dụng peak memory từ tracemalloc 
-        memory_used = max(0, peak / 1024 / 1024)
-        
-        peak_memory_mb = max(0, peak / 1024 / 1024)
-        
-        return solution, execution_time, memory_used, peak_memory_mb, node_expanded or 0, total_cost or 0
-    
-    def measure_algorithm_performance(self, algorithm_name: str, max_time: int = 30, runs: int = 1):
-        """Đo hiệu suất của một thuật toán"""
+
+        start_time = time.perf_counter()
+        result = solver.solve()
+        execution_time = time.perf_counter() - start_time
+
+        return result, execution_time
+
+    def measure_memory_run(self, algorithm_name: str, max_time: int = 30):
+        """Một lần đo bộ nhớ: đỉnh tracemalloc và RSS đỉnh, không dùng để tính thời gian"""
+        solver = self.create_solver(algorithm_name, max_time)
+        gc.collect()
+
+        with PeakRSSMonitor() as rss:
+            tracemalloc.start()
+            try:
+                result = solver.solve()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        return result, peak / 1024 / 1024, rss.peak / 1024 / 1024
+
+    def measure_algorithm_performance(self, algorithm_name: str, max_time: int = 30, runs: int = 1,
+                                      memory_runs: int = 1):
+        """Đo hiệu suất của một thuật toán: warmup, các lần đo thời gian rồi các lần đo bộ nhớ riêng
+
+        Đo thời gian ít nhất runs lần, rồi tiếp tục cho tới khi KTC của trung vị đủ hẹp
+        hoặc đạt benchmark.max_runs.
+        """
         metrics = PerformanceMetrics(algorithm_name)
         successful_runs = 0
+
+        try:
+            self.warm_up(algorithm_name, max_time)
+        except Exception as e:
+            print(f"Lỗi khi khởi động {algorithm_name}: {e}")
         
-        for run in range(runs):
-            print(f"Chạy {algorithm_name} - Lần {run + 1}/{runs}")
+        run = 0
+        while run < runs or (run < self.benchmark.max_runs and not self.benchmark.converged(metrics.timing_samples)):
+            print(f"Chạy {algorithm_name} - Lần {run + 1}")
             
+            failure = None
             try:
-                solution, execution_time, memory_used, peak_memory, node_expanded, total_cost = \
-                    self.measure_single_run(algorithm_name, max_time)
-                
-                metrics.execution_times.append(execution_time)
-                metrics.memory_usage.append(memory_used)
-                metrics.peak_memory.append(peak_memory)
-                metrics.states_explored.append(node_expanded)
-                metrics.total_costs.append(total_cost)
-                
-                if solution is not None:
-                    successful_runs += 1
-                    metrics.solution_lengths.append(len(solution))
-                else:
-                    metrics.solution_lengths.append(0)
-                    
+                measured = self.measure_timing_run(algorithm_name, max_time)
+            except MemoryError:
+                print(f"Hết bộ nhớ khi chạy {algorithm_name} - Lần {run + 1}")
+                measured, failure = None, OOM
             except Exception as e:
                 print(f"Lỗi khi chạy {algorithm_name} - Lần {run + 1}: {e}")
-                # Thêm giá trị mặc định cho lần chạy thất bại
-                metrics.execution_times.append(0)
-                metrics.memory_usage.append(0)
-                metrics.peak_memory.append(0)
-                metrics.solution_lengths.append(0)
-                metrics.states_explored.append(0)
-                metrics.total_costs.append(0)
+                measured, failure = None, ERROR
+            successful_runs += metrics.add_timing_run(measured, failure)
+            run += 1
+
+        for memory_run in range(memory_runs):
+            print(f"Đo bộ nhớ {algorithm_name} - Lần {memory_run + 1}/{memory_runs}")
+            failure = None
+            try:
+                measured = self.measure_memory_run(algorithm_name, max_time)
+            except MemoryError:
+                print(f"Hết bộ nhớ khi đo bộ nhớ {algorithm_name} - Lần {memory_run + 1}")
+                measured, failure = None, OOM
+            except Exception as e:
+                print(f"Lỗi khi đo bộ nhớ {algorithm_name} - Lần {memory_run + 1}: {e}")
+                measured, failure = None, ERROR
+            metrics.add_memory_run(measured, failure)
         
-        return metrics.calculate_averages(successful_runs, runs)
+        return metrics.calculate_averages(successful_runs, run, self.benchmark)
     
-    def compare_all_algorithms(self, max_time: int = 30, runs: int = 3):
+    def compare_all_algorithms(self, max_time: int = 30, runs: int = 5, memory_runs: int = 1):
         """So sánh tất cả các thuật toán"""
         print(f"Bắt đầu so sánh thuật toán cho Map {self.map_id}...")
         print("=" * 50)
@@ -276,12 +758,12 @@ class AlgorithmComparison:
         
         for algorithm_name in self.algorithms:
             print(f"\nĐang đo hiệu suất {algorithm_name}...")
-            results[algorithm_name] = self.measure_algorithm_performance(algorithm_name, max_time, runs)
+            results[algorithm_name] = self.measure_algorithm_performance(algorithm_name, max_time, runs, memory_runs)
         
         return results
     
-    def generate_reports(self, results, output_dir: str):
-        """Tạo tất cả các loại báo cáo"""
+    def generate_reports(self, results, output_dir: str, charts: bool = True):
+        """Tạo tất cả các loại báo cáo; charts=False khi biểu đồ được vẽ riêng (song song)"""
         base_filename = f"{output_dir}/{self.map_id:02d}_comparison"
         
         # Tạo text report
@@ -295,6 +777,8 @@ class AlgorithmComparison:
         )
         
         # Tạo chart
+        if not charts:
+            return
         try:
             self.report_generators['chart'].generate_report(
                 results, self.map_id, f"{base_filename}_chart.png"
@@ -303,54 +787,666 @@ class AlgorithmComparison:
             print(f"Không thể tạo biểu đồ cho Map {self.map_id}: {e}")
 
 
+TIMING_RUN = 'time'
+MEMORY_RUN = 'memory'
+
+# Kết quả đo của lần chạy gần nhất, đầu vào của giai đoạn báo cáo
+RESULTS_FILE = 'results.json'
+
+
+# Các cặp (map, thuật toán) đã khởi động trong process con này
+_warmed_up = set()
+
+
+def run_comparison_job(job):
+    """Một lần đo (map, thuật toán, loại, lần chạy) trong process con của PinnedPool
+
+    Lần đo thời gian đầu tiên của mỗi cặp (map, thuật toán) trong một process
+    chạy warmup trước.
+    """
+    map_id, puzzle, algorithm_name, kind, _, max_time, benchmark = job
+    comparison = AlgorithmComparison(puzzle, map_id, benchmark)
+    if kind == MEMORY_RUN:
+        return comparison.measure_memory_run(algorithm_name, max_time)
+    if (map_id, algorithm_name) not in _warmed_up:
+        comparison.warm_up(algorithm_name, max_time)
+        _warmed_up.add((map_id, algorithm_name))
+    return comparison.measure_timing_run(algorithm_name, max_time)
+
+
+def render_chart_job(job):
+    """Vẽ biểu đồ của một map trong process con; trả về đường dẫn file"""
+    map_id, results, output_path, dpi = job
+    ChartGenerator(dpi).generate_report(results, map_id, output_path)
+    return output_path
+
+
+def generate_scaling_family(job):
+    """Các puzzle khó nhất của các layout ngẫu nhiên với kích thước và số xe cho trước (chạy trong PinnedPool)"""
+    size, vehicles, seed, samples, state_limit = job
+    generator = PuzzleGenerator(size, vehicles, vehicles, state_limit=state_limit)
+    kept, _ = generator.generate(seed, samples)
+    return kept
+
+
+def spread_by_depth(generated, count):
+    """Tối đa count puzzle khác nhau, trải đều theo độ dài nghiệm tối ưu"""
+    unique = {}
+    for item in generated:
+        unique.setdefault(item.puzzle.to_board_string(), item)
+    ordered = sorted(unique.values(), key=lambda g: (g.optimal_length, g.state_count))
+    if len(ordered) <= count:
+        return ordered
+    picks = np.linspace(0, len(ordered) - 1, count).round().astype(int)
+    return [ordered[i] for i in sorted(set(picks))]
+
+
+def gave_up(row) -> bool:
+    """Hàng của nghiên cứu mở rộng mà thuật toán thực sự không giải nổi (không tính lần đo bị lỗi)"""
+    return any(row['outcomes'][outcome] for outcome in (RUN_TIMEOUT, RUN_OOM, RUN_UNSOLVED))
+
+
+def fit_power_law(x, y):
+    """Khớp y = c * x^k trên thang log-log; None khi không đủ điểm có x khác nhau"""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    keep = (x > 0) & (y > 0)
+    x, y = np.log(x[keep]), np.log(y[keep])
+    if len(np.unique(x)) < 2:
+        return None
+    exponent, intercept = np.polyfit(x, y, 1)
+    residual = y - (exponent * x + intercept)
+    total = np.sum((y - y.mean()) ** 2)
+    return {
+        'exponent': float(exponent),
+        'coefficient': float(np.exp(intercept)),
+        'r2': float(1 - np.sum(residual ** 2) / total) if total > 0 else 1.0,
+        'points': int(len(x)),
+    }
+
+
 class ComparisonManager:
     """Manager class để quản lý toàn bộ quá trình so sánh"""
     
-    def __init__(self, results_dir: str = "code/Comparison/Results"):
+    def __init__(self, results_dir: str = "code/Comparison/Results", level_pack: Optional[str] = None,
+                 pack_limit: Optional[int] = None, workers: Optional[int] = None, serialize_timing: bool = False,
+                 job_timeout: Optional[float] = None, benchmark: Optional[BenchmarkSettings] = None,
+                 history: Optional[str] = None, label: Optional[str] = None,
+                 cache: Optional[str] = None, refresh: bool = False,
+                 memory_limit: Optional[int] = None, jobs_per_worker: Optional[int] = 1,
+                 chart_dpi: int = 300, report: bool = True):
         self.results_dir = results_dir
+        self.level_pack = level_pack
+        self.pack_limit = pack_limit
+        # Số process con (mặc định: mỗi core một process, được ghim vào core đó)
+        self.workers = workers
+        # Chạy lần lượt các lần đo thời gian để tránh nhiễu từ các process chạy cùng lúc
+        self.serialize_timing = serialize_timing
+        # Giới hạn cứng cho mỗi job; quá hạn thì process con bị kill
+        self.job_timeout = job_timeout
+        # Warmup, số lần chạy thích ứng, KTC và kiểm định trước khi chọn thuật toán thắng
+        self.benchmark = benchmark or BenchmarkSettings()
+        # Cơ sở dữ liệu SQLite lưu mọi lần chạy (None: không lưu) và nhãn của lần chạy này
+        self.history = history
+        self.label = label
+        # Cache các job đã đo, theo mã nguồn thuật toán và đầu vào (None: không dùng); refresh bỏ qua cache cũ
+        self.cache = cache
+        self.refresh = refresh
+        # Giới hạn bộ nhớ (RLIMIT_AS, byte) của mỗi process con, và số job mỗi process chạy
+        # trước khi được thay (1: mỗi lần đo một process mới, None: dùng lại mãi)
+        self.memory_limit = memory_limit
+        self.jobs_per_worker = jobs_per_worker
+        # Giai đoạn báo cáo: dpi của biểu đồ, và có chạy ngay sau khi đo hay không
+        self.chart_dpi = chart_dpi
+        self.report = report
         os.makedirs(self.results_dir, exist_ok=True)
+
+    def load_maps(self):
+        """Các map cần so sánh: map 1-9 có sẵn, hoặc các level trong level pack"""
+        if self.level_pack is None:
+            for map_id in range(1, 10):
+                yield map_id, Puzzle.from_file(level_path(map_id))
+            return
+
+        with LevelPack(self.level_pack) as pack:
+            count = len(pack) if self.pack_limit is None else min(len(pack), self.pack_limit)
+            for index in range(count):
+                yield index + 1, pack.puzzle(index)
     
-    def run_all_comparisons(self, max_time: int = 30, runs: int = 3):
-        """Chạy so sánh cho tất cả các map"""
-        print("Bắt đầu so sánh thuật toán cho tất cả 10 map...")
+    def run_all_comparisons(self, max_time: int = 30, runs: int = 5, memory_runs: int = 1):
+        """Chạy so sánh cho tất cả các map, các job (map, thuật toán, loại, lần chạy) chạy song song
+
+        Lần đo thời gian và lần đo bộ nhớ là các job riêng. Các lần đo thời gian chạy
+        theo vòng: vòng đầu runs lần mỗi cặp (map, thuật toán), các vòng sau chỉ chạy
+        thêm cho các cặp mà KTC của trung vị còn rộng, tới benchmark.max_runs.
+        Với serialize_timing, các lần đo bộ nhớ vẫn chạy song song, còn các lần đo
+        thời gian chạy lần lượt.
+        """
+        print("Bắt đầu so sánh thuật toán cho tất cả map...")
         print("=" * 80)
-        
+
+        maps = list(self.load_maps())
+        algorithms = AlgorithmComparison.algorithms
+        puzzles = dict(maps)
+        metrics = {(map_id, name): PerformanceMetrics(name) for map_id, _ in maps for name in algorithms}
+        successes = defaultdict(int)
+        timing_runs = defaultdict(int)
+        next_run = defaultdict(int)
+        memory_left = {pair: set(range(memory_runs)) for pair in metrics}
+
+        def job(map_id, name, kind, run):
+            return self.comparison_job(map_id, puzzles[map_id], name, kind, run, max_time)
+
+        def more_runs(pair):
+            # Vòng đầu: đủ runs lần; các vòng sau: thêm một nửa số lần đã chạy cho các cặp chưa hội tụ
+            done = timing_runs[pair]
+            if done < runs:
+                return runs - done
+            if done < self.benchmark.max_runs and not self.benchmark.converged(metrics[pair].timing_samples):
+                return min(self.benchmark.max_runs - done, max(1, done // 2))
+            return 0
+
+        cache = SweepCache(self.cache) if self.cache is not None else None
+        cells = self.cell_keys(maps, max_time) if cache is not None else {}
+        cached_jobs = 0
+        if cache is not None:
+            for pair, cell in cells.items():
+                if self.refresh:
+                    cache.forget(cell)
+                cached = [(job(*pair, kind, run), status, value, wall, cpu)
+                          for kind, run, status, value, wall, cpu in cache.outcomes(cell)]
+                self.record_outcomes(cached, metrics, successes, quiet=True)
+                for (_, _, _, kind, run, *_), *_ in cached:
+                    if kind == MEMORY_RUN:
+                        memory_left[pair].discard(run)
+                    else:
+                        timing_runs[pair] += 1
+                        next_run[pair] = max(next_run[pair], run + 1)
+                cached_jobs += len(cached)
+            stale = sum(1 for pair in metrics if more_runs(pair) or memory_left[pair])
+            print(f"Cache {self.cache}: dùng lại {cached_jobs} job, "
+                  f"{len(metrics) - stale}/{len(metrics)} cặp (map, thuật toán) không cần đo lại")
+
+        def store(outcome):
+            (map_id, _, name, kind, run, *_), status, value, wall, cpu = outcome
+            # Lỗi có thể do môi trường nên không lưu; quá hạn hay hết bộ nhớ thì lần sau cũng vậy
+            if status in (OK, KILLED, OOM):
+                cache.store(cells[map_id, name], kind, run, status, value, wall, cpu)
+
+        memory_jobs = [job(map_id, name, MEMORY_RUN, run)
+                       for (map_id, name), left in memory_left.items() for run in sorted(left)]
+        todo = {pair: count for pair in metrics if (count := more_runs(pair))}
+        timing_workers = 1 if self.serialize_timing else self.workers
+        on_outcome = store if cache is not None else None
+
+        start = time.perf_counter()
+        outcomes = []
+        try:
+            if self.serialize_timing:
+                round_outcomes = self.run_jobs(memory_jobs, self.workers, max_time, on_outcome)
+                outcomes += round_outcomes
+                self.record_outcomes(round_outcomes, metrics, successes)
+                memory_jobs = []
+            while todo or memory_jobs:
+                timing_jobs = [job(map_id, name, TIMING_RUN, next_run[map_id, name] + i)
+                               for (map_id, name), count in todo.items() for i in range(count)]
+                for pair, count in todo.items():
+                    timing_runs[pair] += count
+                    next_run[pair] += count
+                jobs = timing_jobs + memory_jobs
+                memory_jobs = []
+                round_outcomes = self.run_jobs(jobs, timing_workers, max_time, on_outcome)
+                outcomes += round_outcomes
+                self.record_outcomes(round_outcomes, metrics, successes)
+
+                todo = {pair: count for pair in metrics if (count := more_runs(pair))}
+                if todo:
+                    print(f"Chạy thêm cho {len(todo)} cặp (map, thuật toán) chưa đủ hẹp KTC")
+        finally:
+            if cache is not None:
+                cache.close()
+        wall_time = time.perf_counter() - start
+        cpu_time = sum(outcome[4] for outcome in outcomes)
+
         all_results = []
-        
-        for map_id in range(1, 10):
-            print(f"\nĐang xử lý Map {map_id}...")
-            
-            try:
-                # Tạo map
-                game_map = Map()
-                game_map.load_level_data_from_file(map_id)
-                
-                # Tạo comparison object
-                comparison = AlgorithmComparison(game_map, map_id)
-                
-                # Chạy so sánh
-                results = comparison.compare_all_algorithms(max_time, runs)
-                map_result = [map_id, results]
-                all_results.append(map_result)
-                
-                # Tạo báo cáo
-                comparison.generate_reports(results, self.results_dir)
-                
-                print(f"Hoàn thành Map {map_id}")
-                
-            except Exception as e:
-                print(f"Lỗi khi xử lý Map {map_id}: {e}")
-                continue
-        
-        # Tạo báo cáo tổng hợp
-        self._create_summary_report(all_results)
+        for map_id, game_map in maps:
+            results = {name: metrics[map_id, name].calculate_averages(successes[map_id, name],
+                                                                      timing_runs[map_id, name], self.benchmark)
+                       for name in algorithms}
+            all_results.append([map_id, results])
+
+        sweep = {
+            'jobs': len(outcomes),
+            'wall_time': wall_time,
+            'cpu_time': cpu_time,
+            'speedup': cpu_time / wall_time if wall_time > 0 else 0,
+            'cached_jobs': cached_jobs,
+        }
+        print(f"\n{len(outcomes)} job trong {wall_time:.1f}s (tổng CPU của các job: {cpu_time:.1f}s), "
+              f"tăng tốc {sweep['speedup']:.2f}x")
+
+        self.save_results(all_results, sweep)
+        if self.report:
+            self.generate_reports(all_results, sweep)
+        if self.history is not None:
+            self.record_history(all_results, max_time, runs, memory_runs)
         
         print(f"\nHoàn thành so sánh cho tất cả map!")
         print(f"Kết quả được lưu trong thư mục: {self.results_dir}")
         
         return all_results
+
+    def results_path(self):
+        return os.path.join(self.results_dir, RESULTS_FILE)
+
+    def save_results(self, all_results, sweep):
+        """Lưu kết quả đo để giai đoạn báo cáo (--report-only) đọc lại"""
+        path = self.results_path()
+        stored = {'benchmark': vars(self.benchmark), 'sweep': sweep, 'maps': all_results}
+        with open(path + '.part', 'w', encoding='utf-8') as f:
+            json.dump(stored, f, ensure_ascii=False)
+        os.replace(path + '.part', path)
+        print(f"Kết quả đo đã được lưu: {path}")
+
+    def load_results(self):
+        """(all_results, sweep) đã lưu; dùng lại cấu hình kiểm định của lần đo"""
+        with open(self.results_path(), encoding='utf-8') as f:
+            stored = json.load(f)
+        self.benchmark = BenchmarkSettings(**stored['benchmark'])
+        return stored['maps'], stored['sweep']
+
+    def generate_reports(self, all_results, sweep=None):
+        """Giai đoạn báo cáo: text và CSV từng map, biểu đồ vẽ song song, báo cáo tổng hợp và HTML
+
+        Biểu đồ được vẽ trong các process con nên process đo không import matplotlib.
+        """
+        for map_id, results in all_results:
+            try:
+                AlgorithmComparison(None, map_id, benchmark=self.benchmark).generate_reports(
+                    results, self.results_dir, charts=False)
+            except Exception as e:
+                print(f"Lỗi khi xử lý Map {map_id}: {e}")
+
+        jobs = [(map_id, results, f"{self.results_dir}/{map_id:02d}_comparison_chart.png", self.chart_dpi)
+                for map_id, results in all_results]
+        if jobs:
+            start = time.perf_counter()
+            pool = PinnedPool(render_chart_job, self.workers, pin=False)
+            for (map_id, *_), status, value, _, _ in pool.run(jobs):
+                if status == OK:
+                    print(f"Biểu đồ đã được lưu: {value}")
+                else:
+                    print(f"Không thể tạo biểu đồ cho Map {map_id}: {value}")
+            print(f"Vẽ {len(jobs)} biểu đồ ({self.chart_dpi} dpi) trong {time.perf_counter() - start:.1f}s")
+
+        self._create_summary_report(all_results, sweep)
+        self.write_html_report(all_results, sweep)
+
+    def write_html_report(self, all_results, sweep=None):
+        """Một file HTML gồm bảng tổng hợp, bảng từng map và biểu đồ của map"""
+        path = f"{self.results_dir}/report.html"
+        algorithms = list(all_results[0][1]) if all_results else []
+
+        def cell(value, spec='.4f'):
+            return f"<td>{html.escape(format_metric(value, spec))}</td>"
+
+        parts = ["<!DOCTYPE html>", "<html><head><meta charset='utf-8'>",
+                 "<title>So sánh thuật toán</title>",
+                 "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin:1em 0}"
+                 "td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}th{background:#eee}"
+                 "td:first-child,th:first-child{text-align:left}img{max-width:100%}</style>",
+                 "</head><body>", "<h1>So sánh thuật toán - tất cả map</h1>"]
+        if sweep is not None:
+            parts.append(f"<p>{sweep['jobs']} job, thời gian thực {sweep['wall_time']:.1f}s, "
+                         f"tổng CPU {sweep['cpu_time']:.1f}s, dùng lại từ cache {sweep.get('cached_jobs', 0)} job</p>")
+
+        parts.append("<h2>Tóm tắt (trung vị thời gian, giây)</h2><table><tr><th>Map</th>"
+                     + "".join(f"<th>{html.escape(alg)}</th>" for alg in algorithms)
+                     + "<th>Thắng</th><th>p-value</th></tr>")
+        for map_id, results in all_results:
+            winner, p_value = pick_winner(results, self.benchmark)
+            label = winner or ('Hòa' if p_value is not None else 'N/A')
+            parts.append(f"<tr><td><a href='#map-{map_id}'>Map {map_id}</a></td>"
+                         + "".join(cell(results[alg]['median_time'] if results[alg]['times'] else None)
+                                   for alg in algorithms)
+                         + f"<td>{html.escape(label)}</td>{cell(p_value, '.3f')}</tr>")
+        parts.append("</table>")
+
+        columns = [("Trung vị (s)", lambda d: d['median_time'] if d['times'] else None, '.4f'),
+                   ("KTC thấp", lambda d: d['ci_low'] if d['times'] else None, '.4f'),
+                   ("KTC cao", lambda d: d['ci_high'] if d['times'] else None, '.4f'),
+                   ("Số lần đo", lambda d: d['timing_runs'], 'd'),
+                   ("Thành công (%)", lambda d: d['success_rate'], '.1f'),
+                   ("Bộ nhớ đỉnh (MB)", lambda d: d['average_memory'], '.2f'),
+                   ("RSS đỉnh (MB)", lambda d: d['average_peak_rss'], '.2f'),
+                   ("Độ dài nghiệm", lambda d: d['average_solution_length'], '.1f'),
+                   ("Trạng thái khám phá", lambda d: d['average_states_explored'], '.0f'),
+                   ("Nút/giây", lambda d: d['average_derived']['nodes_per_second'], '.0f'),
+                   ("b*", lambda d: d['average_derived']['effective_branching_factor'], '.3f')]
+        for map_id, results in all_results:
+            parts.append(f"<h2 id='map-{map_id}'>Map {map_id}</h2><table><tr><th>Thuật toán</th>"
+                         + "".join(f"<th>{html.escape(title)}</th>" for title, _, _ in columns) + "</tr>")
+            for alg, data in results.items():
+                outcomes = ", ".join(f"{o} {n}" for o, n in data['outcomes'].items() if n)
+                parts.append(f"<tr><td title='{html.escape(outcomes)}'>{html.escape(alg)}</td>"
+                             + "".join(cell(get(data), spec) for _, get, spec in columns) + "</tr>")
+            parts.append("</table>")
+            chart = f"{map_id:02d}_comparison_chart.png"
+            if os.path.exists(os.path.join(self.results_dir, chart)):
+                parts.append(f"<img src='{chart}' alt='Biểu đồ Map {map_id}' loading='lazy'>")
+
+        parts.append("</body></html>")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(parts) + "\n")
+        print(f"Báo cáo HTML đã được lưu: {path}")
+
+    def cell_keys(self, maps, max_time):
+        """Khóa cache của mỗi cặp (map, thuật toán)
+
+        Gồm mã băm mã nguồn module thuật toán (và các module nó import), mã đo
+        trong file này, nội dung map, các tham số ảnh hưởng tới từng lần đo và
+        máy đo. Số lần chạy không nằm trong khóa: kết quả cũ được dùng lại và
+        chỉ chạy thêm các lần còn thiếu.
+        """
+        harness = code_hash(['Game.Puzzle'], [inspect.getsource(f) for f in (
+            AlgorithmComparison.create_solver, AlgorithmComparison.warm_up, AlgorithmComparison.measure_timing_run,
+            AlgorithmComparison.measure_memory_run, run_comparison_job)])
+        params = {
+            'max_time': max_time,
+            'warmup_runs': self.benchmark.warmup_runs,
+            'workers': self.workers,
+            'serialize_timing': self.serialize_timing,
+            'memory_limit': self.memory_limit,
+            'jobs_per_worker': self.jobs_per_worker,
+        }
+        machine, _ = machine_fingerprint()
+        strategies = {name: code_hash([AlgorithmFactory.strategies[name].__module__])
+                      for name in AlgorithmComparison.algorithms}
+        return {(map_id, name): cell_key(code=strategies[name], harness=harness, algorithm=name,
+                                         puzzle=repr((puzzle.size, puzzle.vehicles, puzzle.walls)),
+                                         params=params, machine=machine)
+                for map_id, puzzle in maps for name in AlgorithmComparison.algorithms}
+
+    def run_params(self, max_time, runs, memory_runs):
+        """Các tham số quyết định hai lần chạy có so sánh được với nhau không"""
+        return {
+            'max_time': max_time,
+            'runs': runs,
+            'memory_runs': memory_runs,
+            'max_runs': self.benchmark.max_runs,
+            'warmup_runs': self.benchmark.warmup_runs,
+            'ci_target': self.benchmark.ci_target,
+            'pack': os.path.abspath(self.level_pack) if self.level_pack is not None else None,
+            'limit': self.pack_limit,
+            'workers': self.workers,
+            'serialize_timing': self.serialize_timing,
+            'memory_limit': self.memory_limit,
+            'jobs_per_worker': self.jobs_per_worker,
+        }
+
+    def record_history(self, all_results, max_time, runs, memory_runs):
+        """Thêm lần chạy này cùng các mẫu thô vào lịch sử kết quả"""
+        samples = {}
+        for map_id, results in all_results:
+            for name, data in results.items():
+                for metric, values in data['samples'].items():
+                    samples[map_id, name, metric] = values
+        try:
+            with ResultsHistory(self.history) as history:
+                run_id = history.record_run(self.run_params(max_time, runs, memory_runs), samples, self.label)
+            print(f"Lần chạy #{run_id} đã được lưu vào lịch sử: {self.history}")
+        except Exception as e:
+            print(f"Không thể lưu lịch sử kết quả: {e}")
+
+    @staticmethod
+    def record_outcomes(outcomes, metrics, successes, quiet=False):
+        for (map_id, _, algorithm_name, kind, run, *_), status, value, _, _ in outcomes:
+            if status != OK and not quiet:
+                print(f"Lỗi khi chạy {algorithm_name} ({kind}) - Map {map_id} - Lần {run + 1}: {value}")
+            measured = value if status == OK else None
+            if kind == MEMORY_RUN:
+                metrics[map_id, algorithm_name].add_memory_run(measured, status)
+            else:
+                successes[map_id, algorithm_name] += metrics[map_id, algorithm_name].add_timing_run(measured, status)
+
+    def comparison_job(self, map_id, puzzle, name, kind, run, max_time):
+        """Job của run_comparison_job; bố cục tuple chỉ được định nghĩa ở đây"""
+        return (map_id, puzzle, name, kind, run, max_time, self.benchmark)
+
+    def run_jobs(self, jobs, workers, max_time, on_outcome=None):
+        """Chạy các job trên PinnedPool, trả về danh sách (job, status, value, seconds, cpu)
+
+        on_outcome được gọi ngay khi mỗi job xong (để lưu vào cache).
+        """
+        if not jobs:
+            return []
+        pool = PinnedPool(run_comparison_job, workers, memory_limit=self.memory_limit,
+                          max_jobs=self.jobs_per_worker)
+        # Lần đo thời gian đầu tiên trong một process chạy warmup_runs lần giải khởi động trước,
+        # và với jobs_per_worker = 1 thì mọi job đều là lần đầu tiên
+        solves = 1 + self.benchmark.warmup_runs
+        timeout = self.job_timeout if self.job_timeout is not None else max_time * 1.5 * solves + 10
+        print(f"Chạy {len(jobs)} job trên {pool.workers} process")
+
+        outcomes = []
+        for outcome in pool.run(jobs, timeout):
+            (map_id, _, algorithm_name, kind, run, *_), status, _, seconds, _ = outcome
+            print(f"[{len(outcomes) + 1}/{len(jobs)}] Map {map_id} - {algorithm_name} ({kind}) - Lần {run + 1}: "
+                  f"{status} ({seconds:.2f}s)")
+            outcomes.append(outcome)
+            if on_outcome is not None:
+                on_outcome(outcome)
+        return outcomes
     
-    def _create_summary_report(self, all_results):
+    def run_scaling_study(self, sizes=(MAP_N,), vehicle_counts=(4, 6, 8, 10, 12, 14), per_family: int = 5,
+                          samples: int = 100, state_limit: int = 100000, seed: int = 0, max_time: float = 30,
+                          runs: int = 1, memory_runs: int = 1):
+        """Đo mọi thuật toán trên các họ puzzle khó dần và khớp đường tăng trưởng
+
+        Mỗi họ (kích thước bàn, số xe) lấy từ PuzzleGenerator, giữ per_family
+        puzzle trải đều theo độ dài nghiệm tối ưu. Thời gian và bộ nhớ được khớp
+        theo luật lũy thừa với số trạng thái của thành phần liên thông, rồi
+        ngoại suy số trạng thái mà thuật toán chạm max_time. Thuật toán không hỗ
+        trợ một kích thước bàn thì bỏ qua họ đó.
+        """
+        print("Sinh các họ puzzle cho nghiên cứu khả năng mở rộng...")
+        families = [(size, vehicles) for size in sizes for vehicles in vehicle_counts]
+        generation = [(size, vehicles, seed + i, samples, state_limit) for i, (size, vehicles) in enumerate(families)]
+        puzzles = []
+        pool = PinnedPool(generate_scaling_family, self.workers, memory_limit=self.memory_limit)
+        for (size, vehicles, *_), status, value, seconds, _ in pool.run(generation):
+            if status != OK:
+                print(f"Lỗi khi sinh họ {size}x{size}, {vehicles} xe: {value}")
+                continue
+            family = spread_by_depth(value, per_family)
+            print(f"Họ {size}x{size}, {vehicles} xe: {len(family)} puzzle ({seconds:.1f}s)")
+            puzzles += [(size, vehicles, generated) for generated in family]
+        puzzles.sort(key=lambda p: (p[2].state_count, p[0], p[1]))
+
+        strategies = list(AlgorithmFactory.strategies)
+        metrics = {}
+        successes = defaultdict(int)
+        timing_jobs, memory_jobs = [], []
+        for puzzle_id, (size, _, generated) in enumerate(puzzles, 1):
+            for name in strategies:
+                if not AlgorithmFactory.strategies[name].supports_size(size):
+                    continue
+                metrics[puzzle_id, name] = PerformanceMetrics(name)
+                timing_jobs += [self.comparison_job(puzzle_id, generated.puzzle, name, TIMING_RUN, run, max_time)
+                                for run in range(runs)]
+                memory_jobs += [self.comparison_job(puzzle_id, generated.puzzle, name, MEMORY_RUN, run, max_time)
+                                for run in range(memory_runs)]
+
+        if self.serialize_timing:
+            outcomes = self.run_jobs(memory_jobs, self.workers, max_time)
+            outcomes += self.run_jobs(timing_jobs, 1, max_time)
+        else:
+            outcomes = self.run_jobs(timing_jobs + memory_jobs, self.workers, max_time)
+        self.record_outcomes(outcomes, metrics, successes)
+
+        rows = []
+        for puzzle_id, (size, vehicles, generated) in enumerate(puzzles, 1):
+            for name in strategies:
+                if (puzzle_id, name) not in metrics:
+                    continue
+                data = metrics[puzzle_id, name].calculate_averages(successes[puzzle_id, name], runs, self.benchmark)
+                rows.append({
+                    'puzzle_id': puzzle_id,
+                    'algorithm': name,
+                    'size': size,
+                    'vehicles': len(generated.puzzle.vehicles),
+                    'target_vehicles': vehicles,
+                    'optimal_length': generated.optimal_length,
+                    'states': generated.state_count,
+                    'median_time': data['median_time'] if data['times'] else None,
+                    'traced_mb': float(np.median(data['samples'][TRACED_MB])) if data['samples'][TRACED_MB] else None,
+                    'nodes_expanded': data['average_states_explored'] if data['times'] else None,
+                    'success_rate': data['success_rate'],
+                    'outcomes': data['outcomes'],
+                    'board': generated.puzzle.to_board_string(),
+                })
+
+        fits = self.fit_scaling(rows, strategies, max_time)
+        self.write_scaling_csv(rows)
+        self.write_scaling_report(rows, fits, strategies, max_time)
+        try:
+            self.write_scaling_chart(rows, fits, strategies, max_time)
+        except Exception as e:
+            print(f"Không thể tạo biểu đồ mở rộng: {e}")
+        return rows, fits
+
+    @staticmethod
+    def fit_scaling(rows, strategies, max_time):
+        """Đường khớp thời gian và bộ nhớ theo số trạng thái của mỗi thuật toán, trên các lần giải được"""
+        fits = {}
+        for name in strategies:
+            solved = [row for row in rows if row['algorithm'] == name and row['success_rate'] == 100]
+            failed = [row for row in rows if row['algorithm'] == name and gave_up(row)]
+            time_fit = fit_power_law([r['states'] for r in solved], [r['median_time'] for r in solved])
+            memory_fit = fit_power_law([r['states'] for r in solved if r['traced_mb']],
+                                       [r['traced_mb'] for r in solved if r['traced_mb']])
+            limit_states = None
+            if time_fit is not None and time_fit['exponent'] > 0:
+                limit_states = (max_time / time_fit['coefficient']) ** (1 / time_fit['exponent'])
+            fits[name] = {
+                'time': time_fit,
+                'memory': memory_fit,
+                'largest_solved': max((r['states'] for r in solved), default=None),
+                'smallest_failed': min((r['states'] for r in failed), default=None),
+                'states_at_max_time': limit_states,
+            }
+        return fits
+
+    def write_scaling_csv(self, rows):
+        path = f"{self.results_dir}/scaling.csv"
+        fieldnames = ['Puzzle_ID', 'Algorithm', 'Size', 'Vehicles', 'Optimal_Length', 'States', 'Median_Time',
+                      'Traced_Peak_MB', 'Nodes_Expanded', 'Success_Rate'] + \
+                     [f'Runs_{outcome.capitalize()}' for outcome in RUN_OUTCOMES] + ['Board']
+        with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({
+                    'Puzzle_ID': row['puzzle_id'],
+                    'Algorithm': row['algorithm'],
+                    'Size': row['size'],
+                    'Vehicles': row['vehicles'],
+                    'Optimal_Length': row['optimal_length'],
+                    'States': row['states'],
+                    'Median_Time': row['median_time'],
+                    'Traced_Peak_MB': row['traced_mb'],
+                    'Nodes_Expanded': row['nodes_expanded'],
+                    'Success_Rate': row['success_rate'],
+                    **{f'Runs_{outcome.capitalize()}': row['outcomes'][outcome] for outcome in RUN_OUTCOMES},
+                    'Board': row['board'],
+                })
+        print(f"Kết quả mở rộng đã được xuất ra: {path}")
+
+    def write_scaling_report(self, rows, fits, strategies, max_time):
+        path = f"{self.results_dir}/scaling_report.txt"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("=" * 80 + "\n")
+            f.write("BAO CAO KHA NANG MO RONG - THOI GIAN VA BO NHO THEO SO TRANG THAI\n")
+            f.write("=" * 80 + "\n\n")
+            puzzles = {row['puzzle_id']: row for row in rows}.values()
+            if puzzles:
+                f.write(f"{len(puzzles)} puzzle, kích thước {sorted({p['size'] for p in puzzles})}, "
+                        f"{min(p['vehicles'] for p in puzzles)}-{max(p['vehicles'] for p in puzzles)} xe, "
+                        f"độ dài tối ưu {min(p['optimal_length'] for p in puzzles)}-"
+                        f"{max(p['optimal_length'] for p in puzzles)}, "
+                        f"{min(p['states'] for p in puzzles)}-{max(p['states'] for p in puzzles)} trạng thái\n")
+            f.write("Khớp y = c * n^k trên thang log-log (n: số trạng thái của thành phần liên thông), "
+                    "chỉ trên các puzzle giải được mọi lần\n")
+            crashed = sum(row['outcomes'][RUN_CRASH] for row in rows)
+            if crashed:
+                # Lần đo lỗi không phải là puzzle quá khó: các điểm thiếu làm sai đường khớp
+                f.write(f"CẢNH BÁO: {crashed} lần đo thời gian bị lỗi, xem log; kết quả dưới đây không đầy đủ\n")
+                print(f"Cảnh báo: {crashed} lần đo thời gian bị lỗi trong nghiên cứu mở rộng")
+            f.write("\n")
+
+            for name in strategies:
+                fit = fits[name]
+                f.write(f"{name}\n")
+                f.write("-" * 40 + "\n")
+                for title, key, unit in (("Thời gian", 'time', 'giây'), ("Bộ nhớ cấp phát đỉnh", 'memory', 'MB')):
+                    curve = fit[key]
+                    if curve is None:
+                        f.write(f"{title}: không đủ điểm để khớp\n")
+                    else:
+                        f.write(f"{title}: {curve['coefficient']:.3g} * n^{curve['exponent']:.3f} {unit} "
+                                f"(R² {curve['r2']:.3f}, {curve['points']} điểm)\n")
+                if fit['largest_solved'] is not None:
+                    f.write(f"Thành phần lớn nhất giải được: {fit['largest_solved']} trạng thái\n")
+                if fit['smallest_failed'] is not None:
+                    f.write(f"Thành phần nhỏ nhất không giải được (quá hạn, hết bộ nhớ, lỗi): "
+                            f"{fit['smallest_failed']} trạng thái\n")
+                if fit['states_at_max_time'] is not None:
+                    f.write(f"Ngoại suy chạm {max_time:g}s ở khoảng {fit['states_at_max_time']:.3g} trạng thái\n")
+                f.write("\n")
+        print(f"Báo cáo mở rộng đã được lưu: {path}")
+
+    def write_scaling_chart(self, rows, fits, strategies, max_time):
+        """Biểu đồ log-log thời gian và bộ nhớ theo số trạng thái, kèm đường khớp; X là lần không giải được"""
+        path = f"{self.results_dir}/scaling_chart.png"
+        plt = pyplot()
+        fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+        fig.suptitle('Khả năng mở rộng theo số trạng thái', fontsize=16, fontweight='bold')
+        colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+
+        for i, name in enumerate(strategies):
+            color = colors[i % len(colors)]
+            mine = [row for row in rows if row['algorithm'] == name]
+            solved = [row for row in mine if row['success_rate'] == 100]
+            failed = [row for row in mine if gave_up(row)]
+            for ax, key, fit_key in ((axes[0], 'median_time', 'time'), (axes[1], 'traced_mb', 'memory')):
+                points = [(row['states'], row[key]) for row in solved if row[key]]
+                if points:
+                    ax.scatter(*zip(*points), color=color, s=18, alpha=0.7, label=name)
+                curve = fits[name][fit_key]
+                if curve is not None and points:
+                    xs = np.geomspace(min(p[0] for p in points), max(p[0] for p in points), 50)
+                    ax.plot(xs, curve['coefficient'] * xs ** curve['exponent'], color=color, linewidth=1.5)
+            if failed:
+                axes[0].scatter([row['states'] for row in failed], [max_time] * len(failed), color=color,
+                                marker='x', s=40)
+
+        for ax, title, label in ((axes[0], 'Thời gian (trung vị)', 'Thời gian (giây)'),
+                                 (axes[1], 'Bộ nhớ cấp phát đỉnh (tracemalloc)', 'Bộ nhớ (MB)')):
+            ax.set_xscale('log')
+            ax.set_yscale('log')
+            ax.set_title(title)
+            ax.set_xlabel('Số trạng thái của thành phần liên thông')
+            ax.set_ylabel(label)
+            ax.grid(True, which='both', alpha=0.3)
+            if ax.get_legend_handles_labels()[0]:
+                ax.legend()
+        axes[0].axhline(max_time, color='gray', linestyle='--', linewidth=1)
+
+        plt.tight_layout()
+        plt.savefig(path, dpi=min(150, self.chart_dpi), bbox_inches='tight')
+        plt.close()
+        print(f"Biểu đồ mở rộng đã được lưu: {path}")
+
+    def _create_summary_report(self, all_results, sweep=None):
         """Tạo báo cáo tổng hợp"""
         summary_file = f"{self.results_dir}/00_summary_report.txt"
         
@@ -359,37 +1455,38 @@ class ComparisonManager:
             f.write("BAO CAO TONG HOP - TAT CA MAP\n")
             f.write("=" * 80 + "\n\n")
             
-            # Bảng tóm tắt
-            f.write("BANG TOM TAT HIEU SUAT\n")
+            # Bảng tóm tắt: trung vị thời gian; chỉ công bố thắng khi nhanh hơn hẳn thuật toán thứ hai
+            f.write("BANG TOM TAT HIEU SUAT (trung vi thoi gian, giay)\n")
             f.write("-" * 80 + "\n")
-            f.write(f"{'Map':<5} {'DFS Time':<10} {'BFS Time':<10} {'A* Time':<10} {'UCS Time':<10} {'Winner':<10}\n")
+            f.write(f"{'Map':<5} {'DFS Time':<10} {'BFS Time':<10} {'A* Time':<10} {'UCS Time':<10} {'Winner':<10} {'p-value':<8}\n")
             f.write("-" * 80 + "\n")
             
             algorithm_wins = {'DFS': 0, 'BFS': 0, 'A*': 0, 'UCS': 0}
+            ties = 0
             
             for map_result in all_results:
                 map_id = map_result[0]
                 results = map_result[1]
                 
                 if results:
+                    # '-' khi không có lần đo nào trả về kết quả (quá hạn cứng, hết bộ nhớ, lỗi)
                     times = {}
                     for alg in ['DFS', 'BFS', 'A*', 'UCS']:
-                        times[alg] = results[alg]['average_time']
-                    
-                    winner = 'N/A'
-                    if any(times.values()):
-                        min_time = min(times.values())
-                        for alg, time_val in times.items():
-                            if time_val == min_time:
-                                winner = alg
-                                break
+                        times[alg] = f"{results[alg]['median_time']:.4f}" if results[alg]['times'] else '-'
                     
-                    if winner != 'N/A':
+                    winner, p_value = pick_winner(results, self.benchmark)
+                    if winner is not None:
                         algorithm_wins[winner] += 1
+                    elif p_value is not None:
+                        ties += 1
+                    label = winner or ('Hoa' if p_value is not None else 'N/A')
+                    p_text = f"{p_value:.3f}" if p_value is not None else '-'
                     
-                    f.write(f"{map_id:<5} {times['DFS']:<10.4f} {times['BFS']:<10.4f} {times['A*']:<10.4f} {times['UCS']:<10.4f} {winner:<10}\n")
+                    f.write(f"{map_id:<5} {times['DFS']:<10} {times['BFS']:<10} {times['A*']:<10} {times['UCS']:<10} {label:<10} {p_text:<8}\n")
             
             f.write("\n")
+            f.write(f"Thắng: trung vị nhỏ nhất và kiểm định hoán vị với thuật toán thứ hai có p < {self.benchmark.alpha}; "
+                    f"'Hoa' khi không đủ khác biệt\n\n")
             
             # Thống kê tổng thể
             f.write("THONG KE TONG THE\n")
@@ -397,14 +1494,132 @@ class ComparisonManager:
             f.write("Số lần thắng:\n")
             for alg, wins in algorithm_wins.items():
                 f.write(f"   {alg}: {wins} lần\n")
+            f.write(f"   Hòa: {ties} lần\n")
+
+            # Kết quả các lần đo thời gian, cộng trên mọi map
+            f.write("\nKET QUA CAC LAN DO THOI GIAN\n")
+            f.write("-" * 40 + "\n")
+            f.write(f"{'Thuật toán':<11}" + "".join(f"{outcome:>10}" for outcome in RUN_OUTCOMES) + "\n")
+            for alg in algorithm_wins:
+                totals = [sum(results[alg]['outcomes'][outcome] for _, results in all_results if results)
+                          for outcome in RUN_OUTCOMES]
+                f.write(f"{alg:<11}" + "".join(f"{n:>10}" for n in totals) + "\n")
+
+            if sweep is not None:
+                f.write("\nTHOI GIAN CHAY\n")
+                f.write("-" * 40 + "\n")
+                f.write(f"Số job: {sweep['jobs']}\n")
+                f.write(f"Thời gian thực: {sweep['wall_time']:.2f} giây\n")
+                f.write(f"Tổng thời gian CPU các job: {sweep['cpu_time']:.2f} giây\n")
+                f.write(f"Tăng tốc: {sweep['speedup']:.2f}x\n")
+                f.write(f"Số job dùng lại từ cache: {sweep.get('cached_jobs', 0)}\n")
         
         print(f"Báo cáo tổng hợp đã được lưu: {summary_file}")
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="So sánh các thuật toán trên các map.")
+    parser.add_argument('-t', '--max-time', type=float, default=30, help="giới hạn thời gian mỗi lần giải")
+    parser.add_argument('-r', '--runs', type=int, default=5, help="số lần đo thời gian tối thiểu mỗi thuật toán")
+    parser.add_argument('--max-runs', type=int, default=10, help="số lần đo thời gian tối đa khi KTC còn rộng")
+    parser.add_argument('--warmup', type=int, default=1, help="số lần chạy khởi động không ghi lại")
+    parser.add_argument('--ci-target', type=float, default=0.05,
+                        help="dừng khi nửa độ rộng KTC của trung vị <= tỷ lệ này của trung vị")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--alpha', type=float, default=0.05, help="mức ý nghĩa để công bố thuật toán thắng")
+    parser.add_argument('-m', '--memory-runs', type=int, default=1, help="số lần đo bộ nhớ mỗi thuật toán")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="số process (mặc định: tất cả core)")
+    parser.add_argument('--serialize-timing', action='store_true',
+                        help="chạy lần lượt các lần đo thời gian (sau các lần đo bộ nhớ) để tránh nhiễu")
+    parser.add_argument('--job-timeout', type=float, default=None,
+                        help="giới hạn cứng mỗi job (mặc định: 1.5 x max-time x (1 + số lần warmup) + 10s)")
+    parser.add_argument('-o', '--results-dir', default="code/Comparison/Results")
+    parser.add_argument('--pack', default=None, help="level pack thay cho map 1-9")
+    parser.add_argument('--limit', type=int, default=None, help="số level tối đa lấy từ level pack")
+    parser.add_argument('--cache', default=None,
+                        help="cache các job đã đo (mặc định: sweep_cache.sqlite trong thư mục kết quả); "
+                             "chỉ đo lại các cặp có mã nguồn thuật toán hoặc đầu vào thay đổi")
+    parser.add_argument('--no-cache', action='store_true', help="đo lại tất cả, không đọc hay ghi cache")
+    parser.add_argument('--refresh', action='store_true', help="bỏ các kết quả cũ trong cache rồi đo lại tất cả")
+    parser.add_argument('--memory-limit', type=float, default=None,
+                        help="giới hạn bộ nhớ mỗi process con, MB (mặc định: RAM chia cho số process)")
+    parser.add_argument('--jobs-per-worker', type=int, default=1,
+                        help="số lần đo mỗi process con chạy trước khi được thay (0: không thay)")
+    parser.add_argument('--report-only', action='store_true',
+                        help="chỉ tạo lại báo cáo từ kết quả đã lưu trong thư mục kết quả, không đo")
+    parser.add_argument('--no-report', action='store_true', help="chỉ đo và lưu kết quả, không tạo báo cáo")
+    parser.add_argument('--preview', action='store_true',
+                        help=f"biểu đồ xem trước {ChartGenerator.PREVIEW_DPI} dpi thay cho bản in")
+    parser.add_argument('--dpi', type=int, default=300, help="dpi của biểu đồ")
+    parser.add_argument('--scaling', action='store_true',
+                        help="nghiên cứu khả năng mở rộng trên các họ puzzle sinh ngẫu nhiên thay cho map 1-9")
+    parser.add_argument('--sizes', default=str(MAP_N), help="các kích thước bàn cho --scaling, vd. 6,7")
+    parser.add_argument('--vehicles', default='4,6,8,10,12,14', help="các số xe cho --scaling")
+    parser.add_argument('--per-family', type=int, default=5, help="số puzzle mỗi họ (kích thước, số xe)")
+    parser.add_argument('--samples', type=int, default=100, help="số layout ngẫu nhiên thử cho mỗi họ")
+    parser.add_argument('--state-limit', type=int, default=100000,
+                        help="bỏ các thành phần liên thông lớn hơn khi sinh puzzle")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--history', default=None,
+                        help="cơ sở dữ liệu lịch sử kết quả (mặc định: history.sqlite trong thư mục kết quả)")
+    parser.add_argument('--no-history', action='store_true', help="không lưu lần chạy vào lịch sử")
+    parser.add_argument('--label', default=None, help="nhãn của lần chạy trong lịch sử")
+    parser.add_argument('--list-history', type=int, nargs='?', const=20, default=None, metavar='N',
+                        help="liệt kê N lần chạy gần nhất trong lịch sử rồi thoát")
+    parser.add_argument('--compare-history', nargs='?', const='', default=None, metavar='BASELINE',
+                        help="so sánh lần chạy mới nhất với BASELINE (id hoặc commit; mặc định: lần chạy "
+                             "trước đó cùng máy và tham số) rồi thoát; mã thoát 1 khi có hồi quy")
+    parser.add_argument('--run', default=None, help="lần chạy dùng làm 'mới nhất' khi so sánh (id hoặc commit)")
+    parser.add_argument('--regression-threshold', type=float, default=0.05,
+                        help="thay đổi tương đối tối thiểu của trung vị để tính là hồi quy")
+    args = parser.parse_args(argv)
+
+    benchmark = BenchmarkSettings(args.warmup, args.max_runs, args.ci_target, args.confidence, args.alpha)
+    history = args.history or os.path.join(args.results_dir, 'history.sqlite')
+
+    if args.list_history is not None or args.compare_history is not None:
+        if not os.path.exists(history):
+            parser.error(f"Chưa có lịch sử kết quả: {history}")
+        with ResultsHistory(history) as store:
+            if args.list_history is not None:
+                for run in store.runs(args.list_history):
+                    print(f"{describe_run(run)}, {store.count_samples(run.id)} mẫu")
+                return None
+
+            latest = store.find_run(args.run) if args.run else store.latest_run()
+            if latest is None:
+                parser.error(f"Không tìm thấy lần chạy {args.run or 'nào'} trong {history}")
+            baseline = store.find_run(args.compare_history) if args.compare_history else store.baseline_for(latest)
+            if baseline is None:
+                parser.error("Không tìm thấy lần chạy gốc để so sánh")
+            rows = find_regressions(store, latest, baseline, benchmark, args.regression_threshold)
+        os.makedirs(args.results_dir, exist_ok=True)
+        regressions = write_history_report(latest, baseline, rows, benchmark, args.regression_threshold,
+                                           os.path.join(args.results_dir, '00_history_report.txt'))
+        parser.exit(1 if regressions else 0)
+
+    memory_limit = args.memory_limit * 1024 * 1024 if args.memory_limit is not None else \
+        psutil.virtual_memory().total // (args.workers or len(available_cores()))
+    manager = ComparisonManager(args.results_dir, args.pack, args.limit,
+                                args.workers, args.serialize_timing, args.job_timeout, benchmark,
+                                None if args.no_history else history, args.label,
+                                None if args.no_cache else args.cache or os.path.join(args.results_dir, 'sweep_cache.sqlite'),
+                                args.refresh, int(memory_limit), args.jobs_per_worker or None,
+                                ChartGenerator.PREVIEW_DPI if args.preview else args.dpi, not args.no_report)
+    if args.report_only:
+        if not os.path.exists(manager.results_path()):
+            parser.error(f"Chưa có kết quả đã lưu: {manager.results_path()}")
+        all_results, sweep = manager.load_results()
+        manager.generate_reports(all_results, sweep)
+        return all_results
+    if args.scaling:
+        return manager.run_scaling_study([int(x) for x in args.sizes.split(',')],
+                                         [int(x) for x in args.vehicles.split(',')], args.per_family,
+                                         args.samples, args.state_limit, args.seed, args.max_time,
+                                         args.runs, args.memory_runs)
+    return manager.run_all_comparisons(max_time=args.max_time, runs=args.runs, memory_runs=args.memory_runs)
+
+
 if __name__ == "__main__":
     # Chạy so sánh cho tất cả map
-    manager = ComparisonManager()
-    results = manager.run_all_comparisons(
-        max_time=30,   
-        runs=3          # số lần chạy mỗi thuật toán
-    )
\ No newline at end of file
+    main()
@@ -0,0 +1,163 @@
+from Game.LevelPack import LevelPackWriter, UNKNOWN_LENGTH, UNKNOWN_STATES
+from Game.Puzzle import Puzzle
+from constants import *
+import numpy as np
+
+
+SPACE, TAB, NEWLINE, CR = ord(' '), ord('\t'), ord('\n'), ord('\r')
+DOT, EMPTY, WALL = ord('.'), ord('o'), ord('x')
+MAX_DIGITS = 10
+LETTERS = 26
+
+
+class BoardImporter:
+    """Streams a file of standard Rush Hour board strings.
+
+    A line is either just the board, or "<moves> <board> <cluster size>" as in
+    the public database dumps. Each chunk of the file is split into lines and
+    fields with NumPy index arithmetic instead of a Python loop per line, so
+    corpora with millions of boards go straight into a level pack.
+    """
+
+    def __init__(self, path, size=MAP_N, chunk_bytes=1 << 24):
+        self.path = path
+        self.size = size
+        self.cells = size * size
+        self.chunk_bytes = chunk_bytes
+        self.rejected = 0
+        self.dtype = np.dtype([('board', f'S{self.cells}'),
+                               ('optimal_length', '<i2'),
+                               ('state_count', '<u4')])
+
+    def read_chunks(self):
+        """Yield file chunks that end on a line boundary."""
+        carry = b''
+        with open(self.path, 'rb') as f:
+            while True:
+                data = f.read(self.chunk_bytes)
+                if not data:
+                    break
+                data = carry + data
+                cut = data.rfind(b'\n') + 1
+                if cut == 0:
+                    carry = data
+                    continue
+                carry = data[cut:]
+                yield data[:cut]
+        if carry:
+            yield carry
+
+    def parse_chunk(self, data):
+        """Structured array of (board, optimal_length, state_count) for one chunk."""
+        arr = np.frombuffer(data, dtype=np.uint8)
+        ends = np.flatnonzero(arr == NEWLINE)
+        if len(arr) and arr[-1] != NEWLINE:
+            ends = np.append(ends, len(arr))
+        starts = np.concatenate(([0], ends[:-1] + 1)).astype(np.int64)
+        has_cr = (ends > starts) & (arr[np.maximum(ends - 1, 0)] == CR)
+        ends = ends - has_cr
+
+        non_empty = ends > starts
+        starts, ends = starts[non_empty], ends[non_empty]
+
+        separators = np.flatnonzero((arr == SPACE) | (arr == TAB))
+        first = np.searchsorted(separators, starts)
+        fields = np.searchsorted(separators, ends) - first + 1
+
+        bare = fields == 1
+        dumped = fields == 3
+        seps = np.append(separators, len(arr))
+        sep1 = seps[np.minimum(first, len(seps) - 1)]
+        sep2 = seps[np.minimum(first + 1, len(seps) - 1)]
+
+        board_start = np.where(bare, starts, sep1 + 1)
+        board_end = np.where(bare, ends, sep2)
+        valid = (bare | dumped) & (board_end - board_start == self.cells)
+
+        moves, moves_ok = self.parse_ints(arr, starts, sep1)
+        states, states_ok = self.parse_ints(arr, sep2 + 1, ends)
+        valid &= bare | (moves_ok & states_ok)
+
+        self.rejected += int(len(starts) - valid.sum())
+        board_start = board_start[valid]
+        boards = arr[board_start[:, None] + np.arange(self.cells)]
+        boards[boards == DOT] = EMPTY
+
+        records = np.zeros(len(board_start), dtype=self.dtype)
+        records['board'] = np.ascontiguousarray(boards).view(f'S{self.cells}').ravel()
+        records['optimal_length'] = np.where(bare[valid], UNKNOWN_LENGTH,
+                                             np.minimum(moves[valid], np.iinfo(np.int16).max))
+        records['state_count'] = np.where(bare[valid], UNKNOWN_STATES,
+                                          np.minimum(states[valid], np.iinfo(np.uint32).max))
+        return records
+
+    def parse_ints(self, arr, lo, hi):
+        """Decimal value of every arr[lo:hi] field at once, plus a validity mask."""
+        width = hi - lo
+        k = np.arange(MAX_DIGITS)
+        in_field = k < width[:, None]
+        idx = np.clip(hi[:, None] - 1 - k, 0, max(len(arr) - 1, 0))
+        digits = arr[idx].astype(np.int64) - ord('0')
+        ok = (width > 0) & (width <= MAX_DIGITS) & np.all(~in_field | ((digits >= 0) & (digits <= 9)), axis=1)
+        values = np.where(in_field, digits, 0) @ (10 ** k)
+        return values, ok
+
+    def record_batches(self):
+        for chunk in self.read_chunks():
+            records = self.parse_chunk(chunk)
+            if len(records):
+                yield records
+
+    def playable(self, records):
+        """Records whose board parses as a Puzzle; the others are counted as rejected.
+
+        parse_chunk only checks the line layout, so a well-formed line can still
+        hold a bent or broken vehicle that LevelPack.puzzle() could not load.
+        The rules of Puzzle.from_board_string are checked for every (board,
+        letter) pair of the batch at once: the cell count and the row and column
+        span of each vehicle, which must lie on one row or column with a span of
+        exactly count - 1 cells.
+        """
+        boards = np.ascontiguousarray(records['board']).view(np.uint8).reshape(len(records), self.cells)
+        letters = (boards >= ord('A')) & (boards <= ord('Z'))
+        keep = np.all(letters | (boards == EMPTY) | (boards == WALL), axis=1)
+
+        rows, cells = np.nonzero(letters)
+        vehicle = rows * LETTERS + boards[rows, cells] - ord('A')
+        count = np.bincount(vehicle, minlength=len(records) * LETTERS)
+        span = {}
+        for axis, coord in (('x', cells % self.size), ('y', cells // self.size)):
+            lo = np.full(len(count), self.size, dtype=np.int8)
+            hi = np.full(len(count), -1, dtype=np.int8)
+            np.minimum.at(lo, vehicle, coord.astype(np.int8))
+            np.maximum.at(hi, vehicle, coord.astype(np.int8))
+            span[axis] = hi.astype(np.int64) - lo
+        horizontal = (span['y'] == 0) & (span['x'] == count - 1)
+        vertical = (span['x'] == 0) & (span['y'] == count - 1)
+        ok = (count == 0) | ((count >= 2) & (horizontal | vertical))
+        keep &= ok.reshape(len(records), LETTERS).all(axis=1)
+        self.rejected += int(len(records) - keep.sum())
+        return records[keep]
+
+    def to_pack(self, output):
+        """Write every valid board into a level pack, return the number written."""
+        count = 0
+        with LevelPackWriter(output, self.size) as writer:
+            if writer.record.size != self.dtype.itemsize:
+                raise ValueError("Level pack record layout does not match the importer")
+            for records in self.record_batches():
+                records = self.playable(records)
+                writer.write_raw(records.tobytes(), len(records))
+                count += len(records)
+        return count
+
+    def puzzles(self):
+        """Yield (puzzle, optimal_length, state_count) for solver consumption."""
+        for records in self.record_batches():
+            for board, optimal_length, state_count in records.tolist():
+                try:
+                    puzzle = Puzzle.from_board_string(board.decode('ascii'), self.size)
+                except (ValueError, UnicodeDecodeError):
+                    self.rejected += 1
+                    continue
+                yield puzzle, optimal_length, state_count
@@ -0,0 +1,40 @@
+import os
+
+
+def read_level_file(path):
+    """Read a Map/*.txt level as (image_key, orient, length, x, y, name) rows.
+
+    Kept free of pygame so headless tools can load levels without the game.
+    """
+    rows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            image_key, direction, length, x, y, name = line.strip().split()
+            rows.append((image_key, direction, int(length), int(x), int(y), name))
+    return rows
+
+
+def write_level_file(path, rows):
+    """Write (image_key, orient, length, x, y, name) rows in the format read_level_file reads."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(' '.join(str(field) for field in row) + "\n")
+
+
+def level_path(level_num):
+    """Path of a shipped level, code/Map/<level_num>.txt."""
+    base_path = os.path.dirname(os.path.dirname(__file__))
+    return os.path.join(base_path, 'Map', f"{level_num}.txt")
+
+
+def list_level_files(folder):
+    """Level files of a folder, numeric names in numeric order."""
+    files = [f for f in os.listdir(folder) if f.endswith('.txt')]
+
+    def sort_key(filename):
+        stem = os.path.splitext(filename)[0]
+        return (0, int(stem), '') if stem.isdigit() else (1, 0, stem)
+
+    return [os.path.join(folder, f) for f in sorted(files, key=sort_key)]
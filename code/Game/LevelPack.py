@@ -0,0 +1,120 @@
+from collections import namedtuple
+from Game.Puzzle import Puzzle
+from constants import *
+import mmap
+import struct
+
+
+# Header: magic, version, board side, record size, record count, reserved.
+HEADER = struct.Struct('<4sHHIQ12x')
+MAGIC = b'RHPK'
+VERSION = 1
+
+UNKNOWN_LENGTH = -1
+UNKNOWN_STATES = 0
+
+
+LevelRecord = namedtuple('LevelRecord', ['board', 'optimal_length', 'state_count'])
+
+
+def record_struct(size=MAP_N):
+    """Fixed-size record: board string, optimal length in slides, component size."""
+    return struct.Struct(f'<{size * size}shI')
+
+
+def is_level_pack(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class LevelPackWriter:
+    """Streams records to a pack file; the header count is patched on close."""
+
+    def __init__(self, path, size=MAP_N):
+        self.size = size
+        self.record = record_struct(size)
+        self.count = 0
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, size, self.record.size, 0))
+
+    def write(self, board, optimal_length=UNKNOWN_LENGTH, state_count=UNKNOWN_STATES):
+        if isinstance(board, Puzzle):
+            board = board.to_board_string()
+        self.file.write(self.record.pack(board.encode('ascii'), optimal_length, state_count))
+        self.count += 1
+
+    def write_raw(self, data, count):
+        """Append count records already packed in the record layout."""
+        if len(data) != count * self.record.size:
+            raise ValueError("Raw record data does not match the record size")
+        self.file.write(data)
+        self.count += count
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.size, self.record.size, self.count))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LevelPack:
+    """Read-only, memory-mapped pack of levels with O(1) random access."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{path} is empty, not a level pack")
+
+        magic, version, self.size, record_size, self.count = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a level pack")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported level pack version {version}")
+
+        self.record = record_struct(self.size)
+        if record_size != self.record.size or HEADER.size + self.count * record_size > len(self.mm):
+            self.close()
+            raise ValueError(f"{path} is truncated or has a bad record size")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("level index out of range")
+        board, optimal_length, state_count = self.record.unpack_from(
+            self.mm, HEADER.size + index * self.record.size)
+        return LevelRecord(board.decode('ascii'), optimal_length, state_count)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def puzzle(self, index):
+        return Puzzle.from_board_string(self[index].board, self.size)
+
+    def close(self):
+        if getattr(self, 'mm', None) is not None and not self.mm.closed:
+            self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
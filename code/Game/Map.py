@@ -1,6 +1,10 @@
 from SolverAlgorithms.Solver import PuzzleSolver
 from SolverAlgorithms.SolverFactory import StrategyFactory
+from SolverAlgorithms.HintTable import HintTable
+from SolverAlgorithms.SearchMemory import SearchMemory
 from Game.Vehicle import Vehicle
+from Game.Puzzle import Puzzle
+from Game.LevelFile import level_path
 from constants import *
 from Resource.Resource import ResourceManager
 from typing import Dict
@@ -11,7 +15,9 @@ import os
 
 class Map:
     def __init__(self):
-        self.initial_vehicles = []
+        self.puzzle = None
+        self.hint_table = None
+        self.search_memory = {}
         self.vehicles = []
         self.current_level = 1
         self.level_data = self.create_level_data()
@@ -31,6 +37,7 @@ class Map:
         self.current_algorithm = ""
         self.nodes_expanded = 0
         self.total_cost = 0
+        self.solve_result = None
         
         self.game_won = False
         self.victory_animation_started = False
@@ -40,21 +47,21 @@ class Map:
     def create_level_data(self): 
         """Create 2 different level for testing"""
         levels = {
-            1: [
-                Vehicle('target', 'h', 2, 0, 2, 'A'),
-                Vehicle('v2', 'h', 2, 0, 0, 'B'),
-                Vehicle('v2', 'h', 2, 3, 1, 'C'),
-                Vehicle('v3', 'v', 3, 2, 0, 'D'),
-                Vehicle('v2', 'h', 2, 0, 4, 'E'),
-                Vehicle('v2', 'v', 2, 4, 3, 'F'),
-            ],
-            2: [
-                Vehicle('target', 'h', 2, 1, 2, 'A'),
-                Vehicle('v2', 'v', 2, 0, 0, 'B'),
-                Vehicle('v3', 'h', 3, 2, 0, 'C'),
-                Vehicle('v2', 'v', 2, 3, 1, 'D'),
-                Vehicle('v2', 'h', 2, 1, 4, 'E'),
-            ],
+            1: Puzzle([
+                ('target', 'h', 2, 0, 2, 'A'),
+                ('v2', 'h', 2, 0, 0, 'B'),
+                ('v2', 'h', 2, 3, 1, 'C'),
+                ('v3', 'v', 3, 2, 0, 'D'),
+                ('v2', 'h', 2, 0, 4, 'E'),
+                ('v2', 'v', 2, 4, 3, 'F'),
+            ]),
+            2: Puzzle([
+                ('target', 'h', 2, 1, 2, 'A'),
+                ('v2', 'v', 2, 0, 0, 'B'),
+                ('v3', 'h', 3, 2, 0, 'C'),
+                ('v2', 'v', 2, 3, 1, 'D'),
+                ('v2', 'h', 2, 1, 4, 'E'),
+            ]),
         }
         return levels
 
@@ -62,32 +69,32 @@ class Map:
         """Load a specific level"""
         if level_num in self.level_data:
             self.current_level = level_num
-            self.initial_vehicles = self.level_data[level_num]
+            self.puzzle = self.level_data[level_num]
             self.reset()
 
     def load_level_data_from_file(self, level_num):
         if level_num in range(NUMBER_OF_MAP + 1): 
             self.current_level = level_num
+            self.puzzle = Puzzle.from_file(level_path(level_num))
+            self.reset()
 
-            name_map = f"{level_num}.txt"
-            base_path = os.path.dirname(os.path.dirname(__file__))  
-            map_folder = os.path.join(base_path, 'Map')            
-            full_path = os.path.join(map_folder, name_map)          
-
-            vehicles = []
-
-            with open(full_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    image_key, direction, length, row, col, name = line.strip().split()
-                    vehicle = Vehicle(image_key, direction, int(length), int(row), int(col), name)
-                    vehicles.append(vehicle)
-
-            self.initial_vehicles = vehicles
+    def get_puzzle(self):
+        """Puzzle of the board as it is now, including vehicles the player dragged."""
+        return self.puzzle.with_positions({v.name: (v.x, v.y) for v in self.vehicles})
 
-            self.reset()
+    def get_hint(self):
+        """Optimal next slide (name, dx, dy, moves left) for the current board, or None."""
+        if self.hint_table is None:
+            return None
+        return self.hint_table.next_move(self.get_puzzle())
 
     def reset(self):
-        self.vehicles = [v.copy() for v in self.initial_vehicles]
+        self.vehicles = [Vehicle(*v) for v in self.puzzle.vehicles]
+        if self.hint_table is None or self.hint_table.puzzle is not self.puzzle:
+            # New level: solve its whole state space in the background and
+            # forget which strategies solved the previous one.
+            self.hint_table = HintTable(self.puzzle).start()
+            self.search_memory = {}
         self.selected_vehicle = None
         self.solving = False
         self.solution_moves = []
@@ -101,6 +108,7 @@ class Map:
         self.solve_start_time = 0
         self.current_algorithm = ""
         self.nodes_expanded = 0
+        self.solve_result = None
 
     def update(self):
 
@@ -128,12 +136,16 @@ class Map:
             self.nodes_expanded = 0
 
             strategy = StrategyFactory.create_strategy(nameAlgo, self)
+            strategy.memory = self.search_memory.setdefault(nameAlgo, SearchMemory(self.hint_table))
             
             self.reset_victory_animation()
 
             self.solver = PuzzleSolver(self, strategy) 
             
-            solution, self.nodes_expanded, self.total_cost = self.solver.solve()
+            self.solve_result = self.solver.solve()
+            solution = self.solve_result.path
+            self.nodes_expanded = self.solve_result.nodes_expanded
+            self.total_cost = self.solve_result.cost
 
             if solution:
                 self.solution_moves = solution
@@ -147,7 +159,7 @@ class Map:
                 self.print_solution(solution)
             else:
                 self.solving_failed = True
-                print("No solution found!")
+                print(f"No solution found! ({self.solve_result.termination})")
                 self.save_statistics(0, False)  
 
     def print_solution(self, solution):
@@ -157,9 +169,6 @@ class Map:
     def save_statistics(self, solution_length, solved=True):
         solve_time = time.time() - self.solve_start_time
         
-        if self.solver and hasattr(self.solver, 'nodes_expanded'):
-            self.nodes_expanded = self.solver.nodes_expanded
-        
         statistics = {
             'level': self.current_level,
             'algorithm': self.current_algorithm,
@@ -169,6 +178,9 @@ class Map:
             'solved': solved,
             'timestamp': time.time()
         }
+        if self.solve_result is not None:
+            # Search counters: generated/pruned nodes, frontier, memory, phase times.
+            statistics['search'] = self.solve_result.to_dict()
         
         base_path = os.path.dirname(os.path.dirname(__file__))
         stats_file = os.path.join(base_path, 'statistic.txt')
@@ -228,6 +240,8 @@ class Map:
             for x, y in vehicle.positions():
                 if 0 <= x < MAP_N and 0 <= y < MAP_N:
                     grid[y][x] = i + 1
+        for x, y in self.puzzle.walls:
+            grid[y][x] = -1
         return grid
 
     def is_valid_move(self, vehicle, new_x, new_y):
@@ -0,0 +1,133 @@
+from collections import namedtuple
+from Game.LevelFile import read_level_file
+from constants import *
+
+
+class PuzzleVehicle(namedtuple('PuzzleVehicle', ['image_key', 'orient', 'length', 'x', 'y', 'name'])):
+    """Immutable vehicle record, same field order as a level file line."""
+    __slots__ = ()
+
+    @property
+    def is_target(self):
+        return self.image_key == 'target'
+
+
+class Puzzle:
+    """Immutable, pygame-free description of a board.
+
+    This is all a solver needs: (name, orient, length, x, y) per vehicle.
+    Map builds one per level and hands the solvers a Puzzle of the current
+    board through get_puzzle(); a Puzzle answers get_puzzle() with itself so
+    headless tools can pass it to a strategy directly. walls holds the (x, y)
+    cells of fixed walls found in imported boards.
+    """
+    __slots__ = ('vehicles', 'size', 'walls', '_start_tuple')
+
+    def __init__(self, vehicles, size=MAP_N, walls=()):
+        object.__setattr__(self, 'vehicles', tuple(PuzzleVehicle(*v) for v in vehicles))
+        object.__setattr__(self, 'size', size)
+        object.__setattr__(self, 'walls', tuple(sorted(walls)))
+        object.__setattr__(self, '_start_tuple', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Puzzle is immutable")
+
+    def __reduce__(self):
+        return (Puzzle, (self.vehicles, self.size, self.walls))
+
+    def __eq__(self, other):
+        return (isinstance(other, Puzzle) and self.size == other.size
+                and self.vehicles == other.vehicles and self.walls == other.walls)
+
+    def __hash__(self):
+        return hash((self.size, self.vehicles, self.walls))
+
+    def __len__(self):
+        return len(self.vehicles)
+
+    def __repr__(self):
+        return f"Puzzle({len(self.vehicles)} vehicles, size={self.size})"
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(read_level_file(path))
+
+    @classmethod
+    def from_vehicles(cls, vehicles, size=MAP_N):
+        """Snapshot of game Vehicle objects (or anything with the same attributes)."""
+        return cls([(v.image_key, v.orient, v.len, v.x, v.y, v.name) for v in vehicles], size)
+
+    @classmethod
+    def from_board_string(cls, board, size=MAP_N):
+        """Parse a row-major board string.
+
+        'o' or '.' is empty, 'x' a wall, letters are vehicles and 'A' the target.
+        """
+        if len(board) != size * size:
+            raise ValueError(f"Board string must have {size * size} cells, got {len(board)}")
+        cells = {}
+        walls = []
+        for i, c in enumerate(board):
+            if c in 'o.':
+                continue
+            if c == 'x':
+                walls.append((i % size, i // size))
+                continue
+            if not 'A' <= c <= 'Z':
+                raise ValueError(f"Unsupported board cell {c!r}")
+            cells.setdefault(c, []).append((i % size, i // size))
+
+        rows = []
+        for name in sorted(cells):
+            xs = {x for x, _ in cells[name]}
+            ys = {y for _, y in cells[name]}
+            length = len(cells[name])
+            if len(ys) == 1 and length == max(xs) - min(xs) + 1:
+                orient = 'h'
+            elif len(xs) == 1 and length == max(ys) - min(ys) + 1:
+                orient = 'v'
+            else:
+                raise ValueError(f"Vehicle {name} is not a straight line")
+            if length < 2:
+                raise ValueError(f"Vehicle {name} is shorter than 2 cells")
+            image_key = 'target' if name == 'A' else f"v{length}"
+            rows.append((image_key, orient, length, min(xs), min(ys), name))
+        return cls(rows, size, walls)
+
+    def to_board_string(self):
+        cells = ['o'] * (self.size * self.size)
+        for v in self.vehicles:
+            for i in range(v.length):
+                x, y = (v.x + i, v.y) if v.orient == 'h' else (v.x, v.y + i)
+                cells[y * self.size + x] = v.name
+        for x, y in self.walls:
+            cells[y * self.size + x] = 'x'
+        return ''.join(cells)
+
+    def get_puzzle(self):
+        return self
+
+    def start_tuple(self):
+        if self._start_tuple is None:
+            start = tuple(sorted((v.name, v.x, v.y) for v in self.vehicles))
+            object.__setattr__(self, '_start_tuple', start)
+        return self._start_tuple
+
+    def wall_mask(self):
+        """Walls as a BitBoard cell mask (bit y * size + x)."""
+        mask = 0
+        for x, y in self.walls:
+            mask |= 1 << (y * self.size + x)
+        return mask
+
+    def car_info(self):
+        return {v.name: (v.orient.lower(), v.length) for v in self.vehicles}
+
+    def with_positions(self, positions):
+        """Puzzle with some vehicles moved; positions maps name -> (x, y)."""
+        moved = [v._replace(x=positions[v.name][0], y=positions[v.name][1])
+                 if v.name in positions else v
+                 for v in self.vehicles]
+        if all(a is b or a == b for a, b in zip(moved, self.vehicles)):
+            return self
+        return Puzzle(moved, self.size, self.walls)
@@ -0,0 +1,80 @@
+from Game.Puzzle import Puzzle
+from SolverAlgorithms.StateSpace import StateSpace
+from collections import namedtuple
+from constants import *
+import random
+
+
+VEHICLE_NAMES = 'BCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+GeneratedPuzzle = namedtuple('GeneratedPuzzle', ['puzzle', 'optimal_length', 'state_count'])
+
+
+class PuzzleGenerator:
+    """Samples random legal layouts and keeps the hardest state of each component.
+
+    The component of a random layout is enumerated with StateSpace; its state
+    farthest from any goal becomes the puzzle, so the emitted optimal length
+    is exact. Plain attributes only, so instances can be sent to worker
+    processes.
+    """
+
+    def __init__(self, size=MAP_N, min_vehicles=11, max_vehicles=15, long_vehicle_rate=0.25,
+                 state_limit=50000, min_length=1):
+        self.size = size
+        self.exit_row = (size - 1) // 2
+        self.min_vehicles = min_vehicles
+        self.max_vehicles = min(max_vehicles, len(VEHICLE_NAMES) + 1)
+        self.long_vehicle_rate = long_vehicle_rate
+        self.state_limit = state_limit
+        self.min_length = min_length
+
+    def random_layout(self, rng):
+        size = self.size
+        occupied = set()
+        target_x = rng.randrange(0, size - 2)
+        rows = [('target', 'h', 2, target_x, self.exit_row, 'A')]
+        occupied.update({(target_x, self.exit_row), (target_x + 1, self.exit_row)})
+
+        count = rng.randint(self.min_vehicles, self.max_vehicles)
+        for name in VEHICLE_NAMES[:count - 1]:
+            for _ in range(50):
+                length = 3 if rng.random() < self.long_vehicle_rate else 2
+                orient = rng.choice('hv')
+                # Horizontal cars in the exit row only make unsolvable layouts.
+                if orient == 'h':
+                    y = rng.randrange(size)
+                    if y == self.exit_row:
+                        continue
+                    x = rng.randrange(size - length + 1)
+                    cells = {(x + i, y) for i in range(length)}
+                else:
+                    x = rng.randrange(size)
+                    y = rng.randrange(size - length + 1)
+                    cells = {(x, y + i) for i in range(length)}
+                if cells & occupied:
+                    continue
+                occupied |= cells
+                rows.append((f"v{length}", orient, length, x, y, name))
+                break
+        return Puzzle(rows, size)
+
+    def hardest_of(self, puzzle):
+        """GeneratedPuzzle for the hardest state in puzzle's component, or None."""
+        space, start = StateSpace.from_puzzle(puzzle)
+        stats = space.analyze(start, self.state_limit)
+        if stats is None or stats.hardest_length < self.min_length:
+            return None
+        hardest = space.board.decode(stats.hardest_state)
+        hardest_puzzle = puzzle.with_positions({name: (x, y) for name, x, y in hardest})
+        return GeneratedPuzzle(hardest_puzzle, stats.hardest_length, stats.size)
+
+    def generate(self, seed, samples):
+        """Try samples random layouts; return (kept puzzles, samples tried)."""
+        rng = random.Random(seed)
+        kept = []
+        for _ in range(samples):
+            generated = self.hardest_of(self.random_layout(rng))
+            if generated is not None:
+                kept.append(generated)
+        return kept, samples
@@ -3,6 +3,7 @@ from Game.Map import Map
 from UI.Button import Button
 from UI.Text import Text, Font
 from Audio.AudioManager import AudioManager
+from SolverAlgorithms.SolveResult import TIMEOUT
 import time
 from constants import *
 import pygame
@@ -43,6 +44,7 @@ class GameScreen(Screen):
         left_margin = 20
         
         self.start_btn = Button("Start", (left_margin, SCREEN_H - button_height - bottom_margin), button_width, button_height, GREEN)
+        self.hint_btn = Button("Hint", (left_margin, SCREEN_H - bottom_margin - (button_height * 2 + button_spacing)), button_width, button_height, GOLD)
         
         algo_start_y = SCREEN_H - bottom_margin - button_height
         self.solve_bfs = Button("BFS", (left_margin, algo_start_y - (button_height + button_spacing) * 3), button_width, button_height, BLUE)
@@ -57,13 +59,14 @@ class GameScreen(Screen):
         
         self.all_buttons = [
             self.back_btn, self.menu_btn, self.next_level_btn,
-            self.start_btn, self.solve_bfs, self.solve_dfs, self.solve_astar,
+            self.start_btn, self.hint_btn, self.solve_bfs, self.solve_dfs, self.solve_astar,
             self.solve_ucs, self.reset_btn, self.pause_btn, self.try_again_btn
         ]
         
         self.level_text = Text("Level: 1", WHITE, (SCREEN_W//2, 30), font=Font(32)) 
         self.algorithm_text = Text("", WHITE, (SCREEN_W//2, 70), font=Font(24))  
         self.status_text = Text("Click Start to begin", WHITE, (SCREEN_W//2, SCREEN_H - 50), font=Font(20)) 
+        self.hint_text = Text("", GOLD, (SCREEN_W//2, 70), font=Font(24))
         self.instruction_text = Text("Select an algorithm:", (255, 255, 100), (left_margin + button_width + 20, algo_start_y - 60), font=Font(22), center=False)  
         
         self.no_solution_text = Text("No solution found for this puzzle!", (255, 100, 100), (SCREEN_W//2, SCREEN_H//2), font=Font(100))  
@@ -95,6 +98,7 @@ class GameScreen(Screen):
         
         self.level_text.set_text(f"Level: {level_num}")
         self.algorithm_text.set_text("")
+        self.hint_text.set_text("")
         self.status_text.set_text("Click Start to begin")
 
     def update_algorithm_info(self):
@@ -105,10 +109,11 @@ class GameScreen(Screen):
             current_move = self.map.current_move_index if self.map.current_move_index < total_moves else total_moves
             self.current_move_text.set_text(f"Current Move: {current_move}")
 
-            nodes_expanded = self.map.nodes_expanded if self.map.nodes_expanded else 0
+            result = self.map.solve_result
+            nodes_expanded = result.nodes_expanded if result else 0
             self.nodes_expanded_text.set_text(f"Nodes Expanded: {nodes_expanded}")
 
-            total_cost = self.map.total_cost if self.map.total_cost else 0
+            total_cost = result.cost if result else 0
             self.total_cost_text.set_text(f"Total Cost (g(n)): {total_cost}")
         else:
             self.total_moves_text.set_text("Total Moves: 0")
@@ -138,9 +143,36 @@ class GameScreen(Screen):
         self.is_paused = False 
         self.map.solving_failed = False  
 
+    def show_hint(self):
+        hint_table = self.map.hint_table
+        if hint_table is None or not hint_table.is_ready():
+            self.hint_text.set_text("Hint: still analysing this level...")
+            return
+        if hint_table.too_large:
+            self.hint_text.set_text("Hint: this level is too large to analyse")
+            return
+
+        hint = self.map.get_hint()
+        if hint is None:
+            if hint_table.lookup(self.map.get_puzzle()) is not None:
+                self.hint_text.set_text("Hint: the target car can drive out now!")
+            else:
+                self.hint_text.set_text("Hint: no solution from this position, try Reset")
+            return
+
+        name, dx, dy, moves_left = hint
+        if dx:
+            direction = "right" if dx > 0 else "left"
+        else:
+            direction = "down" if dy > 0 else "up"
+        steps = abs(dx or dy)
+        self.hint_text.set_text(f"Hint: move {name} {direction} {steps} "
+                                f"{'cell' if steps == 1 else 'cells'} ({moves_left} moves left)")
+
     def reset_to_start(self):
         self.ui_state = "start"
         self.algorithm_text.set_text("")
+        self.hint_text.set_text("")
         self.algorithm_start_time = 0
         self.current_execution_time = 0
         self.no_solution_timer = 0
@@ -197,7 +229,11 @@ class GameScreen(Screen):
                 current_algorithm = getattr(self.map, 'current_algorithm', 'Unknown')
                 self.status_text.set_text(f"Solving using {current_algorithm}...")
         elif self.ui_state == "no_solution":
-            self.status_text.set_text("No solution found! Click Try Again or wait for auto-reset.")
+            result = self.map.solve_result
+            if result is not None and result.termination == TIMEOUT:
+                self.status_text.set_text(f"Search timed out after {result.nodes_expanded} nodes! Click Try Again.")
+            else:
+                self.status_text.set_text("No solution found! Click Try Again or wait for auto-reset.")
         
         return True
     
@@ -209,7 +245,7 @@ class GameScreen(Screen):
         visible_buttons = [self.back_btn, self.next_level_btn, self.menu_btn]
         
         if self.ui_state == "start":
-            visible_buttons.append(self.start_btn)
+            visible_buttons.extend([self.start_btn, self.hint_btn])
         elif self.ui_state == "algorithm_select":
             visible_buttons.extend([self.solve_bfs, self.solve_dfs, self.solve_astar, self.solve_ucs])
         elif self.ui_state == "solving":
@@ -222,7 +258,9 @@ class GameScreen(Screen):
     def get_visible_texts(self):
         visible_texts = [self.level_text, self.status_text] 
             
-        if self.ui_state == "algorithm_select":
+        if self.ui_state == "start":
+            visible_texts.append(self.hint_text)
+        elif self.ui_state == "algorithm_select":
             visible_texts.append(self.instruction_text) 
         elif self.ui_state == "no_solution":
             visible_texts.append(self.no_solution_text) 
@@ -265,6 +303,9 @@ class GameScreen(Screen):
             if self.ui_state == "start":
                 if self.start_btn.hit(event.pos):
                     self.ui_state = "algorithm_select"
+                    self.hint_text.set_text("")
+                elif self.hint_btn.hit(event.pos):
+                    self.show_hint()
             elif self.ui_state == "algorithm_select":
                 if self.solve_bfs.hit(event.pos):
                     self.algorithm_start_time = time.time()
@@ -336,6 +377,8 @@ class GameScreen(Screen):
                             old_positions[id(vehicle)] = (vehicle.x, vehicle.y)
                     
                     self.map.handle_mouse_down(event.pos)
+                    if self.map.selected_vehicle:
+                        self.hint_text.set_text("")
                     
                     if hasattr(self.map, 'vehicles'):
                         for vehicle in self.map.vehicles:
@@ -1,10 +1,12 @@
 from SolverAlgorithms.Solver import SolverStrategy, BaseSolver
+from SolverAlgorithms.SolveResult import SOLVED, EXHAUSTED, UNSOLVABLE
 import heapdict
 from collections import defaultdict
 import time
 
 
 class AStarStrategy(SolverStrategy, BaseSolver):
+    reports_cost = True
 
     def __init__(self, map_obj, max_time=30):
         super().__init__(map_obj)
@@ -46,6 +48,8 @@ class AStarStrategy(SolverStrategy, BaseSolver):
     
     def build_board_2d(self, state, car_info):
         board = [['.' for _ in range(6)] for _ in range(6)]
+        for wx, wy in self.walls:
+            board[wy][wx] = 'x'
         for name, x, y in state:
             orient, length = car_info[name]
             if orient == 'h':
@@ -133,17 +137,17 @@ class AStarStrategy(SolverStrategy, BaseSolver):
         return f"A* Search (g(n)={self.max_time}s)"
 
     def solve(self):
-        start_tuple = []
-        car_info = {}
-
-        for v in self.map.vehicles:
-            a, b = v.change_vehicle_data()
-            start_tuple.append(tuple(a))  
-            car_info[a[0]] = (b[1].lower(), b[2])  
-        start_tuple = tuple(sorted(start_tuple))  
+        self.new_stats()
+        start_tuple, car_info = self.read_puzzle()
+        reused = self.reuse_search(start_tuple, car_info)
+        if reused is not None:
+            return reused
+        if self.is_unsolvable(start_tuple, car_info):
+            return self.stats.result([], 0, UNSOLVABLE)
         start_state = self.encode_state(start_tuple)
         start_g = 0
         start_h = self.heuristic(start_tuple, car_info)
+        self.stats.heuristic_evals += 1
         start_f = start_g + start_h
 
         return self.solving_A_star(start_state, start_tuple, car_info, start_g, start_f, max_time=self.max_time)
@@ -202,34 +206,65 @@ class AStarStrategy(SolverStrategy, BaseSolver):
         open_heap = heapdict.heapdict()
         table = {}
 
-        open_heap[start_state] = start_f
-        table[start_state] = self.encode_table_entry(b'', None, start_g, start_f)
-        count = 0
+        checkpoint = self.load_search()
+        if checkpoint is not None:
+            open_heap = heapdict.heapdict(checkpoint.frontier)
+            table = checkpoint.table
+            count = checkpoint.count
+        else:
+            open_heap[start_state] = start_f
+            table[start_state] = self.encode_table_entry(b'', None, start_g, start_f)
+            count = 0
+        stats = self.stats
+        phases = stats.phase_times
+        clock = time.perf_counter
         while open_heap:
             count += 1
-            if time.time() - start_time_clock > max_time:
-                print("Timed out")
-                return []
+            if time.time() - start_time_clock > max_time or self.checkpoint_requested:
+                return self.stop_search(list(open_heap.items()), table, count - 1)
+            t0 = clock()
             parent_state, parent_f = open_heap.popitem()
+            t1 = clock()
             parent_tuple = self.decode_state(parent_state)
             _, parent_move, parent_g, _ = self.decode_table_entry(table[parent_state])
+            t2 = clock()
+            phases['queue'] += t1 - t0
+            phases['hashing'] += t2 - t1
 
             if self.is_solved(parent_tuple, car_info):
                 _, _, gn, _  = self.decode_table_entry(table[parent_state])
-                return self.reconstruct_path(parent_state, table), count, gn
-            
-            for child_tuple, move, step_cost in self.generate_successors(parent_tuple, car_info):
+                self.remember_search()
+                self.discard_checkpoint()
+                return stats.result(self.reconstruct_path(parent_state, table), gn, SOLVED, count, table)
+
+            successors = self.generate_successors(parent_tuple, car_info)
+            t3 = clock()
+            phases['successors'] += t3 - t2
+            queue_time = heuristic_time = 0.0
+            for child_tuple, move, step_cost in successors:
                 if parent_move and move[0] == parent_move[0]:
                     continue
+                stats.nodes_generated += 1
                 child_state = self.encode_state(child_tuple)
                 child_g = parent_g + step_cost
                 if child_state in table:
                     _, _, old_g, _ = self.decode_table_entry(table[child_state])
                     if child_g >= old_g:
+                        stats.duplicates_pruned += 1
                         continue
 
+                t = clock()
                 child_h = self.heuristic(child_tuple, car_info)
+                t4 = clock()
+                stats.heuristic_evals += 1
                 child_f = child_g + child_h
                 open_heap[child_state] = child_f
+                queue_time += clock() - t4
+                heuristic_time += t4 - t
                 table[child_state] = self.encode_table_entry(parent_state, move, child_g, child_f)
-        return [], 0, 0
\ No newline at end of file
+            phases['queue'] += queue_time
+            phases['heuristic'] += heuristic_time
+            phases['hashing'] += clock() - t3 - queue_time - heuristic_time
+            if len(open_heap) > stats.max_frontier:
+                stats.max_frontier = len(open_heap)
+        return stats.result([], 0, EXHAUSTED, count, table)
\ No newline at end of file
@@ -1,4 +1,5 @@
 ﻿from SolverAlgorithms.Solver import SolverStrategy, BaseSolver
+from SolverAlgorithms.SolveResult import SOLVED, EXHAUSTED, UNSOLVABLE
 from collections import deque
 import time
 
@@ -38,6 +39,8 @@ class BFSStrategy(SolverStrategy, BaseSolver):
     
     def build_board_2d(self, state, car_info):
         board = [['.' for _ in range(6)] for _ in range(6)]
+        for wx, wy in self.walls:
+            board[wy][wx] = 'x'
         for name, x, y in state:
             orient, length = car_info[name]
             if orient == 'h':
@@ -124,14 +127,13 @@ class BFSStrategy(SolverStrategy, BaseSolver):
         return f"BFS Search {self.max_time})"
 
     def solve(self):
-        start_tuple = []
-        car_info = {}
-
-        for v in self.map.vehicles:
-            a, b = v.change_vehicle_data()
-            start_tuple.append(tuple(a))  
-            car_info[a[0]] = (b[1].lower(), b[2])  
-        start_tuple = tuple(sorted(start_tuple))  
+        self.new_stats()
+        start_tuple, car_info = self.read_puzzle()
+        reused = self.reuse_search(start_tuple, car_info)
+        if reused is not None:
+            return reused
+        if self.is_unsolvable(start_tuple, car_info):
+            return self.stats.result([], 0, UNSOLVABLE)
         start_state = self.encode_state(start_tuple)
 
         return self.solving_BFS(start_state, start_tuple, car_info, max_time=self.max_time)
@@ -141,28 +143,55 @@ class BFSStrategy(SolverStrategy, BaseSolver):
         bfsqueue = deque()
         table = {}
 
-        bfsqueue.append(start_state)
-        table[start_state] = self.encode_table_entry(b'', None)
-        count = 0
+        checkpoint = self.load_search()
+        if checkpoint is not None:
+            bfsqueue = deque(checkpoint.frontier)
+            table = checkpoint.table
+            count = checkpoint.count
+        else:
+            bfsqueue.append(start_state)
+            table[start_state] = self.encode_table_entry(b'', None)
+            count = 0
+        stats = self.stats
+        phases = stats.phase_times
+        clock = time.perf_counter
         while bfsqueue:
             count += 1
-            if time.time() - start_time_clock > max_time:
-                print("Timed out")
-                return []
+            if time.time() - start_time_clock > max_time or self.checkpoint_requested:
+                return self.stop_search(list(bfsqueue), table, count - 1)
+            t0 = clock()
             parent_state = bfsqueue.popleft()
+            t1 = clock()
             parent_tuple = self.decode_state(parent_state)
             _, parent_move = self.decode_table_entry(table[parent_state])
+            t2 = clock()
+            phases['queue'] += t1 - t0
+            phases['hashing'] += t2 - t1
 
             if self.is_solved(parent_tuple, car_info):
-                return self.reconstruct_path(parent_state, table), count, 0
-            
-            for child_tuple, move in self.generate_successors(parent_tuple, car_info):
+                self.remember_search()
+                self.discard_checkpoint()
+                return stats.result(self.reconstruct_path(parent_state, table), 0, SOLVED, count, table)
+
+            successors = self.generate_successors(parent_tuple, car_info)
+            t3 = clock()
+            phases['successors'] += t3 - t2
+            queue_time = 0.0
+            for child_tuple, move in successors:
                 if parent_move and move[0] == parent_move[0]:
                     continue
+                stats.nodes_generated += 1
                 child_state = self.encode_state(child_tuple)
 
                 if child_state in table:
+                    stats.duplicates_pruned += 1
                     continue
+                t = clock()
                 bfsqueue.append(child_state)
+                queue_time += clock() - t
                 table[child_state] = self.encode_table_entry(parent_state, move)
-        return [], 0, 0
\ No newline at end of file
+            phases['queue'] += queue_time
+            phases['hashing'] += clock() - t3 - queue_time
+            if len(bfsqueue) > stats.max_frontier:
+                stats.max_frontier = len(bfsqueue)
+        return stats.result([], 0, EXHAUSTED, count, table)
\ No newline at end of file
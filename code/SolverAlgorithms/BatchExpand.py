@@ -0,0 +1,98 @@
+from SolverAlgorithms.BitBoard import BitBoard
+import numpy as np
+
+
+class BatchExpander:
+    """Vectorized successor generation for arrays of packed BitBoard states.
+
+    States are uint64, so the packed layout must fit 64 bits and the board
+    64 cells. Occupancy comes from one lookup per vehicle lane; a slide from
+    position p to q is legal when the cells it sweeps over (a per-vehicle
+    (p, q) lookup table) are all free. Each vehicle/distance pair is one
+    NumPy pass over the whole batch.
+    """
+
+    def __init__(self, board: BitBoard):
+        if len(board.names) * board.bits > 64 or board.size * board.size > 64:
+            raise ValueError("Board too large for 64-bit packed states")
+        self.board = board
+        self.size = board.size
+        self.count = len(board.names)
+        self.shifts = [np.uint64(i * board.bits) for i in range(self.count)]
+        self.pos_mask = np.uint64(board.pos_mask)
+        self.walls = np.uint64(board.walls)
+
+        self.cell_masks = []
+        self.sweeps = []
+        for i in range(self.count):
+            length = board.lengths[i]
+            lane = board.lane_cells[i]
+            positions = self.size - length + 1
+            self.cell_masks.append(np.array(board.masks[i], dtype=np.uint64))
+            sweep = np.zeros((positions, positions), dtype=np.uint64)
+            for p in range(positions):
+                for q in range(positions):
+                    cells = range(p + length, q + length) if q > p else range(q, p)
+                    m = 0
+                    for c in cells:
+                        m |= lane[c]
+                    sweep[p, q] = m
+            self.sweeps.append(sweep)
+
+        target = board.target
+        self.target_shift = None if target is None else self.shifts[target]
+        self.goal_position = None if target is None else self.size - board.lengths[target]
+
+    def positions(self, states):
+        """(N, vehicles) lane positions of every state."""
+        return np.stack([(states >> shift) & self.pos_mask for shift in self.shifts], axis=1).astype(np.intp)
+
+    def occupancy(self, positions):
+        occ = np.full(len(positions), self.walls, dtype=np.uint64)
+        for i in range(self.count):
+            occ |= self.cell_masks[i][positions[:, i]]
+        return occ
+
+    def is_goal(self, states):
+        if self.target_shift is None:
+            return np.zeros(len(states), dtype=bool)
+        return ((states >> self.target_shift) & self.pos_mask) == self.goal_position
+
+    def expand(self, states):
+        """All single-slide successors of states.
+
+        Returns (children, parent index into states, vehicle index, delta),
+        four aligned arrays.
+        """
+        states = np.asarray(states, dtype=np.uint64)
+        positions = self.positions(states)
+        occ = self.occupancy(positions)
+
+        children, parents, vehicles, deltas = [], [], [], []
+        for i in range(self.count):
+            p = positions[:, i]
+            sweep = self.sweeps[i]
+            limit = sweep.shape[0] - 1
+            for delta in range(-limit, limit + 1):
+                if delta == 0:
+                    continue
+                q = p + delta
+                legal = (q >= 0) & (q <= limit)
+                if not legal.any():
+                    continue
+                index = np.flatnonzero(legal)
+                free = (occ[index] & sweep[p[index], q[index]]) == 0
+                index = index[free]
+                if not len(index):
+                    continue
+                step = np.uint64(abs(delta)) << self.shifts[i]
+                children.append(states[index] + step if delta > 0 else states[index] - step)
+                parents.append(index)
+                vehicles.append(np.full(len(index), i, dtype=np.int8))
+                deltas.append(np.full(len(index), delta, dtype=np.int8))
+
+        if not children:
+            empty = np.zeros(0, dtype=np.int8)
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.intp), empty, empty
+        return (np.concatenate(children), np.concatenate(parents),
+                np.concatenate(vehicles), np.concatenate(deltas))
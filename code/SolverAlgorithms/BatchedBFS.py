@@ -0,0 +1,180 @@
+from SolverAlgorithms.StateSpace import StateSpace
+from collections import namedtuple
+from constants import *
+import numpy as np
+import time
+
+
+BatchedResult = namedtuple('BatchedResult', ['path', 'slides', 'nodes'])
+
+
+class BatchedBFS:
+    """One vectorized BFS over many puzzles of the same board size.
+
+    Every frontier row is (puzzle id, packed state), stored as one uint64 key
+    with the id in the bits above the state, so dedup for all puzzles is a
+    single np.unique and searchsorted. Lookup tables are padded to the
+    largest vehicle count and indexed by puzzle id; padding vehicles never
+    move. A puzzle drops out of the frontier as soon as it reaches a goal.
+    """
+
+    def __init__(self, puzzles, size=MAP_N):
+        self.size = size
+        spaces = []
+        for puzzle in puzzles:
+            if puzzle.size != size:
+                raise ValueError(f"Every puzzle must be {size}x{size}")
+            spaces.append(StateSpace.from_puzzle(puzzle))
+        if not spaces:
+            raise ValueError("No puzzles to solve")
+
+        self.boards = [space.board for space, _ in spaces]
+        self.starts = np.array([start for _, start in spaces], dtype=np.uint64)
+        self.bits = self.boards[0].bits
+        self.vehicles = max(len(board.names) for board in self.boards)
+        self.state_bits = self.vehicles * self.bits
+        if self.state_bits > 63 or size * size > 64:
+            raise ValueError("Board too large for 64-bit packed states")
+        self.id_bits = max(1, (len(self.boards) - 1).bit_length())
+        if self.state_bits + self.id_bits > 64:
+            raise ValueError(f"At most {1 << (64 - self.state_bits)} puzzles fit in one batch")
+        self.timed_out = False
+        self.build_tables()
+
+    @staticmethod
+    def max_batch(puzzles):
+        """Largest batch of these puzzles whose ids and states share one uint64 key."""
+        vehicles = max(len(puzzle.vehicles) for puzzle in puzzles)
+        bits = max(1, (puzzles[0].size - 1).bit_length())
+        return 1 << max(0, 64 - vehicles * bits)
+
+    def build_tables(self):
+        count, v, size = len(self.boards), self.vehicles, self.size
+        self.cell_masks = np.zeros((count, v, size), dtype=np.uint64)
+        self.sweeps = np.zeros((count, v, size, size), dtype=np.uint64)
+        self.limits = np.full((count, v), -1, dtype=np.intp)
+        self.walls = np.zeros(count, dtype=np.uint64)
+        self.target_shifts = np.zeros(count, dtype=np.uint64)
+        self.goal_positions = np.zeros(count, dtype=np.uint64)
+        self.has_target = np.zeros(count, dtype=bool)
+
+        for p, board in enumerate(self.boards):
+            self.walls[p] = board.walls
+            if board.target is not None:
+                self.has_target[p] = True
+                self.target_shifts[p] = board.target * self.bits
+                self.goal_positions[p] = size - board.lengths[board.target]
+            for i in range(len(board.names)):
+                length = board.lengths[i]
+                lane = board.lane_cells[i]
+                positions = size - length + 1
+                self.limits[p, i] = positions - 1
+                self.cell_masks[p, i, :positions] = board.masks[i]
+                for a in range(positions):
+                    for b in range(positions):
+                        cells = range(a + length, b + length) if b > a else range(b, a)
+                        m = 0
+                        for c in cells:
+                            m |= lane[c]
+                        self.sweeps[p, i, a, b] = m
+
+        self.shifts = [np.uint64(i * self.bits) for i in range(v)]
+        self.pos_mask = np.uint64((1 << self.bits) - 1)
+        self.state_mask = np.uint64((1 << self.state_bits) - 1)
+        self.id_shift = np.uint64(self.state_bits)
+
+    def expand(self, pids, states):
+        positions = np.stack([(states >> shift) & self.pos_mask for shift in self.shifts],
+                             axis=1).astype(np.intp)
+        occ = self.walls[pids].copy()
+        for i in range(self.vehicles):
+            occ |= self.cell_masks[pids, i, positions[:, i]]
+
+        rows, children, vehicles, deltas = [], [], [], []
+        for i in range(self.vehicles):
+            p = positions[:, i]
+            limit = self.limits[pids, i]
+            for delta in range(-(self.size - 1), self.size):
+                if delta == 0:
+                    continue
+                q = p + delta
+                index = np.flatnonzero((q >= 0) & (q <= limit))
+                if not len(index):
+                    continue
+                free = (occ[index] & self.sweeps[pids[index], i, p[index], q[index]]) == 0
+                index = index[free]
+                if not len(index):
+                    continue
+                step = np.uint64(abs(delta)) << self.shifts[i]
+                children.append(states[index] + step if delta > 0 else states[index] - step)
+                rows.append(index)
+                vehicles.append(np.full(len(index), i, dtype=np.int8))
+                deltas.append(np.full(len(index), delta, dtype=np.int8))
+
+        if not rows:
+            return (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.uint64),
+                    np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int8))
+        return np.concatenate(rows), np.concatenate(children), np.concatenate(vehicles), np.concatenate(deltas)
+
+    def solve(self, max_time=None):
+        """BatchedResult per puzzle, in input order; path is None if not solved."""
+        start_clock = time.time()
+        count = len(self.boards)
+        pids = np.arange(count, dtype=np.uint64)
+        frontier = (pids << self.id_shift) | self.starts
+        visited = np.sort(frontier)
+        layers = [(frontier, None, None, None)]
+        goals = {}
+        nodes = np.zeros(count, dtype=np.int64)
+
+        while len(frontier):
+            frontier_pids = (frontier >> self.id_shift).astype(np.intp)
+            states = frontier & self.state_mask
+            at_goal = self.has_target[frontier_pids] & (
+                ((states >> self.target_shifts[frontier_pids]) & self.pos_mask) == self.goal_positions[frontier_pids])
+            for row in np.flatnonzero(at_goal):
+                goals.setdefault(int(frontier_pids[row]), (len(layers) - 1, int(row)))
+
+            # Solved puzzles leave the search.
+            active = ~np.isin(frontier_pids, np.fromiter(goals, dtype=np.intp, count=len(goals)))
+            if not active.any():
+                break
+            if max_time is not None and time.time() - start_clock > max_time:
+                self.timed_out = True
+                break
+            rows = np.flatnonzero(active)
+            nodes += np.bincount(frontier_pids[rows], minlength=count)
+
+            parents, children, vehicles, deltas = self.expand(frontier_pids[rows], states[rows])
+            keys = (frontier_pids[rows][parents].astype(np.uint64) << self.id_shift) | children
+            unique, first = np.unique(keys, return_index=True)
+            pos = np.minimum(np.searchsorted(visited, unique), len(visited) - 1)
+            fresh = visited[pos] != unique
+            frontier = unique[fresh]
+            source = first[fresh]
+            if len(frontier):
+                layers.append((frontier, rows[parents[source]], vehicles[source], deltas[source]))
+                visited = np.sort(np.concatenate((visited, frontier)), kind='stable')
+
+        results = []
+        for p, board in enumerate(self.boards):
+            if p not in goals:
+                results.append(BatchedResult(None, -1, int(nodes[p])))
+                continue
+            moves = self.moves_to(layers, *goals[p])
+            path = []
+            for i, delta in moves:
+                step = 1 if delta > 0 else -1
+                path.extend([board.move_tuple(i, step)] * abs(delta))
+            results.append(BatchedResult(path, len(moves), int(nodes[p])))
+        return results
+
+    def moves_to(self, layers, depth, index):
+        moves = []
+        while depth > 0:
+            _, parents, vehicles, deltas = layers[depth]
+            moves.append((int(vehicles[index]), int(deltas[index])))
+            index = parents[index]
+            depth -= 1
+        moves.reverse()
+        return moves
@@ -0,0 +1,135 @@
+from constants import *
+
+
+class BitBoard:
+    """Packed-integer view of a puzzle.
+
+    Every vehicle only slides along its lane, so a state is stored as one int
+    with a few bits per vehicle holding its lane position (x for horizontal,
+    y for vertical). Vehicles are indexed in name order, the same order the
+    strategies use for their sorted state tuples.
+    """
+
+    def __init__(self, car_info, size=MAP_N, fixed=None, walls=0):
+        self.size = size
+        self.names = tuple(sorted(car_info))
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.orients = tuple(car_info[name][0] for name in self.names)
+        self.lengths = tuple(car_info[name][1] for name in self.names)
+        self.walls = walls
+
+        # Lane coordinate that never changes: row for 'h', column for 'v'.
+        # It is unknown until a concrete state tuple is seen.
+        self.fixed = tuple(fixed[name] for name in self.names) if fixed else None
+
+        self.bits = max(1, (size - 1).bit_length())
+        self.pos_mask = (1 << self.bits) - 1
+        self.target = self.index.get('A')
+
+        self.lane_cells = []
+        self.masks = []
+        if self.fixed is not None:
+            self._build_masks()
+
+    @classmethod
+    def from_state(cls, state_tuple, car_info, size=MAP_N, walls=0):
+        fixed = {}
+        for name, x, y in state_tuple:
+            fixed[name] = y if car_info[name][0] == 'h' else x
+        return cls(car_info, size, fixed, walls)
+
+    def _build_masks(self):
+        size = self.size
+        for i in range(len(self.names)):
+            if self.orients[i] == 'h':
+                lane = [1 << (self.fixed[i] * size + q) for q in range(size)]
+            else:
+                lane = [1 << (q * size + self.fixed[i]) for q in range(size)]
+            length = self.lengths[i]
+            masks = []
+            for p in range(size - length + 1):
+                m = 0
+                for q in range(p, p + length):
+                    m |= lane[q]
+                masks.append(m)
+            self.lane_cells.append(lane)
+            self.masks.append(masks)
+
+    def encode(self, state_tuple):
+        state = 0
+        for name, x, y in state_tuple:
+            i = self.index[name]
+            pos = x if self.orients[i] == 'h' else y
+            state |= pos << (i * self.bits)
+        return state
+
+    def position(self, state, i):
+        return (state >> (i * self.bits)) & self.pos_mask
+
+    def decode(self, state):
+        result = []
+        for i, name in enumerate(self.names):
+            p = self.position(state, i)
+            if self.orients[i] == 'h':
+                result.append((name, p, self.fixed[i]))
+            else:
+                result.append((name, self.fixed[i], p))
+        return tuple(result)
+
+    def occupancy(self, state):
+        occ = self.walls
+        bits = self.bits
+        pos_mask = self.pos_mask
+        for i, masks in enumerate(self.masks):
+            occ |= masks[(state >> (i * bits)) & pos_mask]
+        return occ
+
+    def is_legal(self, state_tuple):
+        """True when every vehicle is on the board and no two overlap."""
+        occ = self.walls
+        for name, x, y in state_tuple:
+            i = self.index[name]
+            p = x if self.orients[i] == 'h' else y
+            if p < 0 or p > self.size - self.lengths[i]:
+                return False
+            if (y if self.orients[i] == 'h' else x) != self.fixed[i]:
+                return False
+            m = self.masks[i][p]
+            if occ & m:
+                return False
+            occ |= m
+        return True
+
+    def is_goal(self, state):
+        if self.target is None:
+            return False
+        return self.position(state, self.target) == self.size - self.lengths[self.target]
+
+    def successors(self, state):
+        """Yield (child_state, vehicle_index, delta) for every single slide."""
+        occ = self.occupancy(state)
+        size = self.size
+        bits = self.bits
+        pos_mask = self.pos_mask
+        result = []
+        for i, lane in enumerate(self.lane_cells):
+            shift = i * bits
+            p = (state >> shift) & pos_mask
+            length = self.lengths[i]
+
+            q = p - 1
+            while q >= 0 and not occ & lane[q]:
+                result.append((state - ((p - q) << shift), i, q - p))
+                q -= 1
+
+            q = p + length
+            while q < size and not occ & lane[q]:
+                delta = q - length + 1 - p
+                result.append((state + (delta << shift), i, delta))
+                q += 1
+        return result
+
+    def move_tuple(self, i, delta):
+        if self.orients[i] == 'h':
+            return (self.names[i], delta, 0)
+        return (self.names[i], 0, delta)
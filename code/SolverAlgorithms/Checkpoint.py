@@ -0,0 +1,42 @@
+from collections import namedtuple
+import os
+import pickle
+import struct
+import zlib
+
+
+# Header: magic, version; a zlib-compressed pickle of the checkpoint follows.
+HEADER = struct.Struct('<4sH')
+MAGIC = b'RHCK'
+VERSION = 1
+
+
+SearchCheckpoint = namedtuple('SearchCheckpoint', ['strategy', 'board', 'frontier', 'table', 'count'])
+
+
+def checkpoint_name(puzzle_id, strategy_name):
+    """File name for one puzzle/strategy pair; 'A*' is not filename-safe everywhere."""
+    return f"{puzzle_id}_{strategy_name.replace('*', 'star')}.rhck"
+
+
+def save_checkpoint(path, checkpoint):
+    """Write a checkpoint atomically, so an interrupted save keeps the previous one."""
+    data = zlib.compress(pickle.dumps(tuple(checkpoint), protocol=pickle.HIGHEST_PROTOCOL))
+    partial = path + '.part'
+    with open(partial, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION))
+        f.write(data)
+    os.replace(partial, path)
+
+
+def load_checkpoint(path):
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is not a solver checkpoint")
+        magic, version = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a solver checkpoint")
+        if version != VERSION:
+            raise ValueError(f"Unsupported solver checkpoint version {version}")
+        return SearchCheckpoint(*pickle.loads(zlib.decompress(f.read())))
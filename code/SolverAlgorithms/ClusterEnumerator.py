@@ -0,0 +1,157 @@
+from SolverAlgorithms.BitBoard import BitBoard
+from SolverAlgorithms.ClusterFile import ClusterRecord, NO_SOLUTION, record_order
+from SolverAlgorithms.StateSpace import StateSpace
+from constants import *
+from itertools import combinations_with_replacement
+
+
+VEHICLE_NAMES = 'BCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+class ClusterEnumerator:
+    """Enumerates every legal placement of a piece set and splits it into components.
+
+    The piece set is the target car plus `cars` other length-2 vehicles and
+    `trucks` length-3 vehicles. A vehicle never leaves its lane (row for 'h',
+    column for 'v'), so placements are grouped by lane assignment first: each
+    assignment is an independent slice of the space and the unit of sharding.
+    Identical vehicles sharing a lane keep their order under every move, so
+    they are placed in increasing order and each configuration is seen once.
+    """
+
+    def __init__(self, cars, trucks, size=MAP_N, exact_diameter_limit=256):
+        if cars + trucks > len(VEHICLE_NAMES):
+            raise ValueError(f"At most {len(VEHICLE_NAMES)} vehicles besides the target")
+        self.cars = cars
+        self.trucks = trucks
+        self.size = size
+        self.exit_row = (size - 1) // 2
+        self.exact_diameter_limit = exact_diameter_limit
+        self.lanes = [('h', row) for row in range(size)] + [('v', col) for col in range(size)]
+
+    def lane_assignments(self):
+        """Yield (car lanes, truck lanes) in a fixed order, skipping overfull lanes."""
+        for car_lanes in combinations_with_replacement(self.lanes, self.cars):
+            for truck_lanes in combinations_with_replacement(self.lanes, self.trucks):
+                load = {('h', self.exit_row): 2}
+                for lanes, length in ((car_lanes, 2), (truck_lanes, 3)):
+                    for lane in lanes:
+                        load[lane] = load.get(lane, 0) + length
+                if max(load.values()) <= self.size:
+                    yield car_lanes, truck_lanes
+
+    def tasks(self, chunk):
+        """Yield (task id, assignments) chunks; ids are stable across runs."""
+        batch = []
+        task_id = 0
+        for assignment in self.lane_assignments():
+            batch.append(assignment)
+            if len(batch) == chunk:
+                yield task_id, batch
+                batch = []
+                task_id += 1
+        if batch:
+            yield task_id, batch
+
+    def board_for(self, car_lanes, truck_lanes):
+        """BitBoard for one assignment, plus which vehicles repeat the one before."""
+        car_info = {'A': ('h', 2)}
+        fixed = {'A': self.exit_row}
+        same_as_previous = [False]
+        previous = None
+        pieces = [(lane, 2) for lane in car_lanes] + [(lane, 3) for lane in truck_lanes]
+        for name, (lane, length) in zip(VEHICLE_NAMES, pieces):
+            orient, coordinate = lane
+            car_info[name] = (orient, length)
+            fixed[name] = coordinate
+            same_as_previous.append((lane, length) == previous)
+            previous = (lane, length)
+        return BitBoard(car_info, self.size, fixed), same_as_previous
+
+    def placements(self, board, same_as_previous):
+        """Every legal packed state of one assignment."""
+        n = len(board.names)
+        result = []
+
+        def place(i, occ, state, previous_pos):
+            if i == n:
+                result.append(state)
+                return
+            shift = i * board.bits
+            first = previous_pos + 1 if same_as_previous[i] else 0
+            for p in range(first, len(board.masks[i])):
+                m = board.masks[i][p]
+                if not occ & m:
+                    place(i + 1, occ | m, state | (p << shift), p)
+
+        place(0, board.walls, 0, -1)
+        return result
+
+    def board_string(self, board, state):
+        cells = ['o'] * (self.size * self.size)
+        for i, name in enumerate(board.names):
+            m = board.masks[i][board.position(state, i)]
+            while m:
+                low = m & -m
+                cells[low.bit_length() - 1] = name
+                m ^= low
+        return ''.join(cells)
+
+    def diameter(self, space, states):
+        """Exact diameter for small components, a double-sweep lower bound otherwise."""
+        if len(states) > self.exact_diameter_limit:
+            start = next(iter(states))
+            depth = space.component(start)
+            far = max(depth, key=depth.get)
+            return max(space.component(far).values()), False
+
+        # All-pairs BFS over index lists; successors are generated once per state.
+        order = list(states)
+        index = {state: i for i, state in enumerate(order)}
+        successors = space.board.successors
+        adjacency = [[index[child] for child, _, _ in successors(state)] for state in order]
+        best = 0
+        for source in range(len(order)):
+            seen = [False] * len(order)
+            seen[source] = True
+            frontier = [source]
+            depth = -1
+            while frontier:
+                depth += 1
+                following = []
+                for u in frontier:
+                    for v in adjacency[u]:
+                        if not seen[v]:
+                            seen[v] = True
+                            following.append(v)
+                frontier = following
+            best = max(best, depth)
+        return best, True
+
+    def clusters(self, car_lanes, truck_lanes):
+        """ClusterRecord for every component of one lane assignment."""
+        board, same_as_previous = self.board_for(car_lanes, truck_lanes)
+        space = StateSpace(board)
+        unvisited = set(self.placements(board, same_as_previous))
+        records = []
+        while unvisited:
+            states = space.component(unvisited.pop())
+            unvisited.difference_update(states)
+            dist = space.goal_distances(states)
+            if dist:
+                hardest = max(dist, key=dist.get)
+                hardest_length = dist[hardest]
+            else:
+                hardest, hardest_length = next(iter(states)), NO_SOLUTION
+            diameter, exact = self.diameter(space, states)
+            records.append(ClusterRecord(self.board_string(board, hardest), len(states),
+                                         diameter, hardest_length, exact))
+        return records
+
+    def run_task(self, assignments):
+        """Records of every component of a chunk of assignments, in record_order."""
+        records = []
+        for car_lanes, truck_lanes in assignments:
+            records.extend(self.clusters(car_lanes, truck_lanes))
+        records.sort(key=record_order)
+        return records
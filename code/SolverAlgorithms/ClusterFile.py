@@ -0,0 +1,140 @@
+from collections import namedtuple
+from Game.Puzzle import Puzzle
+from constants import *
+import mmap
+import struct
+
+
+# Header: magic, version, board side, record size, record count, index offset, reserved.
+HEADER = struct.Struct('<4sHHIQQ4x')
+MAGIC = b'RHCL'
+VERSION = 1
+
+# Index entry: hardest length, first record, record count.
+INDEX_ENTRY = struct.Struct('<hQQ')
+
+NO_SOLUTION = -1
+
+
+ClusterRecord = namedtuple('ClusterRecord', ['board', 'size', 'diameter', 'hardest_length', 'exact_diameter'])
+
+
+def record_struct(size=MAP_N):
+    """Fixed-size record: hardest board, component size, diameter, hardest length, exact flag."""
+    return struct.Struct(f'<{size * size}sIHhB')
+
+
+def record_order(record):
+    """Sort key used by every cluster file: hardest first, then larger components."""
+    return (-record.hardest_length, -record.size, record.board)
+
+
+class ClusterFileWriter:
+    """Streams records already in record_order and appends a per-length index."""
+
+    def __init__(self, path, size=MAP_N):
+        self.size = size
+        self.record = record_struct(size)
+        self.count = 0
+        self.index = []
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, size, self.record.size, 0, 0))
+
+    def write(self, record):
+        if self.index and record.hardest_length > self.index[-1][0]:
+            raise ValueError("Cluster records must be written hardest first")
+        if not self.index or record.hardest_length != self.index[-1][0]:
+            self.index.append([record.hardest_length, self.count, 0])
+        self.index[-1][2] += 1
+        self.file.write(self.record.pack(record.board.encode('ascii'), record.size,
+                                         min(record.diameter, 0xFFFF), record.hardest_length,
+                                         int(record.exact_diameter)))
+        self.count += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        for entry in self.index:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.size, self.record.size, self.count, index_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ClusterFile:
+    """Read-only, memory-mapped cluster file, indexed by hardest length."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{path} is empty, not a cluster file")
+
+        magic, version, self.size, record_size, self.count, index_offset = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a cluster file")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported cluster file version {version}")
+
+        self.record = record_struct(self.size)
+        if record_size != self.record.size or HEADER.size + self.count * record_size != index_offset \
+                or (len(self.mm) - index_offset) % INDEX_ENTRY.size:
+            self.close()
+            raise ValueError(f"{path} is truncated or has a bad record size")
+
+        self.index = {}
+        for offset in range(index_offset, len(self.mm), INDEX_ENTRY.size):
+            length, first, count = INDEX_ENTRY.unpack_from(self.mm, offset)
+            self.index[length] = (first, count)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("cluster index out of range")
+        board, size, diameter, hardest_length, exact = self.record.unpack_from(
+            self.mm, HEADER.size + index * self.record.size)
+        return ClusterRecord(board.decode('ascii'), size, diameter, hardest_length, bool(exact))
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def histogram(self):
+        """Number of components per hardest length."""
+        return {length: count for length, (_, count) in sorted(self.index.items())}
+
+    def with_length(self, hardest_length):
+        """Yield the components whose hardest start needs exactly hardest_length slides."""
+        first, count = self.index.get(hardest_length, (0, 0))
+        for i in range(first, first + count):
+            yield self[i]
+
+    def puzzle(self, index):
+        return Puzzle.from_board_string(self[index].board, self.size)
+
+    def close(self):
+        if getattr(self, 'mm', None) is not None and not self.mm.closed:
+            self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
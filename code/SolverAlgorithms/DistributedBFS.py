@@ -0,0 +1,247 @@
+from Game.Puzzle import Puzzle
+from SolverAlgorithms.StateSpace import StateSpace
+from collections import namedtuple
+import json
+import socket
+import struct
+
+
+# Frame: message type, JSON metadata length, binary payload length.
+FRAME = struct.Struct('<BII')
+
+INIT, LAYER, BATCH, DONE, PARENT, STOP = range(6)
+
+DistributedResult = namedtuple('DistributedResult', ['path', 'slides', 'layer_counts', 'states'])
+
+
+def owner_of(state, workers):
+    """Worker that owns a packed state (Fibonacci hashing of the mixed bits)."""
+    mixed = ((state ^ (state >> 29)) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    return (mixed >> 32) % workers
+
+
+def pack_states(states, width):
+    return b''.join(state.to_bytes(width, 'little') for state in states)
+
+
+def unpack_states(data, width):
+    return [int.from_bytes(data[i:i + width], 'little') for i in range(0, len(data), width)]
+
+
+class Channel:
+    """Length-prefixed messages over a TCP socket: a JSON header plus packed states."""
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    def send(self, kind, meta=None, payload=b''):
+        header = json.dumps(meta or {}).encode('utf-8')
+        self.sock.sendall(FRAME.pack(kind, len(header), len(payload)) + header + payload)
+
+    def recv(self):
+        kind, meta_length, payload_length = FRAME.unpack(self.read(FRAME.size))
+        meta = json.loads(self.read(meta_length).decode('utf-8'))
+        return kind, meta, self.read(payload_length)
+
+    def read(self, n):
+        chunks = []
+        while n:
+            chunk = self.sock.recv(min(n, 1 << 20))
+            if not chunk:
+                raise ConnectionError("peer closed the connection")
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b''.join(chunks)
+
+    def close(self):
+        self.sock.close()
+
+
+def state_width(board):
+    return max(1, (len(board.names) * board.bits + 7) // 8)
+
+
+class DistributedBFSWorker:
+    """Owns one hash partition of the visited set and expands its share of each layer.
+
+    Every received candidate arrives as a (child, parent) pair; the first pair
+    seen for a child fixes its parent, which is all path reconstruction needs.
+    """
+
+    def __init__(self, host, port):
+        sock = socket.create_connection((host, port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.channel = Channel(sock)
+        self.parents = {}
+
+    def run(self):
+        try:
+            kind, meta, _ = self.channel.recv()
+            if kind != INIT:
+                raise ConnectionError("expected INIT from the coordinator")
+            self.setup(meta)
+            while True:
+                kind, meta, payload = self.channel.recv()
+                if kind == LAYER:
+                    self.layer(meta, payload)
+                elif kind == PARENT:
+                    self.parent(payload)
+                elif kind == STOP:
+                    break
+        finally:
+            self.channel.close()
+
+    def setup(self, meta):
+        puzzle = Puzzle.from_board_string(meta['board'], meta['size'])
+        space, _ = StateSpace.from_puzzle(puzzle)
+        self.board = space.board
+        self.index = meta['index']
+        self.workers = meta['workers']
+        self.width = state_width(self.board)
+
+    def layer(self, meta, payload):
+        pairs = unpack_states(payload, self.width)
+        new = []
+        for i in range(0, len(pairs), 2):
+            child, parent = pairs[i], pairs[i + 1]
+            if child not in self.parents:
+                self.parents[child] = parent
+                new.append(child)
+
+        goals = [state for state in new if self.board.is_goal(state)]
+        outgoing = [[] for _ in range(self.workers)]
+        if not (goals and meta['stop_at_goal']):
+            successors = self.board.successors
+            for state in new:
+                for child, _, _ in successors(state):
+                    owner = owner_of(child, self.workers)
+                    # Drop children this worker already knows; others dedupe on arrival.
+                    if owner == self.index and child in self.parents:
+                        continue
+                    outgoing[owner].append(child)
+                    outgoing[owner].append(state)
+
+        for owner, batch in enumerate(outgoing):
+            if batch:
+                self.channel.send(BATCH, {'owner': owner}, pack_states(batch, self.width))
+        self.channel.send(DONE, {'new': len(new)}, pack_states(goals, self.width))
+
+    def parent(self, payload):
+        state = unpack_states(payload, self.width)[0]
+        self.channel.send(PARENT, {}, pack_states([self.parents[state]], self.width))
+
+
+class DistributedBFSCoordinator:
+    """Drives a layer-synchronous BFS over workers connected by TCP.
+
+    Each layer the coordinator hands every worker the candidates it owns,
+    collects the packed children they generate, and routes them to their
+    owners for the next layer. It keeps only layer counts; the path is
+    rebuilt at the end by asking owners for parents, one state at a time.
+    """
+
+    def __init__(self, workers, host='127.0.0.1', port=0):
+        self.workers = workers
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen(workers)
+        self.address = self.server.getsockname()
+        self.channels = []
+
+    def accept_workers(self, timeout=60):
+        self.server.settimeout(timeout)
+        while len(self.channels) < self.workers:
+            sock, _ = self.server.accept()
+            sock.settimeout(None)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.channels.append(Channel(sock))
+
+    def run(self, puzzle, stop_at_goal=True, verbose=False):
+        """DistributedResult for puzzle; path is empty when no goal was reached."""
+        space, start = StateSpace.from_puzzle(puzzle)
+        board = space.board
+        width = state_width(board)
+
+        self.accept_workers()
+        for index, channel in enumerate(self.channels):
+            channel.send(INIT, {'board': puzzle.to_board_string(), 'size': puzzle.size,
+                                'index': index, 'workers': self.workers})
+
+        # The root is its own parent.
+        inboxes = [bytearray() for _ in range(self.workers)]
+        inboxes[owner_of(start, self.workers)] += pack_states([start, start], width)
+        layer_counts = []
+        goal = None
+        while True:
+            for channel, inbox in zip(self.channels, inboxes):
+                channel.send(LAYER, {'stop_at_goal': stop_at_goal}, bytes(inbox))
+
+            inboxes = [bytearray() for _ in range(self.workers)]
+            new = 0
+            goals = []
+            for channel in self.channels:
+                while True:
+                    kind, meta, payload = channel.recv()
+                    if kind == BATCH:
+                        inboxes[meta['owner']] += payload
+                    elif kind == DONE:
+                        new += meta['new']
+                        goals.extend(unpack_states(payload, width))
+                        break
+
+            if not new:
+                break
+            layer_counts.append(new)
+            if verbose:
+                print(f"layer {len(layer_counts) - 1}: {new} states")
+            if goals and stop_at_goal:
+                goal = min(goals)
+                break
+            if goals and goal is None:
+                goal = min(goals)
+
+        chain = self.chain_to_root(goal, start, width) if goal is not None else []
+        return DistributedResult(self.chain_to_path(board, chain), max(len(chain) - 1, 0),
+                                 layer_counts, sum(layer_counts))
+
+    def chain_to_root(self, state, start, width):
+        chain = [state]
+        while state != start:
+            channel = self.channels[owner_of(state, self.workers)]
+            channel.send(PARENT, {}, pack_states([state], width))
+            _, _, payload = channel.recv()
+            state = unpack_states(payload, width)[0]
+            chain.append(state)
+        chain.reverse()
+        return chain
+
+    def chain_to_path(self, board, chain):
+        """Unit-step (name, dx, dy) moves along a chain of packed states."""
+        path = []
+        for before, after in zip(chain, chain[1:]):
+            for i in range(len(board.names)):
+                delta = board.position(after, i) - board.position(before, i)
+                if delta:
+                    step = 1 if delta > 0 else -1
+                    path.extend([board.move_tuple(i, step)] * abs(delta))
+        return path
+
+    def close(self):
+        for channel in self.channels:
+            try:
+                channel.send(STOP)
+            except OSError:
+                pass
+            channel.close()
+        self.server.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_worker(host, port):
+    DistributedBFSWorker(host, port).run()
@@ -0,0 +1,70 @@
+from SolverAlgorithms.StateSpace import StateSpace
+import threading
+
+
+class HintTable:
+    """Optimal next slide for every board reachable from a level's start.
+
+    The whole component is solved once on a background thread when the level
+    loads; afterwards a hint is a single dictionary lookup, wherever the
+    player has dragged the vehicles to.
+    """
+
+    def __init__(self, puzzle, state_limit=1000000):
+        self.puzzle = puzzle
+        self.state_limit = state_limit
+        self.space = None
+        self.moves = None
+        self.cost_moves = None
+        self.too_large = False
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self.build, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def build(self):
+        try:
+            space, start = StateSpace.from_puzzle(self.puzzle)
+            states = space.component(start, self.state_limit)
+            if states is None:
+                self.too_large = True
+            else:
+                self.moves = space.goal_moves(states)
+                self.space = space
+        finally:
+            self.ready.set()
+
+    def is_ready(self):
+        return self.ready.is_set()
+
+    def lookup(self, puzzle):
+        """(distance, vehicle index, delta) for puzzle's board, or None if unknown."""
+        state = self.encode(puzzle.start_tuple())
+        return None if state is None else self.moves.get(state)
+
+    def encode(self, start_tuple):
+        """Packed state of a (name, x, y) tuple, or None if the table cannot hold it."""
+        if not self.is_ready() or self.moves is None:
+            return None
+        board = self.space.board
+        for name, x, y in start_tuple:
+            if not 0 <= (x if board.orients[board.index[name]] == 'h' else y) < board.size:
+                return None
+        return board.encode(start_tuple)
+
+    def moves_by_cost(self):
+        """moves in summed vehicle length instead of slides, built on first use."""
+        if self.cost_moves is None:
+            self.cost_moves = self.space.goal_cost_moves(self.moves)
+        return self.cost_moves
+
+    def next_move(self, puzzle):
+        """(name, dx, dy, distance) of an optimal slide, or None at a goal or unknown board."""
+        entry = self.lookup(puzzle)
+        if entry is None or entry[1] is None:
+            return None
+        distance, i, delta = entry
+        name, dx, dy = self.space.board.move_tuple(i, delta)
+        return name, dx, dy, distance
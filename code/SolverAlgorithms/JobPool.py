@@ -0,0 +1,178 @@
+import contextlib
+import os
+import signal
+import time
+from collections import deque
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # not on Windows; jobs then run without a memory cap
+    resource = None
+
+
+OK = 'ok'
+ERROR = 'error'      # the job raised an exception
+KILLED = 'killed'    # still running at its deadline
+OOM = 'oom'          # out of memory: MemoryError under the cap, or killed by the kernel
+CRASHED = 'crashed'  # the worker died without replying
+
+
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def worker_loop(func, conn, core, memory_limit=None):
+    """Run jobs from conn until it sends None, replying (status, value, cpu seconds) for each.
+
+    memory_limit caps the worker's address space (RLIMIT_AS) in bytes.
+    """
+    if core is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {core})
+    if memory_limit is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        while True:
+            job = conn.recv()
+            if job is None:
+                break
+            start = time.process_time()
+            try:
+                value = func(job)
+                status = OK
+            except MemoryError:
+                value, status = "MemoryError", OOM
+            except Exception as e:
+                value, status = f"{type(e).__name__}: {e}", ERROR
+            conn.send((status, value, time.process_time() - start))
+    conn.close()
+
+
+class Worker:
+    def __init__(self, func, core, memory_limit=None):
+        self.func = func
+        self.core = core
+        self.memory_limit = memory_limit
+        self.conn, child = Pipe()
+        self.process = Process(target=worker_loop, args=(func, child, core, memory_limit), daemon=True)
+        self.process.start()
+        child.close()
+        self.jobs_done = 0
+        self.job = None
+        self.started = 0.0
+        self.deadline = None
+
+    def submit(self, job, timeout):
+        self.job = job
+        self.started = time.perf_counter()
+        self.deadline = self.started + timeout if timeout is not None else None
+        self.conn.send(job)
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        with contextlib.suppress(OSError):
+            self.conn.send(None)
+        self.process.join()
+        self.conn.close()
+
+
+class PinnedPool:
+    """Worker processes pinned one per core, each job under a hard deadline.
+
+    A job still running at its deadline has its worker SIGKILLed and
+    replaced on the same core, so a runaway solve cannot hold up the sweep.
+    memory_limit (bytes) caps each worker's address space, and a worker is
+    replaced after max_jobs jobs (1: every job in a fresh process). func
+    must be a module-level function so it pickles.
+    """
+
+    def __init__(self, func, workers=None, pin=True, memory_limit=None, max_jobs=None):
+        cores = available_cores()
+        self.func = func
+        self.workers = workers or len(cores)
+        self.cores = [cores[i % len(cores)] if pin else None for i in range(self.workers)]
+        self.memory_limit = memory_limit
+        self.max_jobs = max_jobs
+
+    def run(self, jobs, timeout=None):
+        """Yield (job, status, value, wall seconds, cpu seconds) as jobs finish.
+
+        status is OK, ERROR, KILLED, OOM or CRASHED; cpu seconds is the
+        worker's own CPU time, or the wall time for a job whose worker was lost.
+        """
+        pending = deque(jobs)
+        workers = [Worker(self.func, core, self.memory_limit)
+                   for core in self.cores[:max(1, min(self.workers, len(pending)))]]
+        idle = list(workers)
+        try:
+            while pending or len(idle) < len(workers):
+                self.dispatch(pending, idle, timeout)
+
+                running = [w for w in workers if w not in idle]
+                deadlines = [w.deadline for w in running if w.deadline is not None]
+                wait_time = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+                ready = wait([w.conn for w in running], wait_time)
+
+                now = time.perf_counter()
+                for i, worker in enumerate(workers):
+                    if worker in idle:
+                        continue
+                    lost = False
+                    if worker.conn in ready:
+                        try:
+                            status, value, cpu = worker.conn.recv()
+                        except EOFError:
+                            worker.process.join()
+                            status, value = self.exit_status(worker.process.exitcode)
+                            lost = True
+                    elif worker.deadline is not None and now >= worker.deadline:
+                        status, value = KILLED, f"no result after {now - worker.started:.1f}s"
+                        lost = True
+                    else:
+                        continue
+
+                    job, seconds = worker.job, now - worker.started
+                    if lost:
+                        cpu = seconds
+                    worker.jobs_done += 1
+                    # A MemoryError can leave the worker's heap in a bad state
+                    if lost or status == OOM:
+                        worker.kill()
+                        worker = workers[i] = Worker(self.func, worker.core, self.memory_limit)
+                    elif self.max_jobs is not None and worker.jobs_done >= self.max_jobs:
+                        worker.stop()
+                        worker = workers[i] = Worker(self.func, worker.core, self.memory_limit)
+                    idle.append(worker)
+                    yield job, status, value, seconds, cpu
+        finally:
+            for worker in workers:
+                if worker in idle:
+                    worker.stop()
+                else:
+                    worker.kill()
+
+    @staticmethod
+    def exit_status(exitcode):
+        """(status, message) for a worker that died mid-job.
+
+        The pool only SIGKILLs workers past their deadline, which is reported
+        as KILLED before the worker is reaped, so a SIGKILL seen here came from
+        the kernel's out-of-memory killer.
+        """
+        if exitcode == -signal.SIGKILL:
+            return OOM, "worker killed by the system (out of memory)"
+        if exitcode is not None and exitcode < 0:
+            return CRASHED, f"worker died from signal {signal.Signals(-exitcode).name}"
+        return CRASHED, f"worker exited with code {exitcode}"
+
+    @staticmethod
+    def dispatch(pending, idle, timeout):
+        while pending and idle:
+            idle.pop().submit(pending.popleft(), timeout)
@@ -0,0 +1,173 @@
+from collections import defaultdict, namedtuple
+import hashlib
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    git_commit TEXT NOT NULL,
+    dirty INTEGER NOT NULL,
+    machine TEXT NOT NULL,
+    machine_info TEXT NOT NULL,
+    params TEXT NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    map_id INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_run ON samples(run_id);
+CREATE INDEX IF NOT EXISTS runs_key ON runs(machine, params);
+"""
+
+# Per-sample metrics a run records; all are "lower is better".
+TIME = 'time'            # seconds, from timing runs
+NODES = 'nodes'          # states expanded, from timing runs
+TRACED_MB = 'traced_mb'  # tracemalloc peak, from memory runs
+RSS_MB = 'rss_mb'        # process peak RSS, from memory runs
+METRICS = (TIME, TRACED_MB, RSS_MB, NODES)
+
+
+HistoryRun = namedtuple('HistoryRun', ['id', 'started', 'git_commit', 'dirty', 'machine', 'machine_info',
+                                       'params', 'label'])
+
+
+def git_commit(path=None):
+    """(commit sha, whether tracked files differ from it) of the checkout holding path."""
+    cwd = os.path.dirname(os.path.abspath(path or __file__))
+    try:
+        sha = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=cwd, capture_output=True, text=True,
+                             timeout=30, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+                                capture_output=True, text=True, timeout=60, check=True).stdout
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown', False
+    return sha, bool(status.strip())
+
+
+def cpu_model():
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def machine_fingerprint():
+    """(short hash, description) of the host and interpreter a run was measured on.
+
+    Timings are only comparable between runs with the same fingerprint.
+    """
+    info = {
+        'node': platform.node(),
+        'system': platform.system(),
+        'machine': platform.machine(),
+        'cpu': cpu_model(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+    }
+    digest = hashlib.sha1(json.dumps(info, sort_keys=True).encode('utf-8')).hexdigest()
+    return digest[:12], info
+
+
+class ResultsHistory:
+    """Append-only SQLite store of benchmark runs and their raw samples.
+
+    A run is keyed by git commit, machine fingerprint and the sweep
+    parameters (a canonical JSON object); each sample belongs to one
+    (map, algorithm, metric) cell of a run.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def params_key(params):
+        return json.dumps(params, sort_keys=True)
+
+    def record_run(self, params, samples, label=None, commit=None):
+        """Store one run; samples maps (map_id, algorithm, metric) to a list of values. Returns the run id."""
+        sha, dirty = commit or git_commit()
+        machine, info = machine_fingerprint()
+        with self.db:
+            run_id = self.db.execute(
+                'INSERT INTO runs (started, git_commit, dirty, machine, machine_info, params, label) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (time.time(), sha, int(dirty), machine, json.dumps(info, sort_keys=True),
+                 self.params_key(params), label)).lastrowid
+            self.db.executemany(
+                'INSERT INTO samples (run_id, map_id, algorithm, metric, value) VALUES (?, ?, ?, ?, ?)',
+                [(run_id, map_id, algorithm, metric, float(value))
+                 for (map_id, algorithm, metric), values in samples.items() for value in values])
+        return run_id
+
+    def runs(self, limit=None):
+        """Runs, newest first."""
+        query = 'SELECT * FROM runs ORDER BY id DESC'
+        rows = self.db.execute(query + ' LIMIT ?', (limit,)) if limit else self.db.execute(query)
+        return [HistoryRun(*row) for row in rows]
+
+    def run(self, run_id):
+        row = self.db.execute('SELECT * FROM runs WHERE id = ?', (run_id,)).fetchone()
+        return HistoryRun(*row) if row else None
+
+    def latest_run(self):
+        runs = self.runs(1)
+        return runs[0] if runs else None
+
+    def find_run(self, ref):
+        """A run by id, or the newest run whose commit starts with ref."""
+        if str(ref).isdigit():
+            run = self.run(int(ref))
+            if run is not None:
+                return run
+        row = self.db.execute('SELECT * FROM runs WHERE git_commit LIKE ? ORDER BY id DESC LIMIT 1',
+                              (f'{ref}%',)).fetchone()
+        return HistoryRun(*row) if row else None
+
+    def baseline_for(self, run):
+        """The newest earlier run on the same machine with the same parameters."""
+        row = self.db.execute(
+            'SELECT * FROM runs WHERE machine = ? AND params = ? AND id < ? ORDER BY id DESC LIMIT 1',
+            (run.machine, run.params, run.id)).fetchone()
+        return HistoryRun(*row) if row else None
+
+    def samples(self, run_id):
+        """(map_id, algorithm, metric) -> list of values of one run."""
+        cells = defaultdict(list)
+        rows = self.db.execute('SELECT map_id, algorithm, metric, value FROM samples WHERE run_id = ? '
+                               'ORDER BY rowid', (run_id,))
+        for map_id, algorithm, metric, value in rows:
+            cells[map_id, algorithm, metric].append(value)
+        return dict(cells)
+
+    def count_samples(self, run_id):
+        return self.db.execute('SELECT COUNT(*) FROM samples WHERE run_id = ?', (run_id,)).fetchone()[0]
@@ -0,0 +1,38 @@
+class SearchMemory:
+    """Re-solves of one level for one strategy, answered from the level's HintTable.
+
+    The hint table already maps every board of the level's component to its
+    distance from the nearest goal and an optimal first slide, so once the
+    strategy has solved the level for real, a later board the player slid
+    vehicles into is answered by following that table -- as optimal as a
+    fresh search, in slides. Strategies that report cost follow the hint
+    table's policy in summed vehicle length instead, built once per level
+    over the same states. Only the slides followed count as expanded nodes;
+    the tables belong to the level, not to this search.
+    """
+
+    def __init__(self, hint_table):
+        self.hint_table = hint_table
+        self.solved = False
+
+    def remember(self):
+        self.solved = True
+
+    def resolve(self, solver, start_tuple):
+        """(unit-step path, nodes expanded) for a new board, or None to search afresh."""
+        if not self.solved or self.hint_table is None:
+            return None
+        state = self.hint_table.encode(start_tuple)
+        if state is None or state not in self.hint_table.moves:
+            return None
+        moves = self.hint_table.moves_by_cost() if solver.reports_cost else self.hint_table.moves
+        board = self.hint_table.space.board
+
+        slides = []
+        while True:
+            _, i, delta = moves[state]
+            if i is None:
+                break
+            slides.append(board.move_tuple(i, delta))
+            state += delta << (i * board.bits)
+        return solver.expand_path(slides), len(slides) + 1
@@ -0,0 +1,169 @@
+from itertools import islice
+import sys
+import time
+import tracemalloc
+
+
+# Why a search stopped.
+SOLVED = 'solved'
+REUSED = 'reused'            # answered from a remembered goal table
+EXHAUSTED = 'exhausted'      # every reachable state seen, no goal among them
+UNSOLVABLE = 'unsolvable'    # rejected by the pre-check, nothing searched
+TIMEOUT = 'timeout'
+INTERRUPTED = 'interrupted'  # stopped by request_checkpoint()
+
+PHASES = ('successors', 'hashing', 'queue', 'heuristic')
+
+# Ratios derived from the counters, see SolveResult.derived_metrics().
+DERIVED = ('nodes_per_second', 'branching_ratio', 'effective_branching_factor', 'penetrance',
+           'duplicate_rate', 'heuristic_evals')
+
+
+class SolveResult:
+    """What solve() returns: the path plus counters of the search behind it.
+
+    path is a list of unit steps, empty unless solved. cost is the summed
+    vehicle length of the path for strategies that report it (UCS, A*) and
+    0 otherwise. phase_times splits the search loop's time into successor
+    generation, state hashing/table lookups, queue operations and heuristic
+    evaluation. heuristic_evals counts calls to the heuristic (A* only).
+    """
+
+    def __init__(self, path=None, cost=0, termination=EXHAUSTED, nodes_expanded=0, nodes_generated=0,
+                 duplicates_pruned=0, max_frontier=0, table_size=0, peak_bytes=0, phase_times=None,
+                 elapsed=0.0, heuristic_evals=0):
+        self.path = path or []
+        self.cost = cost
+        self.termination = termination
+        self.nodes_expanded = nodes_expanded
+        self.nodes_generated = nodes_generated
+        self.duplicates_pruned = duplicates_pruned
+        self.max_frontier = max_frontier
+        self.table_size = table_size
+        self.peak_bytes = peak_bytes
+        self.phase_times = phase_times or dict.fromkeys(PHASES, 0.0)
+        self.elapsed = elapsed
+        self.heuristic_evals = heuristic_evals
+
+    @property
+    def solved(self):
+        return self.termination in (SOLVED, REUSED)
+
+    @property
+    def depth(self):
+        """Moves (slides of one vehicle) on the path, the goal's depth in the search tree."""
+        return count_moves(self.path)
+
+    def derived_metrics(self, seconds=None):
+        """Ratios that separate engine speed from search efficiency.
+
+        nodes_per_second is expansions per second of seconds (default: the
+        search's own time). branching_ratio is generated / expanded;
+        effective_branching_factor is b* of a uniform tree of the solution's
+        depth holding every generated node; penetrance is depth / generated
+        (1 for a search that never strays from the path); duplicate_rate is
+        the share of generated nodes pruned as duplicates. b* and penetrance
+        are None without a solution.
+        """
+        seconds = self.elapsed if seconds is None else seconds
+        generated = self.nodes_generated
+        depth = self.depth if self.solved else 0
+        return {
+            'nodes_per_second': self.nodes_expanded / seconds if seconds > 0 else 0.0,
+            'branching_ratio': generated / self.nodes_expanded if self.nodes_expanded else 0.0,
+            'effective_branching_factor': effective_branching_factor(generated, depth),
+            'penetrance': depth / generated if depth and generated else None,
+            'duplicate_rate': self.duplicates_pruned / generated if generated else 0.0,
+            'heuristic_evals': self.heuristic_evals,
+        }
+
+    def __bool__(self):
+        return self.solved
+
+    def to_dict(self):
+        """JSON-ready counters, without the path."""
+        return {
+            'termination': self.termination,
+            'solution_length': len(self.path),
+            'cost': self.cost,
+            'nodes_expanded': self.nodes_expanded,
+            'nodes_generated': self.nodes_generated,
+            'duplicates_pruned': self.duplicates_pruned,
+            'max_frontier': self.max_frontier,
+            'table_size': self.table_size,
+            'peak_bytes': self.peak_bytes,
+            'heuristic_evals': self.heuristic_evals,
+            'phase_times': {phase: round(t, 6) for phase, t in self.phase_times.items()},
+            'search_time': round(self.elapsed, 6),
+        }
+
+    def __repr__(self):
+        return (f"SolveResult({self.termination}, moves={len(self.path)}, cost={self.cost}, "
+                f"expanded={self.nodes_expanded}, generated={self.nodes_generated})")
+
+
+class SearchStats:
+    """Counters a strategy updates while it searches."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.nodes_generated = 0
+        self.duplicates_pruned = 0
+        self.max_frontier = 0
+        self.heuristic_evals = 0
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+
+    def result(self, path, cost, termination, count=0, table=None):
+        return SolveResult(path, cost, termination, count, self.nodes_generated, self.duplicates_pruned,
+                           self.max_frontier, len(table) if table else 0, peak_bytes(table),
+                           dict(self.phase_times), time.perf_counter() - self.start, self.heuristic_evals)
+
+
+def count_moves(path):
+    """Number of moves in a path of unit steps; consecutive equal steps are one slide."""
+    moves = 0
+    previous = None
+    for step in path:
+        if step != previous:
+            moves += 1
+        previous = step
+    return moves
+
+
+def effective_branching_factor(nodes, depth, tolerance=1e-6):
+    """b* with b* + b*^2 + ... + b*^depth = nodes, or None when depth is 0 or nodes < depth."""
+    if depth <= 0 or nodes < depth:
+        return None
+
+    def tree_size(b):
+        total, level = 0.0, 1.0
+        for _ in range(depth):
+            level *= b
+            total += level
+            if total > nodes:
+                break
+        return total
+
+    low, high = 1.0, max(2.0, float(nodes))
+    while high - low > tolerance:
+        middle = (low + high) / 2
+        if tree_size(middle) > nodes:
+            high = middle
+        else:
+            low = middle
+    return (low + high) / 2
+
+
+def peak_bytes(table):
+    """Peak traced memory when tracemalloc is on, else the size of the state table.
+
+    The table only grows and the frontier holds its keys, so its footprint
+    is what a search peaks at; entry sizes are estimated from a sample.
+    """
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[1]
+    if not table:
+        return 0
+    sample = list(islice(table.items(), 1024))
+    entry = sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in sample) / len(sample)
+    return sys.getsizeof(table) + int(entry * len(table))
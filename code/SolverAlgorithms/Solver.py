@@ -1,5 +1,9 @@
 from constants import *
 from abc import ABC, abstractmethod
+from SolverAlgorithms.UnsolvableCheck import UnsolvabilityChecker
+from SolverAlgorithms.Checkpoint import SearchCheckpoint, save_checkpoint, load_checkpoint
+from SolverAlgorithms.SolveResult import SearchStats, REUSED, TIMEOUT, INTERRUPTED
+import os
 
 class SolverStrategy(ABC):
     
@@ -12,13 +16,104 @@ class SolverStrategy(ABC):
         pass
 
 class BaseSolver:
+    # Whether solve() reports g as the summed vehicle length of the path (UCS, A*).
+    reports_cost = False
+    # Board sizes solve() handles, None for any; the classic strategies hard-code 6x6.
+    board_sizes = (MAP_N,)
 
     def __init__(self, map_obj):
         self.map = map_obj
+        self.walls = ()
+        self.size = MAP_N
+        # Optional SearchMemory of this level, shared between solves by the game.
+        self.memory = None
+        # Optional file the search is saved to on timeout and resumed from.
+        self.checkpoint_path = None
+        self.checkpoint_requested = False
+        self.board_key = None
+        # Counters of the current solve(), restarted by new_stats().
+        self.stats = SearchStats()
 
     def solve(self):
         pass
 
+    def read_puzzle(self):
+        """Sorted start tuple and car_info of the board to solve.
+
+        map_obj may be a game Map or a Game.Puzzle; both provide get_puzzle().
+        """
+        puzzle = self.map.get_puzzle()
+        self.walls = puzzle.walls
+        self.size = puzzle.size
+        self.board_key = puzzle.to_board_string()
+        return puzzle.start_tuple(), puzzle.car_info()
+
+    def is_unsolvable(self, start_tuple, car_info):
+        reason = UnsolvabilityChecker(size=self.size).check(start_tuple, car_info, self.walls)
+        if reason:
+            print(f"No solution: {reason}")
+            return True
+        return False
+
+    @classmethod
+    def supports_size(cls, size):
+        return cls.board_sizes is None or size in cls.board_sizes
+
+    def new_stats(self):
+        self.stats = SearchStats()
+        return self.stats
+
+    def reuse_search(self, start_tuple, car_info):
+        """SolveResult read off the level's goal table after an earlier solve, or None."""
+        if self.memory is None:
+            return None
+        reused = self.memory.resolve(self, start_tuple)
+        if reused is None:
+            return None
+        path, count = reused
+        print(f"Reused previous search: {count} new nodes expanded")
+        g = sum(car_info[name][1] for name, _, _ in path) if self.reports_cost else 0
+        return self.stats.result(path, g, REUSED, count)
+
+    def remember_search(self):
+        if self.memory is not None:
+            self.memory.remember()
+
+    def stop_search(self, frontier, table, count):
+        """Save the search on timeout or request and report why it stopped."""
+        termination = INTERRUPTED if self.checkpoint_requested else TIMEOUT
+        print("Timed out" if termination == TIMEOUT else "Search interrupted")
+        self.save_search(frontier, table, count)
+        return self.stats.result([], 0, termination, count, table)
+
+    def request_checkpoint(self):
+        """Ask a running search to save itself and stop before the next node."""
+        self.checkpoint_requested = True
+
+    def load_search(self):
+        """Saved frontier, table and node count for this board and strategy, or None."""
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return None
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        if checkpoint.strategy != type(self).__name__ or checkpoint.board != self.board_key:
+            print(f"Ignoring checkpoint of another puzzle or strategy: {self.checkpoint_path}")
+            return None
+        print(f"Resuming from checkpoint: {checkpoint.count} nodes expanded, "
+              f"{len(checkpoint.frontier)} in frontier")
+        return checkpoint
+
+    def save_search(self, frontier, table, count):
+        self.checkpoint_requested = False
+        if self.checkpoint_path is None:
+            return
+        save_checkpoint(self.checkpoint_path,
+                        SearchCheckpoint(type(self).__name__, self.board_key, frontier, table, count))
+        print(f"Checkpoint saved: {self.checkpoint_path}")
+
+    def discard_checkpoint(self):
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
 
 class PuzzleSolver:
     def __init__(self, map_obj, strategy: SolverStrategy = None):
@@ -2,6 +2,7 @@ from SolverAlgorithms.DFS import DFSStrategy
 from SolverAlgorithms.BFS import BFSStrategy
 from SolverAlgorithms.UCS import UCSStrategy
 from SolverAlgorithms.AStarr import AStarStrategy
+from SolverAlgorithms.VectorBFS import VectorBFSStrategy
 
 class StrategyFactory:
     
@@ -21,9 +22,13 @@ class StrategyFactory:
     def create_astar(map_obj, max_time=30):   
         return AStarStrategy(map_obj, max_time)
 
+    @staticmethod
+    def create_vector_bfs(map_obj, max_time=30):
+        return VectorBFSStrategy(map_obj, max_time)
+
     @staticmethod
     def get_strategy_names():
-        return ['DFS', 'BFS', 'UCS', 'A*']
+        return ['DFS', 'BFS', 'UCS', 'A*', 'VectorBFS']
 
     @staticmethod
     def create_strategy_from_name(strategy_name, map_obj, max_depth=50):
@@ -39,5 +44,7 @@ class StrategyFactory:
             return UCSStrategy(map_obj, max_time)
         elif strategy_name == 'A*':
             return AStarStrategy(map_obj, max_time)
+        elif strategy_name == 'VectorBFS':
+            return VectorBFSStrategy(map_obj, max_time)
         else:
             raise ValueError(f"Invalid strategy name: {strategy_name}")
\ No newline at end of file
@@ -0,0 +1,125 @@
+from SolverAlgorithms.BitBoard import BitBoard
+from collections import deque, namedtuple
+import heapq
+
+
+ComponentStats = namedtuple('ComponentStats', ['optimal_length', 'size', 'hardest_state', 'hardest_length'])
+
+
+class StateSpace:
+    """Whole-component analysis on packed BitBoard states.
+
+    Lengths are counted in slides (one vehicle moved any distance), the usual
+    Rush Hour move count. Every slide can be undone, so distances to the
+    nearest goal come from one multi-source BFS started at all goal states.
+    """
+
+    def __init__(self, board: BitBoard):
+        self.board = board
+
+    @classmethod
+    def from_puzzle(cls, puzzle):
+        start_tuple = puzzle.start_tuple()
+        board = BitBoard.from_state(start_tuple, puzzle.car_info(), puzzle.size, puzzle.wall_mask())
+        return cls(board), board.encode(start_tuple)
+
+    def component(self, start, limit=None):
+        """BFS depth from start of every reachable state, or None past limit."""
+        successors = self.board.successors
+        depth = {start: 0}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            d = depth[state] + 1
+            for child, _, _ in successors(state):
+                if child not in depth:
+                    depth[child] = d
+                    queue.append(child)
+            if limit is not None and len(depth) > limit:
+                return None
+        return depth
+
+    def goal_distances(self, states):
+        """Slides to the nearest goal for every state of a closed component.
+
+        States that cannot reach a goal are left out of the result.
+        """
+        successors = self.board.successors
+        is_goal = self.board.is_goal
+        dist = {}
+        queue = deque()
+        for state in states:
+            if is_goal(state):
+                dist[state] = 0
+                queue.append(state)
+        while queue:
+            state = queue.popleft()
+            d = dist[state] + 1
+            for child, _, _ in successors(state):
+                if child not in dist:
+                    dist[child] = d
+                    queue.append(child)
+        return dist
+
+    def goal_moves(self, states):
+        """Distance to the nearest goal plus one optimal first slide per state.
+
+        Maps state -> (distance, vehicle index, delta); goals have no slide
+        (index None). The BFS from the goals reaches each state through a
+        neighbour one slide closer, and undoing that discovering slide is an
+        optimal move, so the policy costs nothing beyond goal_distances.
+        """
+        successors = self.board.successors
+        is_goal = self.board.is_goal
+        moves = {}
+        queue = deque()
+        for state in states:
+            if is_goal(state):
+                moves[state] = (0, None, 0)
+                queue.append(state)
+        while queue:
+            state = queue.popleft()
+            d = moves[state][0] + 1
+            for child, i, delta in successors(state):
+                if child not in moves:
+                    moves[child] = (d, i, -delta)
+                    queue.append(child)
+        return moves
+
+    def goal_cost_moves(self, states):
+        """goal_moves with each slide costing its distance times the vehicle length.
+
+        The metric UCS and A* minimise. A multi-source Dijkstra from the goals;
+        slides cost the same both ways, so the slide that settles a state's
+        cost, undone, is an optimal first slide from it.
+        """
+        successors = self.board.successors
+        lengths = self.board.lengths
+        moves = {}
+        heap = []
+        for state in states:
+            if self.board.is_goal(state):
+                moves[state] = (0, None, 0)
+                heap.append((0, state))
+        heapq.heapify(heap)
+        while heap:
+            d, state = heapq.heappop(heap)
+            if d > moves[state][0]:
+                continue
+            for child, i, delta in successors(state):
+                cost = d + abs(delta) * lengths[i]
+                if child not in moves or cost < moves[child][0]:
+                    moves[child] = (cost, i, -delta)
+                    heapq.heappush(heap, (cost, child))
+        return moves
+
+    def analyze(self, start, limit=None):
+        """ComponentStats of the component holding start, None past limit."""
+        states = self.component(start, limit)
+        if states is None:
+            return None
+        dist = self.goal_distances(states)
+        if not dist:
+            return ComponentStats(-1, len(states), start, -1)
+        hardest = max(dist, key=dist.get)
+        return ComponentStats(dist.get(start, -1), len(states), hardest, dist[hardest])
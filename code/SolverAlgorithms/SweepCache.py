@@ -0,0 +1,125 @@
+import ast
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+
+# The code/ folder, where imports are rooted.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outcomes (
+    cell TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    value BLOB NOT NULL,
+    wall REAL NOT NULL,
+    cpu REAL NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (cell, kind, run)
+);
+"""
+
+
+def module_path(name, root=ROOT):
+    """Source file of a module inside the repo, or None for stdlib/third-party modules."""
+    base = os.path.join(root, *name.split('.'))
+    for path in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def local_imports(path, root=ROOT):
+    """Repo modules imported by the file at path."""
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            # "from package import module" imports a module, not a name
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return {name for name in names if module_path(name, root) is not None}
+
+
+def source_files(modules, root=ROOT):
+    """Files of the given modules and every repo module they import, transitively."""
+    seen = {}
+    todo = list(modules)
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        path = module_path(name, root)
+        if path is None:
+            continue
+        seen[name] = path
+        todo.extend(local_imports(path, root))
+    return sorted(seen.values())
+
+
+def code_hash(modules, extra=(), root=ROOT):
+    """Hash of the source of modules and their repo imports, plus extra strings.
+
+    Any edit to a file a strategy depends on changes its hash, which
+    invalidates the cached measurements of that strategy only.
+    """
+    digest = hashlib.sha1()
+    for path in source_files(modules, root):
+        digest.update(os.path.relpath(path, root).replace(os.sep, '/').encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha1(f.read()).digest())
+    for text in extra:
+        digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cell_key(**parts):
+    """Cache key of one (puzzle, strategy) cell from JSON-ready inputs."""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=repr).encode('utf-8')).hexdigest()
+
+
+class SweepCache:
+    """SQLite store of finished sweep jobs, keyed by cell, job kind and run index.
+
+    Each outcome is committed as soon as it arrives, so an interrupted sweep
+    keeps everything it measured and the next one starts where it stopped.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def outcomes(self, cell):
+        """[(kind, run, status, value, wall, cpu)] of a cell, ordered by kind and run."""
+        rows = self.db.execute('SELECT kind, run, status, value, wall, cpu FROM outcomes WHERE cell = ? '
+                               'ORDER BY kind, run', (cell,))
+        return [(kind, run, status, pickle.loads(value), wall, cpu) for kind, run, status, value, wall, cpu in rows]
+
+    def store(self, cell, kind, run, status, value, wall, cpu):
+        with self.db:
+            self.db.execute('INSERT OR REPLACE INTO outcomes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                            (cell, kind, run, status, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                             wall, cpu, time.time()))
+
+    def forget(self, cell):
+        with self.db:
+            self.db.execute('DELETE FROM outcomes WHERE cell = ?', (cell,))
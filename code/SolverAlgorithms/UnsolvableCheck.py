@@ -0,0 +1,87 @@
+from SolverAlgorithms.BitBoard import BitBoard
+from collections import deque
+from constants import *
+
+
+class UnsolvabilityChecker:
+    """Cheap analysis run before a full search.
+
+    check() returns a short reason when the board provably has no solution and
+    None when it could not prove anything (the full search then decides).
+    The component enumeration runs before every solve and its work is thrown
+    away on solvable boards, so component_limit keeps it to a few ms; larger
+    closed components are left to the search.
+    """
+
+    def __init__(self, component_limit=500, size=MAP_N):
+        self.component_limit = component_limit
+        self.size = size
+
+    def check(self, start_tuple, car_info, walls=()):
+        if 'A' not in car_info:
+            return "no target vehicle A on the board"
+        if car_info['A'][0] != 'h':
+            return "target vehicle A is not horizontal"
+
+        wall_mask = 0
+        for x, y in walls:
+            wall_mask |= 1 << (y * self.size + x)
+        board = BitBoard.from_state(start_tuple, car_info, self.size, wall_mask)
+        if not board.is_legal(start_tuple):
+            return "vehicles overlap or leave the board"
+
+        reason = self.check_exit_row(start_tuple, car_info, walls)
+        if reason:
+            return reason
+
+        return self.check_component(board, start_tuple)
+
+    def check_exit_row(self, start_tuple, car_info, walls=()):
+        target_x = target_y = None
+        for name, x, y in start_tuple:
+            if name == 'A':
+                target_x, target_y = x, y
+                break
+
+        for x, y in walls:
+            if y == target_y and x > target_x:
+                return "a wall blocks the exit row"
+
+        for name, x, y in start_tuple:
+            if name == 'A':
+                continue
+            orient, length = car_info[name]
+            if orient == 'h':
+                # A car sharing the exit row can never leave it, so once it is
+                # in front of A the exit is blocked for good.
+                if y == target_y and x > target_x:
+                    return f"horizontal vehicle {name} blocks the exit row"
+            elif x > target_x:
+                # A vertical car in front of A must be able to sit entirely
+                # above or below the exit row, otherwise it always blocks.
+                clear_above = target_y - length >= 0
+                clear_below = target_y + 1 + length <= self.size
+                if not clear_above and not clear_below:
+                    return f"vertical vehicle {name} can never clear the exit row"
+        return None
+
+    def check_component(self, board, start_tuple):
+        """Enumerate the reachable states while the component stays small."""
+        start = board.encode(start_tuple)
+        if board.is_goal(start):
+            return None
+
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            for child, _, _ in board.successors(state):
+                if child in seen:
+                    continue
+                if board.is_goal(child):
+                    return None
+                seen.add(child)
+                if len(seen) > self.component_limit:
+                    return None
+                queue.append(child)
+        return f"all {len(seen)} reachable states explored without reaching the exit"
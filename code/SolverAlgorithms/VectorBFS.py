@@ -0,0 +1,126 @@
+from SolverAlgorithms.Solver import SolverStrategy, BaseSolver
+from SolverAlgorithms.BatchExpand import BatchExpander
+from SolverAlgorithms.StateSpace import StateSpace
+from SolverAlgorithms.SolveResult import SolveResult, PHASES, SOLVED, EXHAUSTED, UNSOLVABLE, TIMEOUT
+import numpy as np
+import time
+
+
+class VectorBFS:
+    """Layer-at-a-time BFS over uint64 states with array-speed dedup.
+
+    The visited set is one sorted array; each new layer is np.unique'd and
+    filtered against it with searchsorted, then merged back in. Every layer
+    keeps its parent indices and moves so the path can be rebuilt.
+    """
+
+    def __init__(self, expander: BatchExpander):
+        self.expander = expander
+        # Filled in by search(): whether it ran out of time, successor and
+        # duplicate counts, per-phase seconds and the bytes held by the
+        # visited array and layers.
+        self.timed_out = False
+        self.generated = 0
+        self.duplicates = 0
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+        self.table_bytes = 0
+
+    def search(self, start, stop_at_goal=True, max_time=None):
+        """(moves, states expanded, layer sizes); moves is None when no goal was found.
+
+        moves is a list of (vehicle index, delta) slides. With stop_at_goal
+        off the whole component is explored and moves lead to the nearest goal.
+        """
+        start_clock = time.time()
+        clock = time.perf_counter
+        self.timed_out = False
+        self.generated = self.duplicates = 0
+        frontier = np.array([start], dtype=np.uint64)
+        visited = frontier.copy()
+        layers = [(frontier, None, None, None)]
+        goal = None
+        count = 0
+        while len(frontier):
+            if goal is None:
+                hits = np.flatnonzero(self.expander.is_goal(frontier))
+                if len(hits):
+                    goal = (len(layers) - 1, int(hits[0]))
+                    if stop_at_goal:
+                        break
+            if max_time is not None and time.time() - start_clock > max_time:
+                self.timed_out = True
+                self.table_bytes = self.memory(visited, layers)
+                return None, count, [len(layer[0]) for layer in layers]
+
+            t0 = clock()
+            children, parents, vehicles, deltas = self.expander.expand(frontier)
+            t1 = clock()
+            count += len(frontier)
+            unique, first = np.unique(children, return_index=True)
+            pos = np.minimum(np.searchsorted(visited, unique), len(visited) - 1)
+            fresh = visited[pos] != unique
+            frontier = unique[fresh]
+            source = first[fresh]
+            self.generated += len(children)
+            self.duplicates += len(children) - len(frontier)
+            if len(frontier):
+                layers.append((frontier, parents[source], vehicles[source], deltas[source]))
+                visited = np.sort(np.concatenate((visited, frontier)), kind='stable')
+            self.phase_times['successors'] += t1 - t0
+            self.phase_times['hashing'] += clock() - t1
+
+        self.table_bytes = self.memory(visited, layers)
+        sizes = [len(layer[0]) for layer in layers]
+        if goal is None:
+            return None, count, sizes
+        return self.moves_to(layers, *goal), count, sizes
+
+    @staticmethod
+    def memory(visited, layers):
+        return visited.nbytes + sum(a.nbytes for layer in layers for a in layer if a is not None)
+
+    def moves_to(self, layers, depth, index):
+        moves = []
+        while depth > 0:
+            _, parents, vehicles, deltas = layers[depth]
+            moves.append((int(vehicles[index]), int(deltas[index])))
+            index = parents[index]
+            depth -= 1
+        moves.reverse()
+        return moves
+
+
+class VectorBFSStrategy(SolverStrategy, BaseSolver):
+    # Any size whose packed state fits 64 bits; BatchExpander rejects the rest.
+    board_sizes = None
+
+    def __init__(self, map_obj, max_time=30):
+        super().__init__(map_obj)
+        self.max_time = max_time
+
+    def get_name(self):
+        return f"Vector BFS {self.max_time})"
+
+    def solve(self):
+        self.new_stats()
+        start_tuple, car_info = self.read_puzzle()
+        if self.is_unsolvable(start_tuple, car_info):
+            return self.stats.result([], 0, UNSOLVABLE)
+        space, start = StateSpace.from_puzzle(self.map.get_puzzle())
+        board = space.board
+
+        search = VectorBFS(BatchExpander(board))
+        moves, count, sizes = search.search(start, max_time=self.max_time)
+        path = []
+        for i, delta in moves or []:
+            step = 1 if delta > 0 else -1
+            path.extend([board.move_tuple(i, step)] * abs(delta))
+
+        if moves is not None:
+            termination = SOLVED
+        else:
+            termination = TIMEOUT if search.timed_out else EXHAUSTED
+        return SolveResult(path, 0, termination, count, search.generated, search.duplicates,
+                           max_frontier=max(sizes), table_size=sum(sizes),
+                           peak_bytes=search.table_bytes, phase_times=search.phase_times,
+                           elapsed=time.perf_counter() - self.stats.start)
@@ -0,0 +1,173 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import contextlib
+import json
+import time
+from multiprocessing import Pool
+
+from Game.LevelFile import list_level_files
+from Game.Puzzle import Puzzle
+from Game.LevelPack import LevelPack, is_level_pack
+from SolverAlgorithms.BatchedBFS import BatchedBFS
+from SolverAlgorithms.Checkpoint import checkpoint_name
+from SolverAlgorithms.SolveResult import SOLVED, REUSED, EXHAUSTED, TIMEOUT
+from SolverAlgorithms.SolverFactory import StrategyFactory
+
+
+def solve_job(job):
+    """Solve one puzzle in a worker and return its JSON-ready record."""
+    puzzle_id, puzzle, strategy_name, max_time, checkpoint_dir = job
+    strategy = StrategyFactory.create_strategy(strategy_name, puzzle, max_time)
+    if checkpoint_dir is not None:
+        strategy.checkpoint_path = os.path.join(checkpoint_dir, checkpoint_name(puzzle_id, strategy_name))
+
+    # Strategies print progress; keep stdout clean for the JSON lines.
+    with contextlib.redirect_stdout(sys.stderr):
+        start = time.perf_counter()
+        result = strategy.solve()
+        elapsed = time.perf_counter() - start
+
+    record = puzzle_record(puzzle_id, puzzle, strategy_name, result.path, result.nodes_expanded,
+                           elapsed, result.termination)
+    record.update(generated=result.nodes_generated, duplicates=result.duplicates_pruned,
+                  max_frontier=result.max_frontier, phases=result.to_dict()['phase_times'])
+    return record
+
+
+def puzzle_record(puzzle_id, puzzle, strategy_name, path, nodes, elapsed, termination):
+    lengths = {v.name: v.length for v in puzzle.vehicles}
+    return {
+        'puzzle': puzzle_id,
+        'strategy': strategy_name,
+        'solved': termination in (SOLVED, REUSED),
+        'termination': termination,
+        'moves': len(path),
+        'cost': sum(lengths[name] for name, _, _ in path),
+        'nodes': nodes,
+        'time': round(elapsed, 6),
+    }
+
+
+class BatchSolver:
+    def __init__(self, strategy_name='BFS', max_time=30, workers=None, checkpoint_dir=None,
+                 batched=False, batch_size=4096):
+        if strategy_name not in StrategyFactory.get_strategy_names():
+            raise ValueError(f"Invalid strategy name: {strategy_name}")
+        # The batched search is always BFS; records must not carry another strategy's name.
+        if batched and strategy_name != 'BFS':
+            raise ValueError(f"--batched always runs BFS, not {strategy_name}")
+        if batched and checkpoint_dir is not None:
+            raise ValueError("--batched does not support --checkpoint-dir")
+        self.strategy_name = strategy_name
+        self.max_time = max_time
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint_dir = checkpoint_dir
+        self.batched = batched
+        self.batch_size = batch_size
+        if checkpoint_dir is not None:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def load_puzzles(self, source):
+        """Yield (puzzle_id, puzzle) for a level directory, a level pack or a level file."""
+        if os.path.isdir(source):
+            for path in list_level_files(source):
+                yield os.path.basename(path), Puzzle.from_file(path)
+        elif is_level_pack(source):
+            with LevelPack(source) as pack:
+                for i in range(len(pack)):
+                    yield i, pack.puzzle(i)
+        else:
+            yield os.path.basename(source), Puzzle.from_file(source)
+
+    def run_batched(self, source, out=sys.stdout):
+        """Solve every puzzle of a board size together in one BatchedBFS per chunk.
+
+        Records keep the per-puzzle format; time is the chunk's wall time
+        split evenly over its puzzles.
+        """
+        groups = {}
+        for puzzle_id, puzzle in self.load_puzzles(source):
+            groups.setdefault(puzzle.size, []).append((puzzle_id, puzzle))
+
+        start = time.perf_counter()
+        solved = total = 0
+        for size, entries in groups.items():
+            chunk = min(self.batch_size, BatchedBFS.max_batch([puzzle for _, puzzle in entries]))
+            for i in range(0, len(entries), chunk):
+                batch = entries[i:i + chunk]
+                batch_start = time.perf_counter()
+                search = BatchedBFS([puzzle for _, puzzle in batch], size)
+                results = search.solve(self.max_time)
+                share = (time.perf_counter() - batch_start) / len(batch)
+                unsolved = TIMEOUT if search.timed_out else EXHAUSTED
+                for (puzzle_id, puzzle), result in zip(batch, results):
+                    termination = SOLVED if result.path is not None else unsolved
+                    record = puzzle_record(puzzle_id, puzzle, 'BatchedBFS', result.path or [], result.nodes,
+                                           share, termination)
+                    solved += record['solved']
+                    out.write(json.dumps(record) + "\n")
+                total += len(batch)
+        out.flush()
+
+        elapsed = time.perf_counter() - start
+        print(f"Solved {solved}/{total} puzzles with batched BFS in {elapsed:.2f}s", file=sys.stderr)
+        return solved, total
+
+    def run(self, source, out=sys.stdout):
+        if self.batched:
+            return self.run_batched(source, out)
+        jobs = [(puzzle_id, puzzle, self.strategy_name, self.max_time, self.checkpoint_dir)
+                for puzzle_id, puzzle in self.load_puzzles(source)]
+
+        start = time.perf_counter()
+        solved = 0
+        if self.workers == 1:
+            records = map(solve_job, jobs)
+            for record in records:
+                solved += record['solved']
+                out.write(json.dumps(record) + "\n")
+        else:
+            chunksize = max(1, len(jobs) // (self.workers * 4))
+            with Pool(self.workers) as pool:
+                for record in pool.imap_unordered(solve_job, jobs, chunksize):
+                    solved += record['solved']
+                    out.write(json.dumps(record) + "\n")
+        out.flush()
+
+        elapsed = time.perf_counter() - start
+        print(f"Solved {solved}/{len(jobs)} puzzles with {self.strategy_name} "
+              f"in {elapsed:.2f}s using {self.workers} workers", file=sys.stderr)
+        return solved, len(jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve levels headlessly and print JSON lines.")
+    parser.add_argument('source', help="level directory, level pack or level file")
+    parser.add_argument('-s', '--strategy', default='BFS', choices=StrategyFactory.get_strategy_names())
+    parser.add_argument('-t', '--max-time', type=float, default=30)
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('-o', '--output', default=None, help="write JSON lines here instead of stdout")
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help="save timed-out searches here and resume them on the next run")
+    parser.add_argument('--batched', action='store_true',
+                        help="search all puzzles of a board size together in one vectorized BFS")
+    parser.add_argument('--batch-size', type=int, default=4096, help="puzzles per batched search")
+    args = parser.parse_args(argv)
+
+    try:
+        solver = BatchSolver(args.strategy, args.max_time, args.workers, args.checkpoint_dir,
+                             args.batched, args.batch_size)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            solver.run(args.source, out)
+    else:
+        solver.run(args.source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import contextlib
+import heapq
+import io
+import json
+import random
+import time
+from collections import Counter, namedtuple, deque
+
+from Game.LevelFile import list_level_files, write_level_file
+from Game.LevelPack import LevelPack, is_level_pack
+from Game.Puzzle import Puzzle
+from Game.PuzzleGenerator import PuzzleGenerator
+from SolverAlgorithms.BitBoard import BitBoard
+from SolverAlgorithms.JobPool import PinnedPool, OK
+from SolverAlgorithms.SolveResult import EXHAUSTED, UNSOLVABLE, TIMEOUT, count_moves
+from SolverAlgorithms.SolverFactory import StrategyFactory
+from constants import *
+
+
+# What a strategy promises beyond a valid path: the fewest slides or the
+# smallest summed vehicle length. Strategies not listed only need valid paths.
+MOVES = 'moves'
+COST = 'cost'
+OPTIMAL = {'BFS': MOVES, 'VectorBFS': MOVES, 'UCS': COST, 'A*': COST}
+
+# Kinds of mismatch against the validator and the reference.
+INVALID = 'invalid_path'       # illegal step, or the path does not end at the exit
+WRONG_COST = 'wrong_cost'      # reported cost differs from the path's own cost
+NOT_OPTIMAL = 'not_optimal'    # valid but longer or costlier than the reference
+MISSED = 'missed_solution'     # gave up on a solvable puzzle
+RAISED = 'raised'              # solve() raised an exception
+KINDS = (INVALID, WRONG_COST, NOT_OPTIMAL, MISSED, RAISED)
+
+ERROR = 'error'
+
+CASES_FILE = 'cases.jsonl'
+
+
+Reference = namedtuple('Reference', ['moves', 'cost'])
+Check = namedtuple('Check', ['strategy', 'termination', 'moves', 'cost', 'problems'])
+
+
+def fewest_moves(board, start, limit=None):
+    """Slides on a shortest path to the goal, -1 when there is none, None past limit states."""
+    if board.is_goal(start):
+        return 0
+    depth = {start: 0}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        d = depth[state] + 1
+        for child, _, _ in board.successors(state):
+            if child in depth:
+                continue
+            if board.is_goal(child):
+                return d
+            depth[child] = d
+            queue.append(child)
+        if limit is not None and len(depth) > limit:
+            return None
+    return -1
+
+
+def cheapest_cost(board, start, limit=None):
+    """Smallest summed vehicle length of a path to the goal (Dijkstra), -1 or None like fewest_moves."""
+    lengths = board.lengths
+    best = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        g, state = heapq.heappop(heap)
+        if g > best[state]:
+            continue
+        if board.is_goal(state):
+            return g
+        for child, i, delta in board.successors(state):
+            cost = g + abs(delta) * lengths[i]
+            if cost < best.get(child, cost + 1):
+                best[child] = cost
+                heapq.heappush(heap, (cost, child))
+        if limit is not None and len(best) > limit:
+            return None
+    return -1
+
+
+def reference(puzzle, limit=None):
+    """Reference answers from plain searches over BitBoard states.
+
+    None when either search passes limit states: the Dijkstra can need more
+    states than the BFS, and half a reference must never flag a mismatch.
+
+    Kept deliberately simple: no pruning, no heuristics, nothing shared with
+    the strategies under test beyond the BitBoard move generator.
+    """
+    start_tuple = puzzle.start_tuple()
+    board = BitBoard.from_state(start_tuple, puzzle.car_info(), puzzle.size, puzzle.wall_mask())
+    start = board.encode(start_tuple)
+    moves = fewest_moves(board, start, limit)
+    if moves is None:
+        return None
+    if moves < 0:
+        return Reference(-1, -1)
+    cost = cheapest_cost(board, start, limit)
+    if cost is None:
+        return None
+    return Reference(moves, cost)
+
+
+def validate_path(puzzle, path):
+    """Why path is not a solution of puzzle, or None when it is.
+
+    Replays the unit steps on an occupancy grid: each step moves one vehicle
+    one cell along its lane into a free cell on the board, and the target
+    must end at the exit. Each step touches two cells, so this is linear in
+    the path length.
+    """
+    size = puzzle.size
+    occupied = {cell: 'x' for cell in puzzle.walls}
+    vehicles = {}
+    for v in puzzle.vehicles:
+        orient = v.orient.lower()
+        vehicles[v.name] = [orient, v.length, v.x, v.y]
+        for i in range(v.length):
+            occupied[(v.x + i, v.y) if orient == 'h' else (v.x, v.y + i)] = v.name
+
+    for n, (name, dx, dy) in enumerate(path):
+        if name not in vehicles:
+            return f"step {n}: no vehicle {name}"
+        vehicle = vehicles[name]
+        orient, length, x, y = vehicle
+        if abs(dx) + abs(dy) != 1 or (dy if orient == 'h' else dx):
+            return f"step {n}: {name} ({orient}) cannot move by ({dx}, {dy})"
+        if dx + dy > 0:
+            enter, leave = (x + dx * length, y + dy * length), (x, y)
+        else:
+            enter, leave = (x + dx, y + dy), (x - dx * (length - 1), y - dy * (length - 1))
+        if not (0 <= enter[0] < size and 0 <= enter[1] < size):
+            return f"step {n}: {name} leaves the board at {enter}"
+        if enter in occupied:
+            return f"step {n}: {name} runs into {occupied[enter]} at {enter}"
+        del occupied[leave]
+        occupied[enter] = name
+        vehicle[2], vehicle[3] = x + dx, y + dy
+
+    target = vehicles.get('A')
+    if target is None or target[2] + target[1] != size:
+        return "path ends before the target reaches the exit"
+    return None
+
+
+def path_cost(puzzle, path):
+    lengths = {v.name: v.length for v in puzzle.vehicles}
+    return sum(lengths[name] for name, _, _ in path)
+
+
+def check_result(name, strategy, puzzle, result, ref):
+    """[(kind, detail)] of what is wrong with one strategy's result; ref may be None."""
+    if result.solved:
+        why = validate_path(puzzle, result.path)
+        if why:
+            return [(INVALID, why)]
+        problems = []
+        cost = path_cost(puzzle, result.path)
+        if strategy.reports_cost and result.cost != cost:
+            problems.append((WRONG_COST, f"reported cost {result.cost}, path costs {cost}"))
+        if ref is None:
+            return problems
+        moves = count_moves(result.path)
+        # A valid path proves the puzzle solvable, so an unknown or negative optimum is a reference gap.
+        if OPTIMAL.get(name) == MOVES and ref.moves is not None and ref.moves >= 0 and moves != ref.moves:
+            problems.append((NOT_OPTIMAL, f"{moves} moves, optimum is {ref.moves}"))
+        elif OPTIMAL.get(name) == COST and ref.cost is not None and ref.cost >= 0 and cost != ref.cost:
+            problems.append((NOT_OPTIMAL, f"cost {cost}, optimum is {ref.cost}"))
+        return problems
+    if result.termination in (EXHAUSTED, UNSOLVABLE) and ref is not None and ref.moves is not None \
+            and ref.moves >= 0:
+        return [(MISSED, f"{result.termination} on a puzzle solvable in {ref.moves} moves")]
+    return []
+
+
+def check_puzzle(puzzle, names, max_time, state_limit):
+    """(reference, [Check]) of every strategy in names that handles the puzzle's size."""
+    ref = reference(puzzle, state_limit)
+    checks = []
+    for name in names:
+        strategy = StrategyFactory.create_strategy(name, puzzle, max_time)
+        if not strategy.supports_size(puzzle.size):
+            continue
+        try:
+            result = strategy.solve()
+        except Exception as e:
+            checks.append(Check(name, ERROR, 0, 0, [(RAISED, f"{type(e).__name__}: {e}")]))
+            continue
+        moves = count_moves(result.path) if result.solved else 0
+        cost = path_cost(puzzle, result.path) if result.solved else 0
+        problems = check_result(name, strategy, puzzle, result, ref)
+        checks.append(Check(name, result.termination, moves, cost, problems))
+    return ref, checks
+
+
+def hardest_state(puzzle, state_limit):
+    """The state farthest from the goal in puzzle's component, or puzzle itself past state_limit."""
+    generated = PuzzleGenerator(puzzle.size, state_limit=state_limit).hardest_of(puzzle)
+    return generated.puzzle if generated is not None else puzzle
+
+
+def check_job(job):
+    """Check a batch of puzzles in a worker; returns (puzzle_id, board, size, reference, checks) per puzzle."""
+    names, max_time, state_limit, entries = job
+    records = []
+    # Strategies print progress; thousands of solves would bury the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for puzzle_id, puzzle, hard in entries:
+            if hard:
+                puzzle = hardest_state(puzzle, state_limit)
+            ref, checks = check_puzzle(puzzle, names, max_time, state_limit)
+            records.append((puzzle_id, puzzle.to_board_string(), puzzle.size, ref, checks))
+    return records
+
+
+def reproduces(puzzle, name, kind, max_time, state_limit):
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, checks = check_puzzle(puzzle, [name], max_time, state_limit)
+    return [detail for check in checks for k, detail in check.problems if k == kind]
+
+
+def minimize(puzzle, name, kind, max_time, state_limit):
+    """Smallest puzzle found by dropping vehicles one at a time while the mismatch persists.
+
+    Greedy and 1-minimal: removing any single remaining non-target vehicle
+    makes the mismatch go away. Returns (puzzle, detail of the mismatch on it).
+    """
+    details = reproduces(puzzle, name, kind, max_time, state_limit)
+    if not details:
+        return puzzle, None
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for v in puzzle.vehicles:
+            if v.is_target:
+                continue
+            smaller = Puzzle([u for u in puzzle.vehicles if u is not v], puzzle.size, puzzle.walls)
+            found = reproduces(smaller, name, kind, max_time, state_limit)
+            if found:
+                puzzle, details, shrunk = smaller, found, True
+                break
+    return puzzle, details[0]
+
+
+def minimize_job(job):
+    board, size, name, kind, max_time, state_limit = job
+    puzzle, detail = minimize(Puzzle.from_board_string(board, size), name, kind, max_time, state_limit)
+    return puzzle.to_board_string(), detail
+
+
+def generate_corpus(count, seed=0, min_vehicles=2, max_vehicles=14, hard_share=0.25, size=MAP_N):
+    """(puzzle_id, puzzle, hard) for count random layouts.
+
+    Random layouts mix trivial, hard and unsolvable boards; hard entries are
+    replaced in the worker by the hardest state of their component, which
+    gives the searches long optimal solutions to get wrong.
+    """
+    generator = PuzzleGenerator(size, min_vehicles, max_vehicles)
+    rng = random.Random(seed)
+    for i in range(count):
+        puzzle = generator.random_layout(rng)
+        yield i, puzzle, rng.random() < hard_share
+
+
+def load_corpus(source):
+    """(puzzle_id, puzzle, False) for a level directory, a level pack or a level file."""
+    if os.path.isdir(source):
+        for path in list_level_files(source):
+            yield os.path.basename(path), Puzzle.from_file(path), False
+    elif is_level_pack(source):
+        with LevelPack(source) as pack:
+            for i in range(len(pack)):
+                yield i, pack.puzzle(i), False
+    else:
+        yield os.path.basename(source), Puzzle.from_file(source), False
+
+
+Failure = namedtuple('Failure', ['puzzle_id', 'board', 'size', 'strategy', 'kind', 'detail', 'vehicles'])
+
+
+class DifferentialTest:
+    """Runs every strategy over a corpus on a PinnedPool and checks each answer.
+
+    Every solved path is replayed by validate_path, reported costs are
+    recomputed from the path, and the strategies listed in OPTIMAL must
+    match the reference's fewest slides or cheapest cost. Mismatching
+    puzzles are shrunk by minimize() and written out as level files, so the
+    output directory can be fed back in with --source as a regression corpus.
+    """
+
+    def __init__(self, names=None, max_time=10, workers=None, batch_size=20, state_limit=200000,
+                 max_cases=5, report_every=10.0):
+        self.names = list(names or StrategyFactory.get_strategy_names())
+        self.max_time = max_time
+        self.workers = workers
+        self.batch_size = batch_size
+        self.state_limit = state_limit
+        self.max_cases = max_cases
+        self.report_every = report_every
+        self.tally = Counter()
+        self.failures = []
+        self.lost = 0
+
+    def run(self, entries, output=None):
+        """Check every entry; minimize and write failures to output. Returns the failures."""
+        entries = list(entries)
+        jobs = [(self.names, self.max_time, self.state_limit, entries[i:i + self.batch_size])
+                for i in range(0, len(entries), self.batch_size)]
+        # Generous: a job only hits this when a solve ignores its own max_time.
+        timeout = self.batch_size * len(self.names) * (self.max_time + 5) + 60
+
+        done = 0
+        start = last_report = time.perf_counter()
+        for job, status, value, _, _ in PinnedPool(check_job, self.workers).run(jobs, timeout):
+            if status != OK:
+                self.lost += len(job[3])
+                print(f"Lost {len(job[3])} puzzles ({status}): {value}", file=sys.stderr)
+                continue
+            for puzzle_id, board, size, ref, checks in value:
+                self.record(puzzle_id, Puzzle.from_board_string(board, size), ref, checks)
+            done += len(value)
+            now = time.perf_counter()
+            if now - last_report >= self.report_every:
+                print(f"[{now - start:7.1f}s] {done}/{len(entries)} puzzles, {len(self.failures)} mismatches",
+                      file=sys.stderr)
+                last_report = now
+
+        print(f"Checked {done} puzzles in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        if output is not None and self.failures:
+            self.write_cases(output)
+        return self.failures
+
+    def record(self, puzzle_id, puzzle, ref, checks):
+        if ref is None:
+            self.tally['no_reference'] += 1
+        for check in checks:
+            self.tally[check.strategy, 'checked'] += 1
+            self.tally[check.strategy, check.termination] += 1
+            for kind, detail in check.problems:
+                self.tally[check.strategy, kind] += 1
+                self.failures.append(Failure(puzzle_id, puzzle.to_board_string(), puzzle.size, check.strategy,
+                                             kind, detail, len(puzzle)))
+
+    def pick_cases(self):
+        """Up to max_cases failures per (strategy, kind), fewest vehicles first."""
+        picked = []
+        per_group = Counter()
+        for failure in sorted(self.failures, key=lambda f: (f.vehicles, str(f.puzzle_id))):
+            group = failure.strategy, failure.kind
+            if per_group[group] < self.max_cases:
+                per_group[group] += 1
+                picked.append(failure)
+        return picked
+
+    def write_cases(self, output):
+        """Minimize the picked failures in parallel and write each distinct one as a level file."""
+        os.makedirs(output, exist_ok=True)
+        picked = self.pick_cases()
+        jobs = [(f.board, f.size, f.strategy, f.kind, self.max_time, self.state_limit) for f in picked]
+        timeout = 200 * (self.max_time + 5)
+        minimized = {}
+        for job, status, value, _, _ in PinnedPool(minimize_job, self.workers).run(jobs, timeout):
+            minimized[job] = value if status == OK else (job[0], None)
+
+        written = set()
+        with open(os.path.join(output, CASES_FILE), 'w', encoding='utf-8') as f:
+            for failure, job in zip(picked, jobs):
+                board, detail = minimized[job]
+                key = board, failure.strategy, failure.kind
+                if key in written:
+                    continue
+                written.add(key)
+                puzzle = Puzzle.from_board_string(board, failure.size)
+                name = f"case_{len(written):03d}.txt"
+                write_level_file(os.path.join(output, name), puzzle.vehicles)
+                f.write(json.dumps({
+                    'case': name,
+                    'strategy': failure.strategy,
+                    'kind': failure.kind,
+                    'detail': detail or failure.detail,
+                    'puzzle': failure.puzzle_id,
+                    'board': failure.board,
+                    'minimized': board,
+                    'vehicles': [failure.vehicles, len(puzzle)],
+                }) + "\n")
+        print(f"Wrote {len(written)} regression cases to {output}", file=sys.stderr)
+
+    def report(self, out=sys.stdout):
+        columns = [('Solved', 'solved'), ('Timeout', TIMEOUT)] + [(kind, kind) for kind in KINDS]
+        out.write(f"{'Strategy':<12}{'Checked':>9}" + ''.join(f"{title:>17}" for title, _ in columns) + "\n")
+        for name in self.names:
+            if not self.tally[name, 'checked']:
+                continue
+            out.write(f"{name:<12}{self.tally[name, 'checked']:>9}"
+                      + ''.join(f"{self.tally[name, key]:>17}" for _, key in columns) + "\n")
+        if self.tally['no_reference']:
+            out.write(f"{self.tally['no_reference']} puzzles had no reference (more than {self.state_limit} "
+                      f"states); only their paths were validated\n")
+        if self.lost:
+            out.write(f"{self.lost} puzzles lost to killed or crashed workers\n")
+        out.write(f"{len(self.failures)} mismatches\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run every strategy over a puzzle corpus, validate each path against a reference "
+                    "and minimize mismatching puzzles into regression cases.")
+    parser.add_argument('-n', '--count', type=int, default=2000, help="random puzzles to generate")
+    parser.add_argument('--source', default=None,
+                        help="check a level directory, level pack or level file instead, e.g. earlier cases")
+    parser.add_argument('-s', '--strategies', nargs='+', default=None, choices=StrategyFactory.get_strategy_names(),
+                        help="strategies to check (default: all registered)")
+    parser.add_argument('-o', '--output', default='diff_cases', help="directory for minimized regression cases")
+    parser.add_argument('-t', '--max-time', type=float, default=10, help="seconds per solve")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--batch-size', type=int, default=20, help="puzzles per worker job")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-vehicles', type=int, default=2)
+    parser.add_argument('--max-vehicles', type=int, default=14)
+    parser.add_argument('--hard-share', type=float, default=0.25,
+                        help="share of puzzles replaced by the hardest state of their component")
+    parser.add_argument('--state-limit', type=int, default=200000,
+                        help="skip the reference for puzzles with more reachable states")
+    parser.add_argument('--max-cases', type=int, default=5, help="cases to minimize per strategy and mismatch kind")
+    args = parser.parse_args(argv)
+
+    if args.source:
+        entries = load_corpus(args.source)
+    else:
+        entries = generate_corpus(args.count, args.seed, args.min_vehicles, args.max_vehicles, args.hard_share)
+    test = DifferentialTest(args.strategies, args.max_time, args.workers, args.batch_size, args.state_limit,
+                            args.max_cases)
+    failures = test.run(entries, args.output)
+    test.report()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+from multiprocessing import Process
+
+from Game.LevelPack import LevelPack, is_level_pack
+from Game.Puzzle import Puzzle
+from SolverAlgorithms.DistributedBFS import DistributedBFSCoordinator, run_worker
+
+
+def load_puzzle(source, index):
+    if is_level_pack(source):
+        with LevelPack(source) as pack:
+            return pack.puzzle(index)
+    return Puzzle.from_file(source)
+
+
+def coordinate(args):
+    puzzle = load_puzzle(args.source, args.index)
+    with DistributedBFSCoordinator(args.workers, args.host, args.port) as coordinator:
+        host, port = coordinator.address
+        spawned = []
+        if args.spawn:
+            for _ in range(args.workers):
+                process = Process(target=run_worker, args=(host, port), daemon=True)
+                process.start()
+                spawned.append(process)
+        else:
+            print(f"Waiting for {args.workers} workers on {host}:{port}", file=sys.stderr)
+
+        start = time.perf_counter()
+        result = coordinator.run(puzzle, stop_at_goal=not args.enumerate, verbose=args.verbose)
+        elapsed = time.perf_counter() - start
+
+    for process in spawned:
+        process.join()
+
+    print(f"{result.states} states in {len(result.layer_counts)} layers, {elapsed:.2f}s "
+          f"({result.states / max(elapsed, 1e-9):.0f} states/s) on {args.workers} workers")
+    if result.path:
+        print(f"Nearest goal: {result.slides} slides, {len(result.path)} unit moves")
+    else:
+        print("No goal reachable")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Breadth-first search sharded over TCP workers.")
+    sub = parser.add_subparsers(dest='role', required=True)
+
+    coord = sub.add_parser('coordinator', help="run the search, optionally spawning local workers")
+    coord.add_argument('source', help="level file or level pack")
+    coord.add_argument('--index', type=int, default=0, help="level index when source is a pack")
+    coord.add_argument('-w', '--workers', type=int, default=2)
+    coord.add_argument('--host', default='127.0.0.1', help="address to listen on")
+    coord.add_argument('--port', type=int, default=0, help="port to listen on (default: any free port)")
+    coord.add_argument('--no-spawn', dest='spawn', action='store_false',
+                       help="wait for workers started elsewhere instead of spawning local ones")
+    coord.add_argument('--enumerate', action='store_true',
+                       help="explore the whole component instead of stopping at the first goal")
+    coord.add_argument('-v', '--verbose', action='store_true', help="print every layer count")
+
+    worker = sub.add_parser('worker', help="connect to a coordinator and serve one partition")
+    worker.add_argument('address', help="coordinator host:port")
+
+    args = parser.parse_args(argv)
+    if args.role == 'worker':
+        host, port = args.address.rsplit(':', 1)
+        run_worker(host, int(port))
+    else:
+        coordinate(args)
+
+
+if __name__ == "__main__":
+    main()
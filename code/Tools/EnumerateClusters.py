@@ -0,0 +1,169 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import heapq
+import json
+import time
+from multiprocessing import Pool
+
+from SolverAlgorithms.ClusterEnumerator import ClusterEnumerator
+from SolverAlgorithms.ClusterFile import ClusterFile, ClusterFileWriter, record_order
+
+
+MANIFEST = 'manifest.json'
+# Shards merged at once; each open shard holds a file descriptor and an mmap.
+MERGE_FAN_IN = 256
+
+
+def shard_path(directory, task_id):
+    return os.path.join(directory, f"shard-{task_id:06d}.rhcl")
+
+
+def enumerate_shard(job):
+    """Worker: enumerate one chunk of lane assignments into its shard file."""
+    enumerator, task_id, assignments, path = job
+    records = enumerator.run_task(assignments)
+    # Written under a temporary name so a killed run never leaves a partial shard.
+    partial = path + '.part'
+    with ClusterFileWriter(partial, enumerator.size) as writer:
+        for record in records:
+            writer.write(record)
+    os.replace(partial, path)
+    return task_id, len(records), sum(record.size for record in records)
+
+
+class ClusterJob:
+    """Sharded, resumable enumeration of one piece set into a directory of shards.
+
+    Every task owns one shard file, so a finished shard is its own checkpoint:
+    rerunning the same command skips tasks whose shard already exists. The
+    manifest stops a directory from mixing shards of different jobs.
+    """
+
+    def __init__(self, enumerator, directory, chunk=20, workers=None):
+        self.enumerator = enumerator
+        self.directory = directory
+        self.chunk = chunk
+        self.workers = workers or os.cpu_count() or 1
+
+    def manifest(self):
+        return {'cars': self.enumerator.cars, 'trucks': self.enumerator.trucks,
+                'size': self.enumerator.size, 'chunk': self.chunk,
+                'exact_diameter_limit': self.enumerator.exact_diameter_limit}
+
+    def prepare(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, MANIFEST)
+        if os.path.exists(path):
+            with open(path) as f:
+                existing = json.load(f)
+            if existing != self.manifest():
+                raise ValueError(f"{self.directory} holds a different job: {existing}")
+        else:
+            with open(path, 'w') as f:
+                json.dump(self.manifest(), f, indent=2)
+
+    def run(self, report_every=10.0):
+        """Enumerate every missing shard; return the paths of all shards."""
+        self.prepare()
+        # One walk over the lane assignments; the pool queues every job up front anyway.
+        tasks = list(self.enumerator.tasks(self.chunk))
+        total = len(tasks)
+        pending = [(self.enumerator, task_id, assignments, shard_path(self.directory, task_id))
+                   for task_id, assignments in tasks
+                   if not os.path.exists(shard_path(self.directory, task_id))]
+        del tasks
+        done = total - len(pending)
+        if done:
+            print(f"Resuming: {done}/{total} tasks already done", file=sys.stderr)
+
+        clusters = states = 0
+        start = last_report = time.perf_counter()
+        with Pool(self.workers) as pool:
+            for _, count, size in pool.imap_unordered(enumerate_shard, pending):
+                done += 1
+                clusters += count
+                states += size
+                now = time.perf_counter()
+                if now - last_report >= report_every or done == total:
+                    print(f"[{now - start:7.1f}s] {done}/{total} tasks, {clusters} clusters, "
+                          f"{states} states ({states / max(now - start, 1e-9):.0f} states/s)", file=sys.stderr)
+                    last_report = now
+        return [shard_path(self.directory, task_id) for task_id in range(total)]
+
+    def merge(self, shards, output, fan_in=MERGE_FAN_IN):
+        """Merge the sorted shards into one indexed cluster file.
+
+        At most fan_in shards are open at a time: larger sets are merged in
+        passes through intermediate files in the shard directory, which are
+        removed once the next pass has read them.
+        """
+        level = 0
+        while len(shards) > fan_in:
+            merged = []
+            for i in range(0, len(shards), fan_in):
+                path = os.path.join(self.directory, f"merge-{level}-{i // fan_in:06d}.rhcl")
+                self.merge_files(shards[i:i + fan_in], path + '.part')
+                os.replace(path + '.part', path)
+                merged.append(path)
+            if level:
+                for path in shards:
+                    os.remove(path)
+            shards = merged
+            level += 1
+        count = self.merge_files(shards, output)
+        if level:
+            for path in shards:
+                os.remove(path)
+        return count
+
+    def merge_files(self, paths, output):
+        """K-way merge of sorted cluster files into output; returns the record count."""
+        files = []
+        try:
+            for path in paths:
+                files.append(ClusterFile(path))
+            with ClusterFileWriter(output, self.enumerator.size) as writer:
+                for record in heapq.merge(*files, key=record_order):
+                    writer.write(record)
+                return writer.count
+        finally:
+            for f in files:
+                f.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Enumerate every placement of a piece set and record its connected components.")
+    parser.add_argument('cars', type=int, help="length-2 vehicles besides the target car")
+    parser.add_argument('trucks', type=int, help="length-3 vehicles")
+    parser.add_argument('directory', help="shard directory; rerun the same command to resume")
+    parser.add_argument('-o', '--output', default=None,
+                        help="merged cluster file (default: <directory>/clusters.rhcl)")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunk', type=int, default=20, help="lane assignments per shard")
+    parser.add_argument('--exact-diameter-limit', type=int, default=256,
+                        help="larger components get a double-sweep lower bound instead")
+    args = parser.parse_args(argv)
+
+    enumerator = ClusterEnumerator(args.cars, args.trucks, exact_diameter_limit=args.exact_diameter_limit)
+    job = ClusterJob(enumerator, args.directory, args.chunk, args.workers)
+    try:
+        shards = job.run()
+    except ValueError as e:
+        parser.error(str(e))
+
+    output = args.output or os.path.join(args.directory, 'clusters.rhcl')
+    count = job.merge(shards, output)
+    with ClusterFile(output) as clusters:
+        histogram = clusters.histogram()
+    print(f"Wrote {count} clusters to {output}")
+    for length, n in sorted(histogram.items(), reverse=True):
+        label = "unsolvable" if length < 0 else f"{length} slides"
+        print(f"  {label:>12}: {n}")
+
+
+if __name__ == "__main__":
+    main()
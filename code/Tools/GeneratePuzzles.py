@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import time
+from collections import deque
+from multiprocessing import Pool
+
+from Game.LevelPack import LevelPackWriter
+from Game.PuzzleGenerator import PuzzleGenerator
+
+
+def generate_batch(job):
+    generator, seed, samples = job
+    return generator.generate(seed, samples)
+
+
+class GenerationRun:
+    """Drives PuzzleGenerator batches on a process pool and reports throughput."""
+
+    def __init__(self, generator, workers=None, batch_size=20, report_every=10.0):
+        self.generator = generator
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.report_every = report_every
+
+    def run(self, output, count, seed=0, duration=None):
+        found = {}
+        sampled = 0
+        start = last_report = time.perf_counter()
+        pending = deque()
+        next_seed = seed
+
+        with Pool(self.workers) as pool:
+            while len(found) < count:
+                if duration is not None and time.perf_counter() - start > duration:
+                    break
+                while len(pending) < self.workers * 2:
+                    job = (self.generator, next_seed, self.batch_size)
+                    pending.append(pool.apply_async(generate_batch, (job,)))
+                    next_seed += 1
+
+                kept, tried = pending.popleft().get()
+                sampled += tried
+                for generated in kept:
+                    # Different samples often land in the same component.
+                    found.setdefault(generated.puzzle.to_board_string(), generated)
+
+                now = time.perf_counter()
+                if now - last_report >= self.report_every:
+                    self.report(len(found), sampled, now - start)
+                    last_report = now
+            pool.terminate()
+
+        elapsed = time.perf_counter() - start
+        hardest_first = sorted(found.values(), key=lambda g: (-g.optimal_length, -g.state_count))[:count]
+        with LevelPackWriter(output, self.generator.size) as writer:
+            for generated in hardest_first:
+                writer.write(generated.puzzle, generated.optimal_length, generated.state_count)
+
+        self.report(len(found), sampled, elapsed)
+        if hardest_first:
+            print(f"Wrote {len(hardest_first)} puzzles to {output}, optimal lengths "
+                  f"{hardest_first[-1].optimal_length}-{hardest_first[0].optimal_length}")
+        return hardest_first
+
+    def report(self, found, sampled, elapsed):
+        minutes = max(elapsed, 1e-9) / 60
+        print(f"[{elapsed:7.1f}s] {found} puzzles from {sampled} layouts "
+              f"({found / minutes:.1f} puzzles/min, {sampled / minutes:.0f} layouts/min)", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate hard puzzles into a level pack, hardest first.")
+    parser.add_argument('output', help="level pack to write")
+    parser.add_argument('-n', '--count', type=int, default=100, help="puzzles to keep")
+    parser.add_argument('--min-length', type=int, default=15, help="minimum optimal length in slides")
+    parser.add_argument('--min-vehicles', type=int, default=11)
+    parser.add_argument('--max-vehicles', type=int, default=15)
+    parser.add_argument('--state-limit', type=int, default=50000, help="skip components larger than this")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--duration', type=float, default=None, help="stop after this many seconds")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--batch-size', type=int, default=20, help="layouts per worker task")
+    args = parser.parse_args(argv)
+
+    generator = PuzzleGenerator(min_vehicles=args.min_vehicles, max_vehicles=args.max_vehicles,
+                                state_limit=args.state_limit, min_length=args.min_length)
+    GenerationRun(generator, args.workers, args.batch_size).run(args.output, args.count, args.seed, args.duration)
+
+
+if __name__ == "__main__":
+    main()
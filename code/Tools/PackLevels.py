@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+
+from Game.LevelFile import list_level_files
+from Game.LevelPack import LevelPackWriter, UNKNOWN_LENGTH, UNKNOWN_STATES
+from Game.Puzzle import Puzzle
+from SolverAlgorithms.StateSpace import StateSpace
+
+
+def pack_levels(folder, output, analyze=True, state_limit=1000000):
+    """Convert every Map/*.txt level of folder into one level pack."""
+    paths = list_level_files(folder)
+    with LevelPackWriter(output) as writer:
+        for path in paths:
+            puzzle = Puzzle.from_file(path)
+            optimal_length, state_count = UNKNOWN_LENGTH, UNKNOWN_STATES
+            if analyze:
+                space, start = StateSpace.from_puzzle(puzzle)
+                stats = space.analyze(start, state_limit)
+                if stats is not None:
+                    optimal_length, state_count = stats.optimal_length, stats.size
+            writer.write(puzzle, optimal_length, state_count)
+            print(f"{os.path.basename(path)}: {puzzle.to_board_string()} "
+                  f"optimal={optimal_length} states={state_count}")
+    print(f"Packed {len(paths)} levels into {output}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert Map/*.txt levels into a packed level file.")
+    parser.add_argument('folder', help="directory of level .txt files")
+    parser.add_argument('output', help="level pack to write")
+    parser.add_argument('--no-analyze', action='store_true',
+                        help="skip computing optimal length and state-space size")
+    parser.add_argument('--state-limit', type=int, default=1000000,
+                        help="leave metadata unknown for components larger than this")
+    args = parser.parse_args(argv)
+    pack_levels(args.folder, args.output, not args.no_analyze, args.state_limit)
+
+
+if __name__ == "__main__":
+    main()